@@ -7,6 +7,9 @@ psql -v ON_ERROR_STOP=1 --username "$POSTGRES_USER" --dbname "$POSTGRES_DB" <<-E
     -- Only create schemas and permissions
     CREATE SCHEMA IF NOT EXISTS app_data;
     CREATE SCHEMA IF NOT EXISTS vector_store;
+
+    -- pgvector types for the knowledge base, on its connection's search_path
+    CREATE EXTENSION IF NOT EXISTS vector SCHEMA vector_store;
     
     -- Grant permissions
     GRANT USAGE ON SCHEMA app_data TO ${POSTGRES_USER};
@@ -0,0 +1,79 @@
+import base64
+import json
+import os
+import timeit
+import uuid
+
+from django.core.management.base import BaseCommand
+
+from apps.ai_engine.s2s.events import S2sEvent
+
+
+class Command(BaseCommand):
+    help = (
+        "Micro-benchmark of the audioInput/toolResult/promptStart encoding: "
+        "json.dumps of the event dict vs the pre-serialized byte templates."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--iterations",
+            type=int,
+            default=100_000,
+            help="Events encoded per measurement.",
+        )
+        parser.add_argument(
+            "--frame-ms",
+            type=int,
+            default=100,
+            help="Duration of the 16 kHz PCM audio frame being encoded.",
+        )
+
+    def handle(self, *args, **options):
+        iterations = options["iterations"]
+        prompt_name = str(uuid.uuid4())
+        content_name = str(uuid.uuid4())
+        pcm = os.urandom(32 * options["frame_ms"])
+        audio_b64 = base64.b64encode(pcm)
+        tool_result = json.dumps({"result": ["Some retrieved passage " * 20]})
+
+        cases = {
+            "audioInput": (
+                lambda: json.dumps(
+                    S2sEvent.audio_input(
+                        prompt_name, content_name, audio_b64.decode("ascii")
+                    )
+                ).encode("utf-8"),
+                lambda: S2sEvent.audio_input_bytes(
+                    prompt_name, content_name, audio_b64
+                ),
+            ),
+            "toolResult": (
+                lambda: json.dumps(
+                    S2sEvent.text_input_tool(
+                        prompt_name, content_name, tool_result
+                    )
+                ).encode("utf-8"),
+                lambda: S2sEvent.text_input_tool_bytes(
+                    prompt_name, content_name, tool_result
+                ),
+            ),
+            "promptStart": (
+                lambda: json.dumps(S2sEvent.prompt_start(prompt_name)).encode(
+                    "utf-8"
+                ),
+                lambda: S2sEvent.prompt_start_bytes(prompt_name),
+            ),
+        }
+
+        for name, (baseline, fast_path) in cases.items():
+            # Both paths must produce the same event
+            assert json.loads(baseline()) == json.loads(fast_path())
+
+            baseline_s = min(timeit.repeat(baseline, number=iterations))
+            fast_s = min(timeit.repeat(fast_path, number=iterations))
+            self.stdout.write(
+                f"{name}: json.dumps {baseline_s / iterations * 1e6:.2f} us, "
+                f"template {fast_s / iterations * 1e6:.2f} us "
+                f"({baseline_s / fast_s:.1f}x)"
+            )
@@ -0,0 +1,422 @@
+import asyncio
+import json
+import os
+import statistics
+import time
+import uuid
+
+from urllib.parse import urlencode
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.ai_engine.s2s.events import S2sEvent
+from apps.ai_engine.s2s.fake_stream import FakeScript
+from apps.coaching.models import (
+    InterviewSession,
+    InterviewSessionSetup,
+    JobProfile,
+)
+from apps.interactions.protocol import encode_audio_frame
+from apps.users.models import User
+from core.settings.base import S2S_FAKE_BEDROCK, S2S_LOAD_TEST_TOKEN
+
+PATH = "/ws/interview/live-interaction/"
+LOADTEST_EMAIL = "loadtest@example.com"
+# 16 kHz, 16-bit mono microphone audio
+INPUT_BYTES_PER_MS = 32
+TURN_TIMEOUT_SECONDS = 30
+
+
+def _percentiles(samples):
+    """p50/p95/p99 of latencies in seconds, as milliseconds."""
+    if not samples:
+        return "no samples"
+    ordered = sorted(samples)
+
+    def rank(q):
+        return ordered[min(len(ordered) - 1, int(len(ordered) * q))] * 1000
+
+    return (
+        f"p50={statistics.median(ordered) * 1000:.1f} ms "
+        f"p95={rank(0.95):.1f} ms p99={rank(0.99):.1f} ms "
+        f"(n={len(ordered)})"
+    )
+
+
+class ProcessSampler:
+    """CPU time and resident memory of a process, read from /proc."""
+
+    def __init__(self, pid: int):
+        self.pid = pid
+        self._ticks = os.sysconf("SC_CLK_TCK")
+        self._page_size = os.sysconf("SC_PAGE_SIZE")
+        if not os.path.exists(f"/proc/{pid}/stat"):
+            raise CommandError(f"Cannot sample process {pid} from /proc")
+
+    def cpu_seconds(self) -> float:
+        with open(f"/proc/{self.pid}/stat") as f:
+            # The command name may contain spaces; fields follow its ")"
+            fields = f.read().rsplit(")", 1)[1].split()
+        # utime and stime, fields 14 and 15
+        return (int(fields[11]) + int(fields[12])) / self._ticks
+
+    def rss_bytes(self) -> int:
+        with open(f"/proc/{self.pid}/statm") as f:
+            return int(f.read().split()[1]) * self._page_size
+
+
+class InProcessConnection:
+    """The socket of one interview, served by this process' ASGI app."""
+
+    def __init__(self, query: str):
+        from channels.testing import WebsocketCommunicator
+        from core.asgi import application
+
+        self._communicator = WebsocketCommunicator(
+            application, f"{PATH}?{query}"
+        )
+
+    async def connect(self):
+        connected, _ = await self._communicator.connect()
+        if not connected:
+            raise ConnectionError("The consumer refused the connection")
+
+    async def send_text(self, text: str):
+        await self._communicator.send_to(text_data=text)
+
+    async def send_bytes(self, data: bytes):
+        await self._communicator.send_to(bytes_data=data)
+
+    async def receive(self) -> str:
+        return await self._communicator.receive_from(timeout=None)
+
+    async def close(self):
+        # Leaves the consumer time to finalize the session
+        await self._communicator.disconnect(timeout=10)
+
+
+class RemoteConnection:
+    """The socket of one interview, to a running server."""
+
+    def __init__(self, http, url: str, query: str):
+        self._http = http
+        self._url = f"{url.rstrip('/')}{PATH}?{query}"
+        self._ws = None
+
+    async def connect(self):
+        self._ws = await self._http.ws_connect(self._url)
+
+    async def send_text(self, text: str):
+        await self._ws.send_str(text)
+
+    async def send_bytes(self, data: bytes):
+        await self._ws.send_bytes(data)
+
+    async def receive(self) -> str:
+        message = await self._ws.receive()
+        if message.type.name != "TEXT":
+            raise ConnectionError(f"Socket closed ({message.type.name})")
+        return message.data
+
+    async def close(self):
+        await self._ws.close()
+
+
+class SimulatedInterview:
+    """
+    One client: sets up the session like the frontend, then speaks
+    `turns` turns of silence in real time, each time waiting for the
+    assistant's audio to end. Latencies run from the last audio chunk of
+    a turn to the first assistant text and audio received.
+    """
+
+    def __init__(self, connection, prompt_name, turns, turn_ms, chunk_ms):
+        self.connection = connection
+        self.prompt_name = prompt_name
+        self.turns = turns
+        self.turn_ms = turn_ms
+        self.chunk_ms = chunk_ms
+        self.first_text = []
+        self.first_audio = []
+        self.timeouts = 0
+        self.error = None
+        self._turn_ended_at = None
+        self._awaiting_text = self._awaiting_audio = False
+        self._turn_done = asyncio.Event()
+
+    async def _send(self, event):
+        await self.connection.send_text(json.dumps(event))
+
+    async def _read(self):
+        try:
+            while True:
+                await self._handle(await self.connection.receive())
+        except Exception as e:
+            # Closed by the server, e.g. not admitted
+            self.error = e
+            self._turn_done.set()
+
+    async def _handle(self, text):
+        event = json.loads(text).get("event")
+        if event:
+            self._on_event(*next(iter(event.items())))
+
+    def _on_event(self, name, body):
+        now = time.perf_counter()
+        if name == "textOutput" and body.get("role") == "ASSISTANT":
+            if self._awaiting_text:
+                self._awaiting_text = False
+                self.first_text.append(now - self._turn_ended_at)
+        elif name == "audioOutput" and self._awaiting_audio:
+            self._awaiting_audio = False
+            self.first_audio.append(now - self._turn_ended_at)
+        elif name == "contentEnd" and body.get("type") == "AUDIO":
+            self._turn_done.set()
+
+    async def run(self):
+        reader = None
+        try:
+            await self.connection.connect()
+            reader = asyncio.create_task(self._read())
+            await self._speak()
+        except Exception as e:
+            self.error = e
+        finally:
+            if reader:
+                reader.cancel()
+            try:
+                await self.connection.close()
+            except Exception:
+                pass
+
+    async def _speak(self):
+        prompt_name = self.prompt_name
+        system_content = str(uuid.uuid4())
+        audio_content = str(uuid.uuid4())
+        await self._send(S2sEvent.session_start())
+        await self._send(S2sEvent.prompt_start(prompt_name))
+        await self._send(
+            S2sEvent.content_start_text(prompt_name, system_content)
+        )
+        await self._send(S2sEvent.text_input(prompt_name, system_content))
+        await self._send(S2sEvent.content_end(prompt_name, system_content))
+        await self._send(
+            S2sEvent.content_start_audio(prompt_name, audio_content)
+        )
+
+        chunk = encode_audio_frame(
+            prompt_name,
+            audio_content,
+            bytes(self.chunk_ms * INPUT_BYTES_PER_MS),
+        )
+        for _ in range(self.turns):
+            if self.error is not None:
+                return
+            self._turn_done.clear()
+            for _ in range(max(self.turn_ms // self.chunk_ms, 1)):
+                await self.connection.send_bytes(chunk)
+                await asyncio.sleep(self.chunk_ms / 1000)
+            self._turn_ended_at = time.perf_counter()
+            self._awaiting_text = self._awaiting_audio = True
+            try:
+                await asyncio.wait_for(
+                    self._turn_done.wait(), TURN_TIMEOUT_SECONDS
+                )
+            except asyncio.TimeoutError:
+                self.timeouts += 1
+
+        await self._send(S2sEvent.content_end(prompt_name, audio_content))
+        await self._send(S2sEvent.prompt_end(prompt_name))
+        await self._send(S2sEvent.session_end())
+
+
+class Command(BaseCommand):
+    help = (
+        "Drives concurrent simulated interviews through the live interaction "
+        "WebSocket against the fake Nova Sonic stream (S2S_FAKE_BEDROCK), "
+        "and reports turn latency, CPU and memory per session."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--sessions", type=int, default=10, help="Concurrent interviews."
+        )
+        parser.add_argument(
+            "--turns", type=int, default=5, help="Turns per interview."
+        )
+        parser.add_argument(
+            "--ramp-seconds",
+            type=float,
+            default=0.0,
+            help="Spread the interview starts over this many seconds.",
+        )
+        parser.add_argument(
+            "--chunk-ms",
+            type=int,
+            default=100,
+            help="Duration of each microphone audio frame sent.",
+        )
+        parser.add_argument(
+            "--url",
+            help="Base ws:// URL of a running server (itself started with "
+            "S2S_FAKE_BEDROCK=1 on this database). By default the "
+            "interviews are served in this process.",
+        )
+        parser.add_argument(
+            "--server-pid",
+            type=int,
+            help="Process sampled for CPU and memory with --url.",
+        )
+        parser.add_argument(
+            "--load-test-token",
+            default=S2S_LOAD_TEST_TOKEN,
+            help="The server's S2S_LOAD_TEST_TOKEN, admitting the simulated "
+            "clients in the load_test class. Defaults to this one's.",
+        )
+        parser.add_argument(
+            "--keep",
+            action="store_true",
+            help="Keep the interview sessions created for the run.",
+        )
+
+    def handle(self, *args, **options):
+        if not options["url"] and not S2S_FAKE_BEDROCK:
+            raise CommandError(
+                "Set S2S_FAKE_BEDROCK=1, or every session opens a real "
+                "Nova Sonic stream."
+            )
+        pid = options["server_pid"] if options["url"] else os.getpid()
+        sampler = ProcessSampler(pid) if pid else None
+
+        profile, setup, prompt_names = self._create_sessions(
+            options["sessions"]
+        )
+        try:
+            interviews, elapsed, cpu, peak_rss = asyncio.run(
+                self._run(prompt_names, sampler, options)
+            )
+        finally:
+            if not options["keep"]:
+                self._delete_sessions(profile, setup)
+
+        self._report(interviews, elapsed, cpu, peak_rss, options)
+
+    def _create_sessions(self, count):
+        user, _ = User.objects.get_or_create(email=LOADTEST_EMAIL)
+        profile = JobProfile.objects.create(
+            user=user,
+            profile_name=f"Load test {uuid.uuid4()}",
+            target_role="Python Developer",
+            company_name="Load Test",
+        )
+        setup = InterviewSessionSetup.objects.create()
+        sessions = InterviewSession.objects.bulk_create(
+            InterviewSession(job_profile=profile, session_setup=setup)
+            for _ in range(count)
+        )
+        return (
+            profile,
+            setup,
+            [str(session.prompt_name) for session in sessions],
+        )
+
+    def _delete_sessions(self, profile, setup):
+        # delete() only soft-deletes; the segments cascade from the sessions
+        InterviewSession.global_objects.filter(
+            job_profile=profile
+        ).hard_delete()
+        setup.hard_delete()
+        profile.hard_delete()
+
+    async def _run(self, prompt_names, sampler, options):
+        turn_ms = FakeScript.from_settings().turn_audio_ms
+        http = None
+        if options["url"]:
+            import aiohttp
+
+            http = aiohttp.ClientSession()
+
+        query = urlencode({"load_test_token": options["load_test_token"]})
+
+        def connection():
+            if http is not None:
+                return RemoteConnection(http, options["url"], query)
+            return InProcessConnection(query)
+
+        interviews = [
+            SimulatedInterview(
+                connection(),
+                prompt_name,
+                options["turns"],
+                turn_ms,
+                options["chunk_ms"],
+            )
+            for prompt_name in prompt_names
+        ]
+        ramp = options["ramp_seconds"] / max(len(interviews), 1)
+
+        async def start(index, interview):
+            await asyncio.sleep(index * ramp)
+            await interview.run()
+
+        peak_rss = [sampler.rss_bytes() if sampler else 0]
+        baseline_rss = peak_rss[0]
+
+        async def sample_memory():
+            while True:
+                await asyncio.sleep(0.5)
+                peak_rss[0] = max(peak_rss[0], sampler.rss_bytes())
+
+        monitor = asyncio.create_task(sample_memory()) if sampler else None
+        cpu_started = sampler.cpu_seconds() if sampler else 0.0
+        started = time.perf_counter()
+        try:
+            await asyncio.gather(
+                *(
+                    start(i, interview)
+                    for i, interview in enumerate(interviews)
+                )
+            )
+        finally:
+            elapsed = time.perf_counter() - started
+            if monitor:
+                monitor.cancel()
+            if http is not None:
+                await http.close()
+        cpu = sampler.cpu_seconds() - cpu_started if sampler else None
+        return interviews, elapsed, cpu, peak_rss[0] - baseline_rss
+
+    def _report(self, interviews, elapsed, cpu, rss_growth, options):
+        sessions = len(interviews)
+        errors = [i.error for i in interviews if i.error is not None]
+        first_text = [s for i in interviews for s in i.first_text]
+        first_audio = [s for i in interviews for s in i.first_audio]
+        script = FakeScript.from_settings()
+
+        self.stdout.write(
+            f"sessions={sessions} turns={options['turns']} "
+            f"elapsed={elapsed:.1f} s errors={len(errors)} "
+            f"turn timeouts={sum(i.timeouts for i in interviews)}"
+        )
+        self.stdout.write(
+            f"scripted first_text={script.first_text_ms:.0f} ms "
+            f"first_audio={script.first_audio_ms:.0f} ms"
+        )
+        self.stdout.write(f"first text:  {_percentiles(first_text)}")
+        self.stdout.write(f"first audio: {_percentiles(first_audio)}")
+        if cpu is not None:
+            where = (
+                "server"
+                if options["url"]
+                else "this process, clients included"
+            )
+            self.stdout.write(
+                f"cpu per session={cpu / sessions * 1000:.0f} ms "
+                f"({cpu / elapsed * 100:.0f}% of a core, {where})"
+            )
+            self.stdout.write(
+                f"memory per session={rss_growth / sessions / 1024:.0f} KiB "
+                "(peak RSS growth)"
+            )
+        for error in errors[:5]:
+            self.stderr.write(f"error: {error!r}")
@@ -0,0 +1,61 @@
+from typing import Dict, Any, List, Tuple
+
+# (prompt_name, content_name, pcm bytes)
+AudioFrame = Tuple[str, str, bytes]
+
+
+def frame_size_bytes(audio_config: Dict[str, Any], frame_ms: int) -> int:
+    """Number of PCM bytes in `frame_ms` of audio for the given input config."""
+    bytes_per_second = (
+        audio_config["sampleRateHertz"]
+        * (audio_config["sampleSizeBits"] // 8)
+        * audio_config["channelCount"]
+    )
+    return bytes_per_second * frame_ms // 1000
+
+
+class AudioCoalescer:
+    """
+    Merges client audio chunks into fixed-size frames before they are sent
+    to Bedrock.
+
+    Chunks are only merged while they belong to the same prompt and content
+    name; a chunk for a different content flushes whatever was buffered.
+    A frame_bytes of 0 disables coalescing and every chunk is a frame.
+    """
+
+    def __init__(self, frame_bytes: int):
+        self.frame_bytes = frame_bytes
+        self._key = None
+        self._buffer = bytearray()
+
+    @property
+    def pending(self) -> bool:
+        return bool(self._buffer)
+
+    def add(
+        self, prompt_name: str, content_name: str, pcm: bytes
+    ) -> List[AudioFrame]:
+        """Buffers a chunk and returns the frames that are ready to send."""
+        if self.frame_bytes <= 0:
+            return [(prompt_name, content_name, pcm)]
+
+        frames = []
+        key = (prompt_name, content_name)
+        if key != self._key:
+            frames.extend(self.flush())
+            self._key = key
+
+        self._buffer += pcm
+        while len(self._buffer) >= self.frame_bytes:
+            frames.append((*key, bytes(self._buffer[: self.frame_bytes])))
+            del self._buffer[: self.frame_bytes]
+        return frames
+
+    def flush(self) -> List[AudioFrame]:
+        """Returns the buffered partial frame, if any."""
+        if not self._buffer:
+            return []
+        frame = (*self._key, bytes(self._buffer))
+        self._buffer.clear()
+        return [frame]
@@ -0,0 +1,153 @@
+import asyncio
+import os
+
+from datetime import datetime, timedelta, timezone
+from threading import Lock
+from typing import Callable, Dict, Optional
+
+from aws_sdk_bedrock_runtime.client import BedrockRuntimeClient
+from aws_sdk_bedrock_runtime.config import (
+    Config,
+    HTTPAuthSchemeResolver,
+    SigV4AuthScheme,
+)
+from smithy_aws_core.credentials_resolvers.container import (
+    ContainerCredentialsResolver,
+)
+from smithy_aws_core.credentials_resolvers.environment import (
+    EnvironmentCredentialsResolver,
+)
+from smithy_aws_core.identity import AWSCredentialsIdentity
+from smithy_core.aio.interfaces.identity import IdentityResolver
+from smithy_http.aio.aiohttp import AIOHTTPClient
+
+from core.settings.base import logger
+from core.settings.base import S2S_CREDENTIALS_REFRESH_MARGIN_SECONDS
+from core.settings.base import S2S_FAKE_BEDROCK
+
+# Retry delay when a background refresh fails; the cached credentials are
+# still valid until their expiration.
+_REFRESH_RETRY_SECONDS = 30
+
+
+class RefreshingCredentialsResolver(IdentityResolver):
+    """
+    Caches the credentials of a resolver and refreshes them in the background
+    before they expire, so sessions never wait on a credential fetch.
+
+    A new inner resolver is built for every refresh because the smithy
+    resolvers keep their own cache until expiration.
+    """
+
+    def __init__(
+        self,
+        resolver_factory: Callable[[], IdentityResolver],
+        refresh_margin_seconds: int = S2S_CREDENTIALS_REFRESH_MARGIN_SECONDS,
+    ):
+        self._resolver_factory = resolver_factory
+        self._refresh_margin = timedelta(seconds=refresh_margin_seconds)
+        self._credentials: Optional[AWSCredentialsIdentity] = None
+        self._lock = asyncio.Lock()
+        self._refresh_task: Optional[asyncio.Task] = None
+
+    def _is_expired(self) -> bool:
+        if self._credentials is None:
+            return True
+        expiration = self._credentials.expiration
+        return expiration is not None and datetime.now(timezone.utc) >= (
+            expiration
+        )
+
+    async def get_identity(self, *, identity_properties):
+        if self._is_expired():
+            async with self._lock:
+                if self._is_expired():
+                    await self._refresh(identity_properties)
+        return self._credentials
+
+    async def _refresh(self, identity_properties):
+        resolver = self._resolver_factory()
+        self._credentials = await resolver.get_identity(
+            identity_properties=identity_properties
+        )
+        logger.debug(
+            f"Bedrock credentials refreshed, expire at "
+            f"{self._credentials.expiration}"
+        )
+        expiration = self._credentials.expiration
+        if expiration is not None:
+            delay = (
+                expiration - self._refresh_margin - datetime.now(timezone.utc)
+            ).total_seconds()
+            self._schedule_refresh(max(delay, 1), identity_properties)
+
+    def _schedule_refresh(self, delay: float, identity_properties):
+        current = self._refresh_task
+        if (
+            current
+            and not current.done()
+            and current is not asyncio.current_task()
+        ):
+            current.cancel()
+        self._refresh_task = asyncio.create_task(
+            self._refresh_later(delay, identity_properties)
+        )
+
+    async def _refresh_later(self, delay: float, identity_properties):
+        await asyncio.sleep(delay)
+        try:
+            async with self._lock:
+                await self._refresh(identity_properties)
+        except Exception as e:
+            logger.warning(f"Background credential refresh failed: {e}")
+            self._schedule_refresh(_REFRESH_RETRY_SECONDS, identity_properties)
+
+
+# --- Process-wide client registry ---
+_clients: Dict[str, BedrockRuntimeClient] = {}
+_clients_lock = Lock()
+
+
+def _create_credentials_resolver() -> IdentityResolver:
+    if os.environ.get("STAGE") == "dev":
+        logger.debug(f"{os.environ.get('STAGE')} config, using local resolver")
+        return EnvironmentCredentialsResolver()
+
+    logger.debug(f"{os.environ.get('STAGE')} config, using container resolver")
+    # One HTTP client for every credential refresh of this process
+    http_client = AIOHTTPClient()
+    return RefreshingCredentialsResolver(
+        lambda: ContainerCredentialsResolver(http_client=http_client)
+    )
+
+
+def _create_client(region: str) -> BedrockRuntimeClient:
+    if S2S_FAKE_BEDROCK:
+        from .fake_stream import FakeBedrockRuntimeClient
+
+        logger.warning("S2S_FAKE_BEDROCK is set, Nova Sonic is simulated")
+        return FakeBedrockRuntimeClient()
+
+    logger.info(f"Creating Bedrock runtime client in region='{region}'")
+    config = Config(
+        endpoint_uri=f"https://bedrock-runtime.{region}.amazonaws.com",
+        region=region,
+        aws_credentials_identity_resolver=_create_credentials_resolver(),
+        http_auth_scheme_resolver=HTTPAuthSchemeResolver(),
+        http_auth_schemes={"aws.auth#sigv4": SigV4AuthScheme()},
+    )
+    return BedrockRuntimeClient(config=config)
+
+
+def get_bedrock_runtime_client(region: str) -> BedrockRuntimeClient:
+    """
+    Returns the Bedrock runtime client of this process for the region.
+
+    Every S2S session shares the client, its HTTP connection pool and its
+    cached credentials instead of building them on each connect.
+    """
+    with _clients_lock:
+        client = _clients.get(region)
+        if client is None:
+            client = _clients[region] = _create_client(region)
+        return client
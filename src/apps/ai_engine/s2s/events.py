@@ -1,3 +1,74 @@
+import json
+import uuid
+
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+# Stands in for the dynamic field of a cached event; its JSON encoding
+# ("\u0000slot\u0000") never occurs in the static configuration.
+_SLOT = "\x00slot\x00"
+_ENCODED_SLOT = json.dumps(_SLOT).encode("utf-8")
+
+
+@lru_cache(maxsize=1024)
+def _content_event_template(event_name, prompt_name, content_name):
+    """
+    JSON prefix of a content event up to (and excluding) its content value,
+    built once per (event, promptName, contentName).
+    """
+    return (
+        '{"event": {"%s": {"promptName": %s, "contentName": %s, "content": '
+        % (event_name, json.dumps(prompt_name), json.dumps(content_name))
+    ).encode("utf-8")
+
+
+_SCALARS = (str, int, float, bool, type(None))
+
+# promptStart fields the cached template always sends with these values
+_PROMPT_START_OUTPUT_CONFIGS = {
+    "textOutputConfiguration": {"mediaType": "text/plain"},
+    "toolUseOutputConfiguration": {"mediaType": "application/json"},
+}
+
+
+def _freeze(config: Any) -> Optional[Tuple]:
+    """
+    A hashable key for a flat configuration dict, None when it is not one
+    (nested or list values, non-dict payloads).
+    """
+    try:
+        if not all(isinstance(value, _SCALARS) for value in config.values()):
+            return None
+        key = tuple(sorted(config.items()))
+        hash(key)
+    except (AttributeError, TypeError):
+        return None
+    return key
+
+
+def _split_on_slot(event: Dict[str, Any]) -> Tuple[bytes, bytes]:
+    prefix, suffix = json.dumps(event).encode("utf-8").split(_ENCODED_SLOT)
+    return prefix, suffix
+
+
+@lru_cache(maxsize=64)
+def _session_start_bytes(inference_config: Tuple) -> bytes:
+    return json.dumps(S2sEvent.session_start(dict(inference_config))).encode(
+        "utf-8"
+    )
+
+
+@lru_cache(maxsize=64)
+def _prompt_start_template(audio_output_config: Tuple) -> Tuple[bytes, bytes]:
+    """
+    promptStart encoded once per audio output configuration (voice, ...)
+    with the tool registry configuration, split around the promptName.
+    """
+    return _split_on_slot(
+        S2sEvent.prompt_start(_SLOT, dict(audio_output_config))
+    )
+
+
 class S2sEvent:
     # Default configuration values
     DEFAULT_INFER_CONFIG = {
@@ -145,22 +216,114 @@ class S2sEvent:
     def prompt_start(
         prompt_name,
         audio_output_config=DEFAULT_AUDIO_OUTPUT_CONFIG,
-        tool_config=BYOLLM_TOOL_CONFIG,
+        tool_config=None,
     ):
+        if tool_config is None:
+            # Imported here: the tool handlers pull in the integrations
+            from .tools import TOOLS
+
+            tool_config = TOOLS.tool_config()
         return {
             "event": {
                 "promptStart": {
                     "promptName": prompt_name,
-                    "textOutputConfiguration": {"mediaType": "text/plain"},
+                    **_PROMPT_START_OUTPUT_CONFIGS,
                     "audioOutputConfiguration": audio_output_config,
-                    "toolUseOutputConfiguration": {
-                        "mediaType": "application/json"
-                    },
                     "toolConfiguration": tool_config,
                 }
             }
         }
 
+    @staticmethod
+    def session_start_bytes(inference_config=DEFAULT_INFER_CONFIG) -> bytes:
+        """
+        sessionStart, encoded once per inference configuration. A
+        configuration that is not flat is encoded on every call.
+        """
+        key = _freeze(inference_config)
+        if key is None:
+            return json.dumps(S2sEvent.session_start(inference_config)).encode(
+                "utf-8"
+            )
+        return _session_start_bytes(key)
+
+    @staticmethod
+    def prompt_start_bytes(
+        prompt_name, audio_output_config=DEFAULT_AUDIO_OUTPUT_CONFIG
+    ) -> bytes:
+        """
+        promptStart with the registry tool configuration. The large static
+        part is encoded once per audio output configuration; only the
+        promptName is spliced in.
+        """
+        key = _freeze(audio_output_config)
+        if key is None:
+            return json.dumps(
+                S2sEvent.prompt_start(prompt_name, audio_output_config)
+            ).encode("utf-8")
+        prefix, suffix = _prompt_start_template(key)
+        return prefix + json.dumps(prompt_name).encode("utf-8") + suffix
+
+    @staticmethod
+    def cached_session_start(session_start: Dict[str, Any]) -> Optional[bytes]:
+        """
+        The pre-encoded equivalent of a client sessionStart, or None when
+        the event carries anything the cached payload would drop: fields
+        other than a flat inferenceConfiguration.
+        """
+        if not isinstance(session_start, dict) or set(session_start) - {
+            "inferenceConfiguration"
+        }:
+            return None
+        inference_config = (
+            session_start.get("inferenceConfiguration")
+            or S2sEvent.DEFAULT_INFER_CONFIG
+        )
+        key = _freeze(inference_config)
+        if key is None:
+            return None
+        return _session_start_bytes(key)
+
+    @staticmethod
+    def cached_prompt_start(prompt_start: Dict[str, Any]) -> Optional[bytes]:
+        """
+        The pre-encoded equivalent of a client promptStart, or None when the
+        event carries anything the cached payload would drop. The client's
+        toolConfiguration is replaced by the registry's, since tools run on
+        the server; the output configurations are only accepted with the
+        values the template sends.
+        """
+        if not isinstance(prompt_start, dict) or not isinstance(
+            prompt_start.get("promptName"), str
+        ):
+            return None
+        for field, value in prompt_start.items():
+            if field in (
+                "promptName",
+                "audioOutputConfiguration",
+                "toolConfiguration",
+            ):
+                continue
+            if (
+                field not in _PROMPT_START_OUTPUT_CONFIGS
+                or _PROMPT_START_OUTPUT_CONFIGS[field] != value
+            ):
+                return None
+        audio_output_config = prompt_start.get("audioOutputConfiguration", {})
+        if not isinstance(audio_output_config, dict):
+            return None
+        key = _freeze(
+            {**S2sEvent.DEFAULT_AUDIO_OUTPUT_CONFIG, **audio_output_config}
+        )
+        if key is None:
+            return None
+        prefix, suffix = _prompt_start_template(key)
+        return (
+            prefix
+            + json.dumps(prompt_start["promptName"]).encode("utf-8")
+            + suffix
+        )
+
     @staticmethod
     def content_start_text(prompt_name, content_name):
         return {
@@ -190,6 +353,38 @@ class S2sEvent:
             }
         }
 
+    @staticmethod
+    def conversation_history(
+        prompt_name, turns: Iterable[Tuple[str, str]]
+    ) -> List[Dict[str, Any]]:
+        """
+        Events replaying earlier turns, (role, text) with role USER or
+        ASSISTANT, as non-interactive text content. They go after the
+        system prompt and before the audio content.
+        """
+        events = []
+        for role, text in turns:
+            content_name = str(uuid.uuid4())
+            events.append(
+                {
+                    "event": {
+                        "contentStart": {
+                            "promptName": prompt_name,
+                            "contentName": content_name,
+                            "type": "TEXT",
+                            "interactive": False,
+                            "role": role,
+                            "textInputConfiguration": {
+                                "mediaType": "text/plain"
+                            },
+                        }
+                    }
+                }
+            )
+            events.append(S2sEvent.text_input(prompt_name, content_name, text))
+            events.append(S2sEvent.content_end(prompt_name, content_name))
+        return events
+
     @staticmethod
     def content_end(prompt_name, content_name):
         return {
@@ -231,6 +426,19 @@ class S2sEvent:
             }
         }
 
+    @staticmethod
+    def audio_input_bytes(prompt_name, content_name, content):
+        """
+        Encoded equivalent of audio_input, for the audio hot path. `content`
+        is base64 (str or bytes), which never needs JSON escaping.
+        """
+        if isinstance(content, str):
+            content = content.encode("ascii")
+        prefix = _content_event_template(
+            "audioInput", prompt_name, content_name
+        )
+        return b"".join((prefix, b'"', content, b'"}}}'))
+
     @staticmethod
     def content_start_tool(prompt_name, content_name, tool_use_id):
         return {
@@ -263,6 +471,14 @@ class S2sEvent:
             }
         }
 
+    @staticmethod
+    def text_input_tool_bytes(prompt_name, content_name, content):
+        """Encoded equivalent of text_input_tool."""
+        prefix = _content_event_template(
+            "toolResult", prompt_name, content_name
+        )
+        return b"".join((prefix, json.dumps(content).encode("utf-8"), b"}}}"))
+
     @staticmethod
     def prompt_end(prompt_name):
         return {"event": {"promptEnd": {"promptName": prompt_name}}}
@@ -0,0 +1,273 @@
+import asyncio
+import base64
+import json
+import random
+import uuid
+
+from dataclasses import dataclass, fields
+from typing import Any, Dict, Optional
+
+from core.settings.base import logger
+from core.settings.base import S2S_FAKE_BEDROCK_SCRIPT
+
+# Client audio is 16 kHz, 16-bit mono; assistant audio 24 kHz, 16-bit mono
+_INPUT_BYTES_PER_MS = 32
+_OUTPUT_BYTES_PER_MS = 48
+
+# Ends the output stream
+_END = object()
+
+
+@dataclass
+class FakeScript:
+    """
+    What the fake Nova Sonic says and how fast. A turn starts once
+    `turn_audio_ms` of client audio has arrived: the user transcript comes
+    after `first_text_ms`, then every `tool_every` turns a toolUse whose
+    result is awaited, then the assistant text and, `first_audio_ms` after
+    the turn started, `response_audio_ms` of audio in real time. Latencies
+    vary by up to +/- `jitter` (a fraction).
+    """
+
+    connect_ms: float = 150
+    first_text_ms: float = 300
+    first_audio_ms: float = 600
+    jitter: float = 0.2
+    turn_audio_ms: int = 2000
+    response_audio_ms: int = 3000
+    audio_frame_ms: int = 40
+    tool_every: int = 3
+    tool_name: str = "getDateTool"
+    tool_timeout_ms: float = 10_000
+    user_text: str = "I have five years of experience with Django."
+    assistant_text: str = "Great. Can you describe a project you led?"
+
+    @classmethod
+    def from_settings(
+        cls, overrides: Dict[str, Any] = S2S_FAKE_BEDROCK_SCRIPT
+    ) -> "FakeScript":
+        types = {field.name: field.type for field in fields(cls)}
+        unknown = set(overrides) - set(types)
+        if unknown:
+            raise ValueError(f"Unknown fake script fields: {sorted(unknown)}")
+        values = {}
+        for name, value in overrides.items():
+            if types[name] is int:
+                value = int(float(value))
+            values[name] = types[name](value)
+        return cls(**values)
+
+    def delay(self, ms: float) -> float:
+        """`ms` with jitter, in seconds."""
+        spread = random.uniform(1 - self.jitter, 1 + self.jitter)
+        return max(ms * spread, 0) / 1000
+
+
+@dataclass
+class _Payload:
+    bytes_: bytes
+
+
+@dataclass
+class _Chunk:
+    value: _Payload
+
+
+class _InputStream:
+    def __init__(self, stream: "FakeStream"):
+        self._stream = stream
+
+    async def send(self, event):
+        await self._stream.handle_input(json.loads(event.value.bytes_))
+
+    async def close(self):
+        self._stream.end()
+
+
+class _OutputStream:
+    def __init__(self, queue: asyncio.Queue):
+        self._queue = queue
+
+    async def receive(self) -> _Chunk:
+        item = await self._queue.get()
+        if item is _END:
+            raise StopAsyncIteration
+        return _Chunk(_Payload(item))
+
+
+class FakeStream:
+    """
+    A Nova Sonic bidirectional stream played from a FakeScript, with the
+    interface of the smithy stream the session manager uses.
+    """
+
+    def __init__(self, script: FakeScript):
+        self.script = script
+        self.session_id = str(uuid.uuid4())
+        self.prompt_name: Optional[str] = None
+        self.input_stream = _InputStream(self)
+        self._output: asyncio.Queue = asyncio.Queue()
+        self._audio_bytes = 0
+        self._turns = 0
+        self._turn_task: Optional[asyncio.Task] = None
+        self._tool_result = asyncio.Event()
+        self._closed = False
+
+    async def await_output(self):
+        return None, _OutputStream(self._output)
+
+    def end(self):
+        if not self._closed:
+            self._closed = True
+            if self._turn_task:
+                self._turn_task.cancel()
+            self._output.put_nowait(_END)
+
+    async def handle_input(self, data: Dict[str, Any]):
+        if self._closed:
+            raise RuntimeError("The fake stream is closed")
+        name, event = next(iter(data["event"].items()))
+        if name == "promptStart":
+            self.prompt_name = event["promptName"]
+        elif name == "audioInput":
+            self._on_audio(event["content"])
+        elif name == "toolResult":
+            self._tool_result.set()
+        elif name == "sessionEnd":
+            self.end()
+
+    def _on_audio(self, content: str):
+        if self._turn_task and not self._turn_task.done():
+            # The user is not listened to while the assistant answers
+            return
+        self._audio_bytes += len(content) * 3 // 4
+        if (
+            self._audio_bytes
+            >= self.script.turn_audio_ms * _INPUT_BYTES_PER_MS
+        ):
+            self._audio_bytes = 0
+            self._turns += 1
+            self._turn_task = asyncio.create_task(self._play_turn())
+
+    def _emit(self, name: str, body: Dict[str, Any]):
+        event = {
+            "sessionId": self.session_id,
+            "promptName": self.prompt_name,
+            **body,
+        }
+        self._output.put_nowait(
+            json.dumps({"event": {name: event}}).encode("utf-8")
+        )
+
+    def _content(self, content_type: str, role: str, **extra) -> str:
+        content_id = str(uuid.uuid4())
+        self._emit(
+            "contentStart",
+            {
+                "contentId": content_id,
+                "type": content_type,
+                "role": role,
+                **extra,
+            },
+        )
+        return content_id
+
+    def _content_end(
+        self, content_id: str, content_type: str, stop_reason="END_TURN"
+    ):
+        self._emit(
+            "contentEnd",
+            {
+                "contentId": content_id,
+                "type": content_type,
+                "stopReason": stop_reason,
+            },
+        )
+
+    def _text(self, role: str, text: str, stage: str):
+        content_id = self._content(
+            "TEXT",
+            role,
+            additionalModelFields=json.dumps({"generationStage": stage}),
+        )
+        self._emit(
+            "textOutput",
+            {"contentId": content_id, "role": role, "content": text},
+        )
+        self._content_end(content_id, "TEXT")
+
+    async def _play_turn(self):
+        script = self.script
+        loop = asyncio.get_running_loop()
+        audio_at = loop.time() + script.delay(script.first_audio_ms)
+
+        await asyncio.sleep(script.delay(script.first_text_ms))
+        self._text("USER", script.user_text, "FINAL")
+
+        if script.tool_every and self._turns % script.tool_every == 0:
+            await self._use_tool()
+            # The answer comes after the tool result
+            audio_at = max(audio_at, loop.time())
+
+        self._text("ASSISTANT", script.assistant_text, "SPECULATIVE")
+
+        await asyncio.sleep(max(audio_at - loop.time(), 0))
+        content_id = self._content("AUDIO", "ASSISTANT")
+        frame = base64.b64encode(
+            bytes(script.audio_frame_ms * _OUTPUT_BYTES_PER_MS)
+        ).decode("ascii")
+        for _ in range(
+            max(script.response_audio_ms // script.audio_frame_ms, 1)
+        ):
+            self._emit(
+                "audioOutput",
+                {
+                    "contentId": content_id,
+                    "role": "ASSISTANT",
+                    "content": frame,
+                },
+            )
+            await asyncio.sleep(script.audio_frame_ms / 1000)
+        self._content_end(content_id, "AUDIO")
+
+    async def _use_tool(self):
+        tool_use_id = str(uuid.uuid4())
+        self._tool_result.clear()
+        content_id = self._content(
+            "TOOL",
+            "TOOL",
+            toolUseOutputConfiguration={"mediaType": "application/json"},
+        )
+        self._emit(
+            "toolUse",
+            {
+                "contentId": content_id,
+                "toolName": self.script.tool_name,
+                "toolUseId": tool_use_id,
+                "content": json.dumps({}),
+            },
+        )
+        self._content_end(content_id, "TOOL", "TOOL_USE")
+        try:
+            await asyncio.wait_for(
+                self._tool_result.wait(), self.script.tool_timeout_ms / 1000
+            )
+        except asyncio.TimeoutError:
+            logger.warning(
+                f"Fake stream: no result for tool use {tool_use_id}"
+            )
+
+
+class FakeBedrockRuntimeClient:
+    """
+    Stands in for the Bedrock runtime client when S2S_FAKE_BEDROCK is set:
+    opening a bidirectional stream returns a FakeStream after the scripted
+    connect latency.
+    """
+
+    def __init__(self, script: Optional[FakeScript] = None):
+        self.script = script or FakeScript.from_settings()
+
+    async def invoke_model_with_bidirectional_stream(self, operation_input):
+        await asyncio.sleep(self.script.delay(self.script.connect_ms))
+        return FakeStream(self.script)
@@ -0,0 +1,99 @@
+"""
+Turns the structured booking results of the booking agent into a short
+text the speech model can read out, without asking the agent to do it.
+"""
+
+import json
+import re
+
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+# Fields read first and in this order; anything else scalar follows
+_LEADING_FIELDS = (
+    "customer_name",
+    "service_type",
+    "booking_date",
+    "status",
+)
+_SKIPPED_FIELDS = {"booking_id", "id", "created_at", "updated_at"}
+_CODE_FENCE = re.compile(r"^```(?:json)?\s*|\s*```$")
+
+
+def parse_booking_result(result: Any) -> Optional[Dict[str, Any]]:
+    """Returns the agent result as a dict when it is a JSON object."""
+    if isinstance(result, dict):
+        return result
+    if not isinstance(result, str):
+        return None
+    try:
+        parsed = json.loads(_CODE_FENCE.sub("", result.strip()))
+    except ValueError:
+        return None
+    return parsed if isinstance(parsed, dict) else None
+
+
+def _label(field: str) -> str:
+    return field.replace("_", " ")
+
+
+def _spoken_value(value: Any) -> str:
+    if isinstance(value, str):
+        try:
+            moment = datetime.fromisoformat(value.replace("Z", "+00:00"))
+        except ValueError:
+            return value
+        if len(value) <= 10:
+            return f"{moment:%A, %B} {moment.day}, {moment.year}"
+        hour = moment.strftime("%I").lstrip("0")
+        return (
+            f"{moment:%A, %B} {moment.day}, {moment.year} "
+            f"at {hour}:{moment:%M %p}"
+        )
+    if isinstance(value, bool):
+        return "yes" if value else "no"
+    return str(value)
+
+
+def format_booking(booking: Dict[str, Any]) -> str:
+    booking_id = booking.get("booking_id") or booking.get("id")
+    head = f"Booking {booking_id}" if booking_id else "Booking"
+
+    fields = [f for f in _LEADING_FIELDS if f in booking] + [
+        f
+        for f in booking
+        if f not in _LEADING_FIELDS and f not in _SKIPPED_FIELDS
+    ]
+    details = [
+        f"{_label(field)} {_spoken_value(booking[field])}"
+        for field in fields
+        if booking[field] not in (None, "")
+        and not isinstance(booking[field], (dict, list))
+    ]
+    return f"{head}: {', '.join(details)}." if details else f"{head}."
+
+
+def format_bookings(data: Dict[str, Any]) -> Optional[str]:
+    """
+    Formats {"bookings": [...]} (or a single {"booking": {...}}) results.
+    Returns None when the payload does not have that shape, so the caller
+    can fall back to the agent.
+    """
+    bookings: Any = data.get("bookings")
+    if bookings is None and isinstance(data.get("booking"), dict):
+        bookings = [data["booking"]]
+    if not isinstance(bookings, list) or not all(
+        isinstance(booking, dict) for booking in bookings
+    ):
+        return None
+
+    if not bookings:
+        return data.get("message") or "No bookings were found."
+
+    lines: List[str] = []
+    if len(bookings) > 1:
+        lines.append(f"Found {len(bookings)} bookings.")
+    lines.extend(format_booking(booking) for booking in bookings)
+    if data.get("message"):
+        lines.append(str(data["message"]))
+    return " ".join(lines)
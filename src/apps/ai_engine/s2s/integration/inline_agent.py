@@ -5,6 +5,9 @@ import uuid
 import os
 from datetime import datetime
 import asyncio
+import queue
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from threading import Lock
 from typing import Any, Dict, Optional
 
@@ -13,15 +16,16 @@ from core.settings.base import logger
 
 # --- Constants ---
 from core.settings.base import DEFAULT_REGION, DEFAULT_AGENT_MODEL_ID
+from core.settings.base import INLINE_AGENT_POOL_SIZE
 
 DEFAULT_SCHEMA_FILE = "./integration/booking_openapi.json"
 DEFAULT_LOG_WAIT_TIME = 2
 LAMBDA_ARN_ENV = "BOOKING_LAMBDA_ARN"
 
 
-# --- Global Orchestrator Instance and Lock ---
-_orchestrator: Optional["InlineAgentOrchestrator"] = None
-_orchestrator_lock = Lock()
+# --- Global Orchestrator Pool and Lock ---
+_pool: Optional["OrchestratorPool"] = None
+_pool_lock = Lock()
 
 
 class InlineAgentOrchestrator:
@@ -41,6 +45,8 @@ class InlineAgentOrchestrator:
         self.schema = self._load_schema(self.config["schema_file"])
         self.lambda_arn = self._get_lambda_arn()
         self.lambda_name = self.lambda_arn.split(":")[-1]
+        # Serialized once: the payload is sent unchanged on every call
+        self.action_groups = self._build_action_groups()
         self.session_id = str(uuid.uuid4())
         self.lambda_log_group = f"/aws/lambda/{self.lambda_name}"
         logger.info(f"Session initialized: {self.session_id}")
@@ -65,6 +71,7 @@ class InlineAgentOrchestrator:
             )
 
     @staticmethod
+    @lru_cache(maxsize=None)
     def _load_schema(schema_file: str) -> Dict[str, Any]:
         try:
             with open(schema_file) as f:
@@ -85,13 +92,28 @@ class InlineAgentOrchestrator:
         logger.info(f"Using Lambda ARN: {lambda_arn}")
         return lambda_arn
 
-    def invoke(self, query: str) -> str:
+    def _build_action_groups(self) -> list:
+        return [
+            {
+                "actionGroupName": "BookingAPI",
+                "actionGroupExecutor": {"lambda": self.lambda_arn},
+                "apiSchema": {"payload": json.dumps(self.schema)},
+            }
+        ]
+
+    def invoke(self, query: str, session_id: Optional[str] = None) -> str:
+        """
+        Invokes the agent in `session_id`, one per conversation, so
+        concurrent interviews never share agent memory. Defaults to the
+        orchestrator's own session.
+        """
+        session_id = session_id or self.session_id
         try:
             time_before_call = datetime.now()
             logger.info(f"Started at: {time_before_call}")
             logger.info(f"Invoking agent with query: {query}")
-            logger.info(f"Session ID: {self.session_id}")
-            request_params = self._prepare_request_params(query)
+            logger.info(f"Session ID: {session_id}")
+            request_params = self._prepare_request_params(query, session_id)
             logger.info("Sending request to Bedrock inline agent")
             agent_resp = self.client.invoke_inline_agent(**request_params)
             agent_answer = self._process_response(agent_resp)
@@ -100,21 +122,17 @@ class InlineAgentOrchestrator:
             logger.error(f"Error invoking agent: {str(e)}", exc_info=True)
             return f"Error invoking agent: {str(e)}"
 
-    def _prepare_request_params(self, query: str) -> Dict[str, Any]:
+    def _prepare_request_params(
+        self, query: str, session_id: str
+    ) -> Dict[str, Any]:
         return {
             "inputText": query,
             "foundationModel": self.config["model_id"],
             "instruction": self._get_agent_instruction(),
-            "sessionId": self.session_id,
+            "sessionId": session_id,
             "endSession": False,
             "enableTrace": False,
-            "actionGroups": [
-                {
-                    "actionGroupName": "BookingAPI",
-                    "actionGroupExecutor": {"lambda": self.lambda_arn},
-                    "apiSchema": {"payload": json.dumps(self.schema)},
-                }
-            ],
+            "actionGroups": self.action_groups,
         }
 
     @staticmethod
@@ -196,35 +214,84 @@ class InlineAgentOrchestrator:
             return f"Error getting Lambda logs: {str(e)}"
 
 
-def get_orchestrator() -> InlineAgentOrchestrator:
-    global _orchestrator
-    with _orchestrator_lock:
-        if _orchestrator is None:
-            _orchestrator = InlineAgentOrchestrator()
-        return _orchestrator
+class OrchestratorPool:
+    """
+    A bounded pool of orchestrators with its own thread pool of the same
+    size. Agent calls block on network I/O for seconds, so they must not
+    run on the default executor shared with the rest of the process; and
+    no more than `size` calls run at once, each on its own orchestrator.
+    """
 
+    def __init__(self, size: int = INLINE_AGENT_POOL_SIZE):
+        self.size = size
+        self.executor = ThreadPoolExecutor(
+            max_workers=size, thread_name_prefix="inline-agent"
+        )
+        self._idle: "queue.LifoQueue[InlineAgentOrchestrator]" = (
+            queue.LifoQueue()
+        )
+        self._created = 0
+        self._lock = Lock()
 
-async def invoke_agent(query: str) -> str:
-    orchestrator = get_orchestrator()
-    try:
-        return await asyncio.to_thread(orchestrator.invoke, query)
-    except AttributeError:
-        loop = asyncio.get_event_loop()
-        return await loop.run_in_executor(None, orchestrator.invoke, query)
+    def _acquire(self) -> InlineAgentOrchestrator:
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+        with self._lock:
+            if self._created < self.size:
+                self._created += 1
+                try:
+                    return InlineAgentOrchestrator()
+                except Exception:
+                    self._created -= 1
+                    raise
+        return self._idle.get()
+
+    def _invoke(self, query: str, session_id: Optional[str]) -> str:
+        # Runs on the pool executor, which never has more than `size`
+        # workers, so _acquire never waits for long
+        orchestrator = self._acquire()
+        try:
+            return orchestrator.invoke(query, session_id)
+        finally:
+            self._idle.put(orchestrator)
+
+    async def invoke(self, query: str, session_id: Optional[str]) -> str:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self.executor, self._invoke, query, session_id
+        )
+
+    def shutdown(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+
+def get_orchestrator_pool() -> OrchestratorPool:
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = OrchestratorPool()
+        return _pool
+
+
+async def invoke_agent(query: str, session_id: Optional[str] = None) -> str:
+    """
+    Invokes the booking agent. Pass the conversation id as `session_id` so
+    each interview keeps its own agent session.
+    """
+    return await get_orchestrator_pool().invoke(query, session_id)
 
 
 async def cleanup_agent() -> None:
-    """Clean up the orchestrator resources and reset the global instance."""
-    global _orchestrator
+    """Shut down the orchestrator pool and reset the global instance."""
+    global _pool
     logger.info("Cleaning up inline agent resources")
     try:
-        with _orchestrator_lock:
-            if _orchestrator is not None:
-                # Release any resources if needed
-                logger.info(
-                    f"Releasing resources for session: {_orchestrator.session_id}"
-                )
-                _orchestrator = None
+        with _pool_lock:
+            if _pool is not None:
+                _pool.shutdown()
+                _pool = None
                 logger.info("Inline agent resources cleaned up successfully")
     except Exception as e:
         logger.error(
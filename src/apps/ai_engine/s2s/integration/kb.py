@@ -1,33 +1,103 @@
-import boto3
-import os
+from typing import Optional
 
-KB_ID = os.environ.get("KB_ID")
-KB_REGION = os.environ.get("KB_REGION", "us-east-1")
-bedrock_agent_runtime = boto3.client(
-    "bedrock-agent-runtime", region_name=KB_REGION
+from .kb_client import AsyncKnowledgeBaseClient
+from .retrieval_cache import RetrievalCache, unwrap_tool_query
+
+from core.settings.base import (
+    KB_ID,
+    KB_REGION,
+    KB_ENDPOINT_URL,
+    KB_TIMEOUT_SECONDS,
+    KB_MAX_CONCURRENCY,
+    KB_POOL_SIZE,
+    KB_CACHE_TTL_SECONDS,
+    KB_CACHE_MAX_ENTRIES,
+    REDIS_URL,
+    KB_BACKEND,
+    KB_BEDROCK_SEARCH_TYPE,
+    KB_HYBRID_CANDIDATES,
+    KB_TOP_K,
 )
 
+_client: Optional[AsyncKnowledgeBaseClient] = None
+_cache: Optional[RetrievalCache] = None
 
-def retrieve_kb(query):
-    results = []
-    # Call KB
-    response = bedrock_agent_runtime.retrieve(
-        knowledgeBaseId=KB_ID,
-        retrievalConfiguration={
-            "vectorSearchConfiguration": {
-                "numberOfResults": 1,
-                "overrideSearchType": "SEMANTIC",
-            }
-        },
-        retrievalQuery={"text": query},
-    )
-    if "retrievalResults" in response:
-        for r in response["retrievalResults"]:
-            results.append(r["content"]["text"])
+
+def get_kb_client() -> AsyncKnowledgeBaseClient:
+    """Returns the knowledge base client shared by this process."""
+    global _client
+    if _client is None:
+        _client = AsyncKnowledgeBaseClient(
+            region=KB_REGION,
+            endpoint_url=KB_ENDPOINT_URL,
+            timeout_seconds=KB_TIMEOUT_SECONDS,
+            max_concurrency=KB_MAX_CONCURRENCY,
+            pool_size=KB_POOL_SIZE,
+        )
+    return _client
+
+
+def get_retrieval_cache() -> Optional[RetrievalCache]:
+    """Returns the retrieval cache of this process, None when disabled."""
+    global _cache
+    if _cache is None and KB_CACHE_TTL_SECONDS > 0:
+        _cache = RetrievalCache(
+            namespace=f"kb-retrieve:{KB_BACKEND}:{KB_ID}",
+            max_entries=KB_CACHE_MAX_ENTRIES,
+            ttl_seconds=KB_CACHE_TTL_SECONDS,
+            redis_url=REDIS_URL,
+            label="kb-retrieve",
+        )
+    return _cache
+
+
+async def retrieve_kb(query):
+    cache = get_retrieval_cache()
+    if cache:
+        cached = await cache.get(query)
+        if cached is not None:
+            return cached
+
+    if KB_BACKEND == "local":
+        results = await _retrieve_local(query)
+    else:
+        results = await _retrieve_bedrock(query)
+
+    # Empty results are not cached, the KB may be updated meanwhile
+    if cache and results:
+        await cache.set(query, results)
     return results
 
 
-def retrieve_and_generation(query):
+async def _retrieve_bedrock(query):
+    # Imported here: the knowledge base app needs Django apps to be loaded
+    from apps.knowledge_base.retrieval import rerank
+
+    # Call KB, then rerank a wider candidate list locally, both on the
+    # query text rather than the tool input JSON
+    text = unwrap_tool_query(query)
+    response = await get_kb_client().retrieve(
+        KB_ID,
+        text,
+        number_of_results=KB_HYBRID_CANDIDATES,
+        search_type=KB_BEDROCK_SEARCH_TYPE,
+    )
+    candidates = [
+        (r["content"]["text"], r["content"]["text"], r.get("score", 1.0))
+        for r in response.get("retrievalResults", [])
+    ]
+    ranked = rerank(text, candidates)
+    return [text for text, _ in ranked[:KB_TOP_K]]
+
+
+async def _retrieve_local(query):
+    from apps.knowledge_base.services import ahybrid_search
+
+    chunks = await ahybrid_search(unwrap_tool_query(query))
+    return [chunk.content for chunk in chunks]
+
+
+async def retrieve_and_generation(query):
     results = []
     custom_prompt = """
       You are a question answering agent. I will provide you with a set of search results.
@@ -39,9 +109,9 @@ def retrieve_and_generation(query):
 
       $output_format_instructions$
       """
-    response = bedrock_agent_runtime.retrieve_and_generate(
-        input={"text": query},
-        retrieveAndGenerateConfiguration={
+    response = await get_kb_client().retrieve_and_generate(
+        query,
+        {
             "type": "KNOWLEDGE_BASE",
             "knowledgeBaseConfiguration": {
                 "knowledgeBaseId": KB_ID,
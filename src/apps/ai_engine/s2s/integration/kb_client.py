@@ -0,0 +1,162 @@
+import asyncio
+import json
+
+from typing import Any, Dict, Optional
+
+import aiohttp
+import boto3
+
+from botocore.auth import SigV4Auth
+from botocore.awsrequest import AWSRequest
+
+from core.settings.base import logger
+
+# Signing name of the bedrock-agent-runtime endpoints
+_SIGNING_NAME = "bedrock"
+
+
+class KnowledgeBaseError(Exception):
+    """Raised when the Retrieve APIs answer with an error status."""
+
+    def __init__(self, status: int, message: str):
+        super().__init__(
+            f"Knowledge base request failed ({status}): {message}"
+        )
+        self.status = status
+        self.message = message
+
+
+def _error_message(body: str) -> str:
+    """The message of an error response, which may not be JSON at all."""
+    try:
+        data = json.loads(body)
+    except ValueError:
+        # e.g. an HTML page from a load balancer
+        return body[:200]
+    if isinstance(data, dict):
+        return str(data.get("message") or data.get("Message") or "")
+    return body[:200]
+
+
+class AsyncKnowledgeBaseClient:
+    """
+    asyncio client for the Bedrock Agent Runtime Retrieve and
+    RetrieveAndGenerate APIs.
+
+    Requests go through one pooled aiohttp session and are signed with
+    SigV4 using the default boto3 credential chain, so retrieval never
+    blocks the event loop. Every call has a deadline (including the time
+    spent waiting for a concurrency slot) and at most `max_concurrency`
+    calls are in flight at once.
+
+    Point `endpoint_url` at a local stub to test without AWS; requests are
+    left unsigned when no credentials are available.
+    """
+
+    def __init__(
+        self,
+        region: str,
+        endpoint_url: Optional[str] = None,
+        timeout_seconds: float = 5.0,
+        max_concurrency: int = 16,
+        pool_size: int = 32,
+    ):
+        self.region = region
+        self.endpoint_url = (
+            endpoint_url
+            or f"https://bedrock-agent-runtime.{region}.amazonaws.com"
+        ).rstrip("/")
+        self.timeout_seconds = timeout_seconds
+        self.pool_size = pool_size
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._credentials = boto3.Session().get_credentials()
+        self._session: Optional[aiohttp.ClientSession] = None
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(
+                    limit=self.pool_size, ttl_dns_cache=300
+                )
+            )
+        return self._session
+
+    async def _sign(self, url: str, body: bytes) -> Dict[str, str]:
+        headers = {"Content-Type": "application/json"}
+        if self._credentials is None:
+            return headers
+
+        # Refreshable credentials may hit the network, keep that off the loop
+        if getattr(self._credentials, "refresh_needed", lambda: False)():
+            credentials = await asyncio.to_thread(
+                self._credentials.get_frozen_credentials
+            )
+        else:
+            credentials = self._credentials.get_frozen_credentials()
+
+        request = AWSRequest(
+            method="POST", url=url, data=body, headers=headers
+        )
+        SigV4Auth(credentials, _SIGNING_NAME, self.region).add_auth(request)
+        return dict(request.headers.items())
+
+    async def _post(
+        self, path: str, payload: Dict[str, Any], timeout: Optional[float]
+    ) -> Dict[str, Any]:
+        url = f"{self.endpoint_url}{path}"
+        body = json.dumps(payload).encode("utf-8")
+
+        async with asyncio.timeout(timeout or self.timeout_seconds):
+            async with self._semaphore:
+                headers = await self._sign(url, body)
+                async with self._get_session().post(
+                    url, data=body, headers=headers
+                ) as response:
+                    if response.status != 200:
+                        raise KnowledgeBaseError(
+                            response.status,
+                            _error_message(await response.text()),
+                        )
+                    return await response.json(content_type=None)
+
+    async def retrieve(
+        self,
+        knowledge_base_id: str,
+        query: str,
+        number_of_results: int = 1,
+        search_type: str = "SEMANTIC",
+        timeout: Optional[float] = None,
+    ) -> Dict[str, Any]:
+        return await self._post(
+            f"/knowledgebases/{knowledge_base_id}/retrieve",
+            {
+                "retrievalQuery": {"text": query},
+                "retrievalConfiguration": {
+                    "vectorSearchConfiguration": {
+                        "numberOfResults": number_of_results,
+                        "overrideSearchType": search_type,
+                    }
+                },
+            },
+            timeout,
+        )
+
+    async def retrieve_and_generate(
+        self,
+        query: str,
+        configuration: Dict[str, Any],
+        timeout: Optional[float] = None,
+    ) -> Dict[str, Any]:
+        return await self._post(
+            "/retrieveAndGenerate",
+            {
+                "input": {"text": query},
+                "retrieveAndGenerateConfiguration": configuration,
+            },
+            timeout,
+        )
+
+    async def close(self):
+        if self._session and not self._session.closed:
+            await self._session.close()
+            logger.info("Knowledge base client session closed")
@@ -0,0 +1,155 @@
+import hashlib
+import json
+import time
+import unicodedata
+
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from ..metrics import REGISTRY
+
+from core.settings.base import logger
+
+# A slow Redis must not add dead air to a voice turn; past this we treat
+# the shared tier as a miss.
+_REDIS_TIMEOUT_SECONDS = 0.1
+
+_LOOKUP_RESULTS = ("local_hit", "shared_hit", "miss")
+
+
+def unwrap_tool_query(query: Any) -> str:
+    """Returns the query text of a tool input like '{"query": "..."}'."""
+    if isinstance(query, str):
+        try:
+            parsed = json.loads(query)
+            if isinstance(parsed, dict) and "query" in parsed:
+                return str(parsed["query"])
+        except ValueError:
+            pass
+    return str(query)
+
+
+def normalize_query(query: Any) -> str:
+    """
+    Normalizes a retrieval query so near-identical questions share a key:
+    tool input JSON is unwrapped, then case and whitespace are folded.
+    Punctuation is kept, it tells apart terms like C++, C# and Node.js.
+    """
+    text = unicodedata.normalize("NFKC", unwrap_tool_query(query)).casefold()
+    return " ".join(text.split())
+
+
+class RetrievalCache:
+    """
+    Two-tier cache for retrieval results: an in-process LRU in front of a
+    Redis shared by every worker. Both tiers expire entries after
+    `ttl_seconds`; the LRU also evicts past `max_entries`.
+
+    Keys are the digest of `normalize(query)`, normalize_query by default.
+    Redis errors and timeouts are logged and count as misses. Lookups are
+    counted in the metrics registry, labelled `label` (the namespace by
+    default).
+    """
+
+    def __init__(
+        self,
+        namespace: str,
+        max_entries: int = 1024,
+        ttl_seconds: int = 3600,
+        redis_url: Optional[str] = None,
+        label: Optional[str] = None,
+        normalize: Callable[[Any], str] = normalize_query,
+    ):
+        self.namespace = namespace
+        self.normalize = normalize
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._local: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self._redis = None
+        if redis_url:
+            import redis.asyncio as redis
+
+            self._redis = redis.from_url(
+                redis_url,
+                socket_timeout=_REDIS_TIMEOUT_SECONDS,
+                socket_connect_timeout=_REDIS_TIMEOUT_SECONDS,
+            )
+        self.local_hits = 0
+        self.shared_hits = 0
+        self.misses = 0
+        self._lookups = {
+            result: REGISTRY.counter(
+                "s2s_retrieval_cache_lookups_total",
+                "Retrieval cache lookups by result.",
+                cache=label or namespace,
+                result=result,
+            )
+            for result in _LOOKUP_RESULTS
+        }
+
+    def _key(self, query: Any) -> str:
+        digest = hashlib.sha1(self.normalize(query).encode("utf-8"))
+        return f"{self.namespace}:{digest.hexdigest()}"
+
+    def _get_local(self, key: str):
+        entry = self._local.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._local[key]
+            return None
+        self._local.move_to_end(key)
+        return value
+
+    def _set_local(self, key: str, value: Any):
+        self._local[key] = (time.monotonic() + self.ttl_seconds, value)
+        self._local.move_to_end(key)
+        while len(self._local) > self.max_entries:
+            self._local.popitem(last=False)
+
+    async def get(self, query: Any) -> Optional[Any]:
+        key = self._key(query)
+        value = self._get_local(key)
+        if value is not None:
+            self.local_hits += 1
+            self._lookups["local_hit"].inc()
+            return value
+
+        if self._redis is not None:
+            try:
+                raw = await self._redis.get(key)
+                if raw is not None:
+                    value = json.loads(raw)
+                    self._set_local(key, value)
+                    self.shared_hits += 1
+                    self._lookups["shared_hit"].inc()
+                    return value
+            except Exception as e:
+                logger.warning(f"Retrieval cache read failed: {e}")
+
+        self.misses += 1
+        self._lookups["miss"].inc()
+        return None
+
+    async def set(self, query: Any, value: Any):
+        key = self._key(query)
+        self._set_local(key, value)
+        if self._redis is not None:
+            try:
+                await self._redis.set(
+                    key, json.dumps(value), ex=self.ttl_seconds
+                )
+            except Exception as e:
+                logger.warning(f"Retrieval cache write failed: {e}")
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.local_hits + self.shared_hits + self.misses
+        hits = self.local_hits + self.shared_hits
+        return {
+            "local_hits": self.local_hits,
+            "shared_hits": self.shared_hits,
+            "misses": self.misses,
+            "hit_rate": hits / lookups if lookups else 0.0,
+            "local_size": len(self._local),
+        }
@@ -0,0 +1,313 @@
+import threading
+import time
+
+from bisect import bisect_left
+from typing import Dict, Optional, Sequence, Tuple
+
+# Upper bounds, in seconds, suited to voice turn latencies
+DEFAULT_LATENCY_BUCKETS = (
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+)
+
+# Upper bounds, in events per second, suited to audio frame rates
+DEFAULT_RATE_BUCKETS = (1, 2, 5, 8, 10, 12, 15, 20, 30, 50, 100)
+
+
+class RateMeter:
+    """
+    Counts events and reports how many happened during the last full window.
+
+    Cheap enough to be marked from the audio hot path: no timestamps are kept,
+    only the count of the current window and the rate of the previous one.
+    When given a histogram, the rate of every window with events goes to it.
+    """
+
+    def __init__(
+        self,
+        window_seconds: float = 1.0,
+        histogram: Optional["Histogram"] = None,
+    ):
+        self.window_seconds = window_seconds
+        self.histogram = histogram
+        self.total = 0
+        self._window_start = time.monotonic()
+        self._window_count = 0
+        self._last_rate = 0.0
+
+    def _roll(self, now: float):
+        elapsed = now - self._window_start
+        if elapsed < self.window_seconds:
+            return
+        # Events are counted before their window ends, so this is its rate
+        if self.histogram is not None and self._window_count:
+            self.histogram.observe(self._window_count / self.window_seconds)
+        # A gap longer than two windows means the previous window was empty.
+        if elapsed < 2 * self.window_seconds:
+            self._last_rate = self._window_count / self.window_seconds
+        else:
+            self._last_rate = 0.0
+        self._window_start = now
+        self._window_count = 0
+
+    def mark(self, count: int = 1):
+        self._roll(time.monotonic())
+        self._window_count += count
+        self.total += count
+
+    @property
+    def rate(self) -> float:
+        """Events per second over the last full window."""
+        self._roll(time.monotonic())
+        return self._last_rate
+
+
+class Histogram:
+    """
+    Fixed-bucket histogram (Prometheus style): observing is a bisect and an
+    increment, whatever the number of samples. Quantiles are estimated by
+    interpolating inside the bucket they fall in.
+    """
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        # One count per bucket, plus the +Inf overflow bucket
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.min = float("inf")
+        self.max = float("-inf")
+
+    def observe(self, value: float):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+
+    def quantile(self, q: float) -> float:
+        if not self.count:
+            return 0.0
+        return min(max(self._estimate(q), self.min), self.max)
+
+    def _estimate(self, q: float) -> float:
+        rank = q * self.count
+        seen = 0
+        for index, count in enumerate(self.counts):
+            if count and seen + count >= rank:
+                lower = self.buckets[index - 1] if index else 0.0
+                if index == len(self.buckets):
+                    # Nothing is known above the last bound
+                    return lower
+                upper = self.buckets[index]
+                return lower + (upper - lower) * (rank - seen) / count
+            seen += count
+        return self.buckets[-1]
+
+    def snapshot(self) -> Dict[str, float]:
+        return {
+            "count": self.count,
+            "mean": self.sum / self.count if self.count else 0.0,
+            "p50": self.quantile(0.5),
+            "p95": self.quantile(0.95),
+            "p99": self.quantile(0.99),
+        }
+
+
+class Counter:
+    """Monotonic count (Prometheus counter)."""
+
+    def __init__(self):
+        self.value = 0
+
+    def inc(self, amount: float = 1):
+        self.value += amount
+
+
+def _format_labels(labels: Tuple[Tuple[str, str], ...], **extra) -> str:
+    pairs = [*labels, *extra.items()]
+    if not pairs:
+        return ""
+    escaped = (
+        (name, str(value).replace("\\", "\\\\").replace('"', '\\"'))
+        for name, value in pairs
+    )
+    return "{" + ",".join(f'{name}="{value}"' for name, value in escaped) + "}"
+
+
+class MetricsRegistry:
+    """
+    The histograms and counters of this process, by name and labels,
+    rendered in the Prometheus text exposition format. Each worker process
+    exposes its own.
+    """
+
+    def __init__(self):
+        # name: (type, help text, metrics by labels)
+        self._families: Dict[str, Tuple[str, str, Dict[Tuple, object]]] = {}
+        self._lock = threading.Lock()
+
+    def _metric(self, kind, factory, name, help_text, labels):
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            family_kind, _, metrics = self._families.setdefault(
+                name, (kind, help_text, {})
+            )
+            if family_kind != kind:
+                raise ValueError(f"{name} is already a {family_kind}")
+            if key not in metrics:
+                metrics[key] = factory()
+            return metrics[key]
+
+    def histogram(
+        self,
+        name: str,
+        help_text: str,
+        buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS,
+        **labels: str,
+    ) -> Histogram:
+        return self._metric(
+            "histogram", lambda: Histogram(buckets), name, help_text, labels
+        )
+
+    def counter(self, name: str, help_text: str, **labels: str) -> Counter:
+        return self._metric("counter", Counter, name, help_text, labels)
+
+    def render(self) -> str:
+        lines = []
+        with self._lock:
+            families = {
+                name: (kind, help_text, dict(metrics))
+                for name, (kind, help_text, metrics) in self._families.items()
+            }
+        for name, (kind, help_text, metrics) in sorted(families.items()):
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+            for labels, metric in metrics.items():
+                if kind == "counter":
+                    lines.append(
+                        f"{name}{_format_labels(labels)} {metric.value}"
+                    )
+                    continue
+                cumulative = 0
+                for bound, count in zip(metric.buckets, metric.counts):
+                    cumulative += count
+                    lines.append(
+                        f"{name}_bucket{_format_labels(labels, le=bound)} "
+                        f"{cumulative}"
+                    )
+                lines.append(
+                    f"{name}_bucket{_format_labels(labels, le='+Inf')} "
+                    f"{metric.count}"
+                )
+                lines.append(
+                    f"{name}_sum{_format_labels(labels)} {metric.sum}"
+                )
+                lines.append(
+                    f"{name}_count{_format_labels(labels)} {metric.count}"
+                )
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = MetricsRegistry()
+
+# Per-turn voice latencies, exported by every session to REGISTRY
+TURN_METRICS = {
+    "audio_input_send": (
+        "s2s_audio_input_send_seconds",
+        "Client audio arrival to its send to Bedrock.",
+    ),
+    "first_text": (
+        "s2s_first_text_seconds",
+        "End of user speech to the first assistant text.",
+    ),
+    "first_audio": (
+        "s2s_first_audio_seconds",
+        "End of user speech to the first assistant audio.",
+    ),
+    "websocket_send": (
+        "s2s_websocket_send_seconds",
+        "Time to send one message to the client WebSocket.",
+    ),
+    "resume_ready": (
+        "s2s_resume_ready_seconds",
+        "Reconnect to the resumed stream accepting audio, history replayed.",
+    ),
+    "resume_first_audio": (
+        "s2s_resume_first_audio_seconds",
+        "Reconnect to the first assistant audio of the resumed session.",
+    ),
+}
+
+
+class SessionLatency:
+    """
+    Latencies of one speech to speech session. Each observation goes to
+    the session's own histograms, summarized on the InterviewSession, and
+    to the process-wide ones of REGISTRY when it has one.
+
+    The end of user speech is taken as the arrival of the user transcript,
+    which Nova Sonic emits once it detects the end of the utterance.
+    """
+
+    def __init__(self, registry: MetricsRegistry = REGISTRY):
+        self._local: Dict[str, Histogram] = {}
+        self._shared = {
+            name: registry.histogram(metric, help_text)
+            for name, (metric, help_text) in TURN_METRICS.items()
+        }
+        self.turns = 0
+        self._speech_ended_at: Optional[float] = None
+        self._awaiting_text = False
+        self._awaiting_audio = False
+
+    def observe(self, name: str, seconds: float):
+        if name not in self._local:
+            self._local[name] = Histogram()
+        self._local[name].observe(seconds)
+        shared = self._shared.get(name)
+        if shared is not None:
+            shared.observe(seconds)
+
+    def user_speech_ended(self):
+        self.turns += 1
+        self._speech_ended_at = time.perf_counter()
+        self._awaiting_text = self._awaiting_audio = True
+
+    def assistant_text(self):
+        if self._awaiting_text:
+            self._awaiting_text = False
+            self.observe(
+                "first_text", time.perf_counter() - self._speech_ended_at
+            )
+
+    def assistant_audio(self):
+        if self._awaiting_audio:
+            self._awaiting_audio = False
+            self.observe(
+                "first_audio", time.perf_counter() - self._speech_ended_at
+            )
+
+    def summary(self) -> Dict[str, object]:
+        """Count and mean/p50/p95/p99 in milliseconds of each metric."""
+        metrics = {}
+        for name, histogram in self._local.items():
+            snapshot = histogram.snapshot()
+            metrics[name] = {
+                "count": snapshot.pop("count"),
+                **{
+                    f"{key}_ms": round(value * 1000, 1)
+                    for key, value in snapshot.items()
+                },
+            }
+        return {"turns": self.turns, "metrics": metrics}
@@ -0,0 +1,116 @@
+import asyncio
+from typing import Any, Callable, Dict, List, Optional
+
+from .metrics import Counter
+
+
+class BoundedQueue(asyncio.Queue):
+    """
+    asyncio.Queue with a size limit and a policy for what happens when a
+    producer finds it full:
+
+    - block: `put` waits for room (backpressure on the producer).
+    - drop_oldest: the oldest queued item is discarded to make room.
+    - drop_newest: the incoming item is discarded.
+
+    Items matching `is_control` (e.g. flush requests) are never dropped
+    and never wait: they are queued past the limit, in order.
+
+    It also keeps counters for dropped items and the high-water mark, so we
+    can tell how close a session got to its limit. Drops also go to
+    `dropped_counter` when given.
+    """
+
+    BLOCK = "block"
+    DROP_OLDEST = "drop_oldest"
+    DROP_NEWEST = "drop_newest"
+    POLICIES = (BLOCK, DROP_OLDEST, DROP_NEWEST)
+
+    def __init__(
+        self,
+        maxsize: int = 0,
+        policy: str = BLOCK,
+        is_control: Optional[Callable[[Any], bool]] = None,
+        dropped_counter: Optional[Counter] = None,
+    ):
+        if policy not in self.POLICIES:
+            raise ValueError(
+                f"Unknown queue policy '{policy}', expected one of {self.POLICIES}"
+            )
+        super().__init__(maxsize=maxsize)
+        self.policy = policy
+        self.is_control = is_control or (lambda item: False)
+        self.dropped_counter = dropped_counter
+        self.dropped = 0
+        self.high_water = 0
+        self._unbounded = False
+
+    def full(self) -> bool:
+        return not self._unbounded and super().full()
+
+    def _drop(self):
+        self.dropped += 1
+        if self.dropped_counter is not None:
+            self.dropped_counter.inc()
+
+    def _drop_oldest(self) -> bool:
+        """Discards the oldest item that is not a control item."""
+        for index, item in enumerate(self._queue):
+            if not self.is_control(item):
+                del self._queue[index]
+                self.task_done()
+                self._drop()
+                return True
+        return False
+
+    def _put_unbounded(self, item: Any):
+        self._unbounded = True
+        try:
+            super().put_nowait(item)
+        finally:
+            self._unbounded = False
+
+    def put_nowait(self, item: Any):
+        if self.is_control(item):
+            self._put_unbounded(item)
+            return
+        if self.full() and self.policy != self.BLOCK:
+            # drop_newest, or drop_oldest with only control items queued
+            if self.policy == self.DROP_NEWEST or not self._drop_oldest():
+                self._drop()
+                return
+        super().put_nowait(item)
+        if self.qsize() > self.high_water:
+            self.high_water = self.qsize()
+
+    async def put(self, item: Any):
+        if self.policy == self.BLOCK and not self.is_control(item):
+            # asyncio.Queue.put waits for room, then calls put_nowait
+            await super().put(item)
+        else:
+            self.put_nowait(item)
+
+    def purge(self, predicate: Callable[[Any], bool]) -> List[Any]:
+        """
+        Removes the queued items matching `predicate`, keeping the order of
+        the others, and returns them. Producers waiting for room are woken.
+        """
+        kept = []
+        removed = []
+        while not self.empty():
+            item = self.get_nowait()
+            self.task_done()
+            (removed if predicate(item) else kept).append(item)
+        for item in kept:
+            # The queue held these items a moment ago, control items included
+            self._put_unbounded(item)
+        return removed
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "maxsize": self.maxsize,
+            "policy": self.policy,
+            "size": self.qsize(),
+            "high_water": self.high_water,
+            "dropped": self.dropped,
+        }
@@ -0,0 +1,78 @@
+import json
+import re
+import time
+
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+
+# The event name is the first key of the "event" object, near the start of
+# every Bedrock output frame.
+_EVENT_NAME = re.compile(rb'"event"\s*:\s*\{\s*"(\w+)"')
+_EVENT_NAME_SCAN_BYTES = 128
+
+_CONTENT_ID = re.compile(r'"contentId"\s*:\s*"([^"]+)"')
+
+# Events forwarded to the client untouched. Nothing on the server looks
+# inside them, and they carry the large base64 payloads.
+PASSTHROUGH_EVENTS = frozenset({"audioOutput"})
+
+# textOutput content Nova Sonic sends when the user talks over the assistant
+BARGE_IN_MARKER = '{ "interrupted" : true }'
+
+
+@dataclass(slots=True)
+class OutputEvent:
+    """A Bedrock output event on its way to the client."""
+
+    name: Optional[str]
+    # JSON text sent to the client as is, with the timestamp spliced in
+    raw: str
+    # Parsed event, only for the events the server inspects
+    data: Optional[Dict[str, Any]] = None
+
+
+def read_event_name(payload: bytes) -> Optional[str]:
+    match = _EVENT_NAME.search(payload, 0, _EVENT_NAME_SCAN_BYTES)
+    return match.group(1).decode("ascii") if match else None
+
+
+def read_content_id(text: str) -> Optional[str]:
+    """
+    Returns the contentId of an event without parsing it. The key is found
+    with str.find, so the base64 payload of audio frames is not scanned by
+    the regex.
+    """
+    start = text.find('"contentId"')
+    if start < 0:
+        return None
+    match = _CONTENT_ID.match(text, start)
+    return match.group(1) if match else None
+
+
+def _stamp(text: str, timestamp: int) -> str:
+    """Adds the timestamp key to a JSON object without re-encoding it."""
+    body = text.lstrip()
+    if not body.startswith("{"):
+        return text
+    rest = body[1:].lstrip()
+    separator = "" if rest.startswith("}") else ", "
+    return f'{{"timestamp": {timestamp}{separator}{rest}'
+
+
+def route_output(payload: bytes) -> OutputEvent:
+    """
+    Reads only the event name of a Bedrock output frame. Pass-through events
+    are forwarded as the original text, the rest are also parsed for tool
+    use, transcripts and barge-in. Raises json.JSONDecodeError for non-JSON
+    frames.
+    """
+    name = read_event_name(payload)
+    text = payload.decode("utf-8")
+    timestamp = int(time.time() * 1000)
+
+    if name in PASSTHROUGH_EVENTS:
+        return OutputEvent(name, _stamp(text, timestamp))
+
+    data = json.loads(text)
+    data["timestamp"] = timestamp
+    return OutputEvent(name, _stamp(text, timestamp), data)
@@ -1,41 +1,67 @@
 import asyncio
+import base64
 import json
+import time
 import warnings
 import uuid
-import time
-import os
 
 from typing import Dict, Any
 
 from aws_sdk_bedrock_runtime.client import (
-    BedrockRuntimeClient,
     InvokeModelWithBidirectionalStreamOperationInput,
 )
 from aws_sdk_bedrock_runtime.models import (
     InvokeModelWithBidirectionalStreamInputChunk,
     BidirectionalInputPayloadPart,
 )
-from aws_sdk_bedrock_runtime.config import (
-    Config,
-    HTTPAuthSchemeResolver,
-    SigV4AuthScheme,
-)
-from smithy_aws_core.credentials_resolvers.environment import (
-    EnvironmentCredentialsResolver,
-)
 
-from smithy_http.aio.aiohttp import AIOHTTPClient
-from smithy_aws_core.credentials_resolvers.container import (
-    ContainerCredentialsResolver,
-)
+from .audio import AudioCoalescer, frame_size_bytes
+from .clients import get_bedrock_runtime_client
 from .events import S2sEvent
-from .integration import inline_agent, kb
+from .metrics import DEFAULT_RATE_BUCKETS, REGISTRY
+from .metrics import RateMeter, SessionLatency
+from .queues import BoundedQueue
+from .routing import (
+    BARGE_IN_MARKER,
+    OutputEvent,
+    read_content_id,
+    route_output,
+)
+from .stream_pool import get_stream_pool
+from .tools import TOOLS
 
 from core.settings.base import logger
+from core.settings.base import S2S_AUDIO_FRAME_MS, S2S_AUDIO_FLUSH_MS
+from core.settings.base import (
+    S2S_AUDIO_INPUT_QUEUE_SIZE,
+    S2S_AUDIO_INPUT_QUEUE_POLICY,
+    S2S_OUTPUT_QUEUE_SIZE,
+    S2S_OUTPUT_QUEUE_POLICY,
+)
 
 # Suppress warnings
 warnings.filterwarnings("ignore")
 
+# Upper bounds, in items, of the session queue high-water marks
+_QUEUE_FILL_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128, 256, 512, 1024)
+
+
+def _queue_dropped(queue: str):
+    return REGISTRY.counter(
+        "s2s_queue_dropped_total",
+        "Items dropped by full session queues.",
+        queue=queue,
+    )
+
+
+def _queue_high_water(queue: str):
+    return REGISTRY.histogram(
+        "s2s_queue_high_water",
+        "Most items a session queue held at once.",
+        buckets=_QUEUE_FILL_BUCKETS,
+        queue=queue,
+    )
+
 
 class S2sSessionManager:
     """Manages bidirectional streaming with AWS Bedrock using asyncio"""
@@ -52,8 +78,44 @@ class S2sSessionManager:
         self.region = region
 
         # Audio and output queues
-        self.audio_input_queue = asyncio.Queue()
-        self.output_queue = asyncio.Queue()
+        self.audio_input_queue = BoundedQueue(
+            S2S_AUDIO_INPUT_QUEUE_SIZE,
+            S2S_AUDIO_INPUT_QUEUE_POLICY,
+            # Flush requests must not be dropped under backpressure
+            is_control=lambda item: "flushed" in item,
+            dropped_counter=_queue_dropped("audio_input"),
+        )
+        self.output_queue = BoundedQueue(
+            S2S_OUTPUT_QUEUE_SIZE,
+            S2S_OUTPUT_QUEUE_POLICY,
+            dropped_counter=_queue_dropped("output"),
+        )
+
+        # Audio input framing
+        self.audio_coalescer = AudioCoalescer(
+            frame_size_bytes(
+                S2sEvent.DEFAULT_AUDIO_INPUT_CONFIG, S2S_AUDIO_FRAME_MS
+            )
+        )
+        self.audio_flush_seconds = S2S_AUDIO_FLUSH_MS / 1000
+        self.audio_frames_sent = RateMeter(
+            histogram=REGISTRY.histogram(
+                "s2s_audio_input_frames_per_second",
+                "Audio frames sent to Bedrock per second of streaming.",
+                buckets=DEFAULT_RATE_BUCKETS,
+            )
+        )
+        # Arrival of the oldest client audio not yet sent to Bedrock
+        self._audio_pending_since = None
+        self.latency = SessionLatency()
+
+        # Assistant audio content being played, and the one the user talked
+        # over: its frames still queued or still arriving are not sent
+        self.current_audio_content_id = None
+        self.interrupted_content_id = None
+        self.barge_ins = 0
+        self.barge_in_skipped_frames = 0
+        self.barge_in_skipped_bytes = 0
 
         self.response_task = None
         self.response_audio_task = None
@@ -65,36 +127,19 @@ class S2sSessionManager:
         self.prompt_name = None  # Will be set from frontend
         self.content_name = None  # Will be set from frontend
         self.audio_content_name = None  # Will be set from frontend
-        self.toolUseContent = ""
-        self.toolUseId = ""
-        self.toolName = ""
+        # Tool uses waiting for their contentEnd, by toolUseId, and the
+        # running tool calls, also by toolUseId
+        self.pending_tool_uses: Dict[str, Dict[str, Any]] = {}
+        self.tool_tasks: Dict[str, asyncio.Task] = {}
+        self._tool_result_lock = asyncio.Lock()
         self.mcp_loc_client = mcp_client
         self.strands_agent = strands_agent
         self.stream_healthy = asyncio.Event()  # NEW: The health signal
         self.initialization_error = None  # NEW: To store any startup error
 
     def _initialize_client(self):
-        """Initialize the Bedrock client."""
-        if os.environ.get("STAGE") == "dev":
-            logger.debug(
-                f"{os.environ.get('STAGE')} config, using local resolver"
-            )
-            resolver = EnvironmentCredentialsResolver()
-        else:
-            logger.debug(
-                f"{os.environ.get('STAGE')} config, using container resolver"
-            )
-            http_client = AIOHTTPClient()
-            resolver = ContainerCredentialsResolver(http_client=http_client)
-
-        config = Config(
-            endpoint_uri=f"https://bedrock-runtime.{self.region}.amazonaws.com",
-            region=self.region,
-            aws_credentials_identity_resolver=resolver,
-            http_auth_scheme_resolver=HTTPAuthSchemeResolver(),
-            http_auth_schemes={"aws.auth#sigv4": SigV4AuthScheme()},
-        )
-        self.bedrock_client = BedrockRuntimeClient(config=config)
+        """Use the Bedrock client shared by every session of this process."""
+        self.bedrock_client = get_bedrock_runtime_client(self.region)
 
     async def initialize_stream(self):
         """Initialize the bidirectional stream with Bedrock."""
@@ -107,16 +152,16 @@ class S2sSessionManager:
             raise ex
 
         try:
-            # Initialize the stream
-            self.stream = (
-                await (
-                    self.bedrock_client.invoke_model_with_bidirectional_stream(
-                        InvokeModelWithBidirectionalStreamOperationInput(
-                            model_id=self.model_id
-                        )
+            # Claim a pre-opened stream when pooling is enabled
+            pool = get_stream_pool(self.region, self.model_id)
+            if pool:
+                self.stream = await pool.claim()
+            else:
+                self.stream = await self.bedrock_client.invoke_model_with_bidirectional_stream(
+                    InvokeModelWithBidirectionalStreamOperationInput(
+                        model_id=self.model_id
                     )
                 )
-            )
             self.is_active = True
 
             # Start listening for responses
@@ -127,8 +172,9 @@ class S2sSessionManager:
                 self._process_audio_input()
             )
 
-            # Wait a bit to ensure everything is set up
-            await asyncio.sleep(0.2)
+            if not pool:
+                # Wait a bit to ensure everything is set up
+                await asyncio.sleep(0.2)
 
             print("Stream initialized successfully")
             return self
@@ -138,36 +184,57 @@ class S2sSessionManager:
             raise
 
     async def send_raw_event(self, event_data: Dict[str, Any]):
+        """Send a raw event to the Bedrock stream."""
+        await self.send_raw_bytes(json.dumps(event_data).encode("utf-8"))
+
+        # Close session
+        if "sessionEnd" in event_data["event"]:
+            await self.close()
+
+    async def send_raw_bytes(self, event_bytes: bytes):
+        """Send an already encoded event to the Bedrock stream."""
         try:
-            """Send a raw event to the Bedrock stream."""
             if not self.stream or not self.is_active:
                 logger.warning("Stream not initialized or closed")
                 return
 
-            event_json = json.dumps(event_data)
-            # if "audioInput" not in event_data["event"]:
-            #    print(event_json)
             event = InvokeModelWithBidirectionalStreamInputChunk(
-                value=BidirectionalInputPayloadPart(
-                    bytes_=event_json.encode("utf-8")
-                )
+                value=BidirectionalInputPayloadPart(bytes_=event_bytes)
             )
             await self.stream.input_stream.send(event)
 
-            # Close session
-            if "sessionEnd" in event_data["event"]:
-                await self.close()
-
         except Exception as e:
             logger.error(f"Error sending event: {str(e)}")
             raise e
 
     async def _process_audio_input(self):
-        """Process audio input from the queue and send to Bedrock."""
+        """
+        Process audio input from the queue and send it to Bedrock.
+
+        Queued chunks go through the coalescer, so Bedrock receives frames of
+        S2S_AUDIO_FRAME_MS instead of one event per client chunk. A partial
+        frame is sent when no audio arrives for S2S_AUDIO_FLUSH_MS.
+        """
         while self.is_active:
             try:
-                # Get audio data from the queue
-                data = await self.audio_input_queue.get()
+                timeout = (
+                    self.audio_flush_seconds
+                    if self.audio_coalescer.pending
+                    else None
+                )
+                try:
+                    data = await asyncio.wait_for(
+                        self.audio_input_queue.get(), timeout
+                    )
+                except asyncio.TimeoutError:
+                    await self._send_audio_frames(self.audio_coalescer.flush())
+                    continue
+
+                # Flush request, see flush_audio_input
+                if "flushed" in data:
+                    await self._send_audio_frames(self.audio_coalescer.flush())
+                    data["flushed"].set()
+                    continue
 
                 # Extract data from the queue item
                 prompt_name = data.get("prompt_name")
@@ -178,19 +245,23 @@ class S2sSessionManager:
                     logger.warning("Missing required audio data properties")
                     continue
 
-                # Create the audio input event
-                audio_event = S2sEvent.audio_input(
-                    prompt_name,
-                    content_name,
-                    (
-                        audio_bytes.decode("utf-8")
-                        if isinstance(audio_bytes, bytes)
-                        else audio_bytes
-                    ),
+                # Raw PCM comes from binary frames, base64 text from JSON ones
+                pcm = (
+                    audio_bytes
+                    if isinstance(audio_bytes, bytes)
+                    else base64.b64decode(audio_bytes)
                 )
-
-                # Send the event
-                await self.send_raw_event(audio_event)
+                received_at = data.get("received_at")
+                if self._audio_pending_since is None:
+                    self._audio_pending_since = received_at
+                await self._send_audio_frames(
+                    self.audio_coalescer.add(prompt_name, content_name, pcm)
+                )
+                # What is left in the coalescer came with this chunk
+                if self.audio_coalescer.pending:
+                    self._audio_pending_since = (
+                        self._audio_pending_since or received_at
+                    )
 
             except asyncio.CancelledError:
                 break
@@ -198,17 +269,68 @@ class S2sSessionManager:
                 logger.error(f"Error processing audio: {e}")
                 raise e
 
-    def add_audio_chunk(self, prompt_name, content_name, audio_data):
-        """Add an audio chunk to the queue."""
-        # The audio_data is already a base64 string from the frontend
-        self.audio_input_queue.put_nowait(
+    async def _send_audio_frames(self, frames):
+        for prompt_name, content_name, pcm in frames:
+            audio_event = S2sEvent.audio_input_bytes(
+                prompt_name, content_name, base64.b64encode(pcm)
+            )
+            await self.send_raw_bytes(audio_event)
+            self.audio_frames_sent.mark()
+        if frames and self._audio_pending_since is not None:
+            self.latency.observe(
+                "audio_input_send",
+                time.perf_counter() - self._audio_pending_since,
+            )
+            self._audio_pending_since = None
+
+    @property
+    def audio_frames_per_second(self) -> float:
+        """Audio frames sent to Bedrock per second."""
+        return self.audio_frames_sent.rate
+
+    async def flush_audio_input(self, timeout: float = 1.0):
+        """
+        Sends every queued and buffered audio chunk to Bedrock. Call it before
+        ending the audio content so no audio arrives after its contentEnd.
+        """
+        flushed = asyncio.Event()
+        await self.audio_input_queue.put({"flushed": flushed})
+        try:
+            await asyncio.wait_for(flushed.wait(), timeout)
+        except asyncio.TimeoutError:
+            logger.warning("Timed out flushing audio input")
+
+    async def add_audio_chunk(self, prompt_name, content_name, audio_data):
+        """
+        Add an audio chunk to the queue.
+
+        audio_data is either raw PCM bytes (binary WebSocket frames) or the
+        base64 string sent by clients still using JSON audioInput events.
+        """
+        await self.audio_input_queue.put(
             {
                 "prompt_name": prompt_name,
                 "content_name": content_name,
                 "audio_bytes": audio_data,
+                "received_at": time.perf_counter(),
             }
         )
 
+    def queue_stats(self) -> Dict[str, Any]:
+        """Size, high-water mark and drop counters of both queues."""
+        return {
+            "audio_input": self.audio_input_queue.stats(),
+            "output": self.output_queue.stats(),
+        }
+
+    def barge_in_stats(self) -> Dict[str, Any]:
+        """Barge-ins of the session and the assistant audio they skipped."""
+        return {
+            "barge_ins": self.barge_ins,
+            "skipped_frames": self.barge_in_skipped_frames,
+            "skipped_bytes": self.barge_in_skipped_bytes,
+        }
+
     async def _process_responses(self):
         """
         Main task to process incoming responses from the Bedrock stream.
@@ -233,25 +355,24 @@ class S2sSessionManager:
             self.is_active = False
 
     async def _handle_next_message(self, output_stream):
-        """Receives, decodes, and dispatches a single message from the stream."""
+        """Receives, routes, and dispatches a single message from the stream."""
         try:
             result = await output_stream[1].receive()
             if not (result.value and result.value.bytes_):
                 return  # Skip empty messages
 
-            response_data = result.value.bytes_.decode("utf-8")
-            json_data = json.loads(response_data)
+            payload = result.value.bytes_
+            event = route_output(payload)
 
-            await self._dispatch_message(json_data)
+            await self._dispatch_message(event)
 
         except StopAsyncIteration:
             logger.info("Bedrock stream has ended.")
             self.is_active = False  # Signal the main loop to exit.
         except json.JSONDecodeError:
             logger.warning(
-                f"Received non-JSON response from Bedrock: {response_data}"
+                f"Received non-JSON response from Bedrock: {payload!r}"
             )
-            await self.output_queue.put({"raw_data": response_data})
         except Exception as e:
             logger.error(f"Error receiving or decoding message: {e}")
             # Depending on severity, you might want to stop the session.
@@ -259,143 +380,190 @@ class S2sSessionManager:
             if "ValidationException" in str(e):
                 self.is_active = False
 
-    async def _dispatch_message(self, json_data: Dict[str, Any]):
+    async def _dispatch_message(self, event: OutputEvent):
         """Inspects a message and routes it to the correct handler (e.g., tool use)."""
-        json_data["timestamp"] = int(time.time() * 1000)
-
-        if "event" in json_data:
-            event_name = list(json_data["event"].keys())[0]
-            event_data = json_data["event"][event_name]
+        if event.data and "event" in event.data:
+            event_data = event.data["event"][event.name]
 
-            if event_name == "toolUse":
+            if event.name == "toolUse":
                 self._handle_tool_use_start(event_data)
             elif (
-                event_name == "contentEnd" and event_data.get("type") == "TOOL"
+                event.name == "contentStart"
+                and event_data.get("type") == "AUDIO"
+            ):
+                self.current_audio_content_id = event_data.get("contentId")
+            elif (
+                event.name == "contentEnd" and event_data.get("type") == "TOOL"
             ):
                 await self._handle_tool_use_end(event_data)
+            elif event.name == "contentEnd" and (
+                event_data.get("contentId") == self.interrupted_content_id
+            ):
+                self.interrupted_content_id = None
+            elif event.name == "textOutput" and BARGE_IN_MARKER in (
+                event_data.get("content", "")
+            ):
+                self.cancel_tool_tasks("barge-in")
+                await self._handle_barge_in()
+            elif event.name == "textOutput":
+                # The user transcript marks the end of the user's speech
+                if event_data.get("role") == "USER":
+                    self.latency.user_speech_ended()
+                else:
+                    self.latency.assistant_text()
+        elif event.name == "audioOutput":
+            if self.interrupted_content_id is not None and (
+                read_content_id(event.raw) == self.interrupted_content_id
+            ):
+                # The rest of the interrupted answer, nobody will hear it
+                self._skip_audio([event])
+                return
+            self.latency.assistant_audio()
 
         # Always forward the original message to the client.
-        await self.output_queue.put(json_data)
+        await self.output_queue.put(event)
+
+    async def _handle_barge_in(self):
+        """
+        The user talked over the assistant: drops the queued audio of the
+        interrupted content and tells the client to flush what it has
+        buffered for playback. Frames of that content still arriving from
+        Bedrock are dropped until its contentEnd.
+        """
+        self.barge_ins += 1
+        content_id = self.current_audio_content_id
+        if content_id is None:
+            return
+        self.interrupted_content_id = content_id
+
+        purged = self.output_queue.purge(
+            lambda queued: queued.name == "audioOutput"
+            and read_content_id(queued.raw) == content_id
+        )
+        self._skip_audio(purged)
+        logger.info(
+            f"Barge-in on content {content_id}: dropped {len(purged)} "
+            "queued audio frames"
+        )
+
+        flush = {
+            "event": {
+                "audioFlush": {
+                    "promptName": self.prompt_name,
+                    "contentId": content_id,
+                }
+            },
+            "timestamp": int(time.time() * 1000),
+        }
+        await self.output_queue.put(
+            OutputEvent("audioFlush", json.dumps(flush))
+        )
+
+    def _skip_audio(self, events):
+        self.barge_in_skipped_frames += len(events)
+        # The frames are ASCII JSON, characters are bytes
+        self.barge_in_skipped_bytes += sum(len(e.raw) for e in events)
 
     def _handle_tool_use_start(self, tool_use_data: Dict[str, Any]):
-        """Stores the state of a tool use request when it begins."""
-        self.tool_use_content = tool_use_data
-        self.tool_name = tool_use_data.get("toolName", "")
-        self.tool_use_id = tool_use_data.get("toolUseId", "")
+        """Stores a tool use request until its content block ends."""
+        tool_use_id = tool_use_data.get("toolUseId", "")
+        self.pending_tool_uses[tool_use_id] = tool_use_data
         logger.info(
-            f"Tool use detected: {self.tool_name}, ID: {self.tool_use_id}"
+            f"Tool use detected: {tool_use_data.get('toolName', '')}, "
+            f"ID: {tool_use_id}"
         )
 
+    def _pop_tool_use(self, content_end_data: Dict[str, Any]):
+        """Finds the tool use whose content block just ended."""
+        content_id = content_end_data.get("contentId")
+        for tool_use_id, tool_use in self.pending_tool_uses.items():
+            if tool_use.get("contentId") == content_id:
+                return self.pending_tool_uses.pop(tool_use_id)
+        # Fall back to the latest request if the ids do not match
+        if self.pending_tool_uses:
+            return self.pending_tool_uses.pop(
+                next(reversed(self.pending_tool_uses))
+            )
+        return None
+
     async def _handle_tool_use_end(self, content_end_data: Dict[str, Any]):
         """
-        Executes the tool and sends the results back to Bedrock when a
-        tool use content block ends.
+        Starts the tool call when a tool use content block ends. The call
+        runs as its own task so the response loop keeps streaming.
         """
         prompt_name = content_end_data.get("promptName")
-        if not all([prompt_name, self.tool_name, self.tool_use_id]):
+        tool_use = self._pop_tool_use(content_end_data)
+        if not prompt_name or not tool_use:
             logger.warning("Missing context to handle tool use end. Aborting.")
             return
 
-        logger.info(f"Processing result for tool '{self.tool_name}'")
-        tool_result = await self.processToolUse(
-            self.tool_name, self.tool_use_content
+        tool_use_id = tool_use.get("toolUseId", "")
+        task = asyncio.create_task(self._run_tool(prompt_name, tool_use))
+        self.tool_tasks[tool_use_id] = task
+        task.add_done_callback(
+            lambda _: self.tool_tasks.pop(tool_use_id, None)
         )
 
-        # The response sequence must be: start, input, end.
-        tool_content_name = f"tool-content-{uuid.uuid4()}"
+    async def _run_tool(self, prompt_name: str, tool_use: Dict[str, Any]):
+        """Runs one tool call within its budget and sends back the result."""
+        tool_name = tool_use.get("toolName", "")
+        tool_use_id = tool_use.get("toolUseId", "")
 
-        # 1. Send tool start event
-        start_event = S2sEvent.content_start_tool(
-            prompt_name, tool_content_name, self.tool_use_id
-        )
-        await self.send_raw_event(start_event)
+        logger.info(f"Processing result for tool '{tool_name}'")
+        started = time.perf_counter()
+        try:
+            tool_result = await self.processToolUse(tool_name, tool_use)
+        except asyncio.CancelledError:
+            logger.info(f"Tool '{tool_name}' ({tool_use_id}) cancelled")
+            raise
+        self.latency.observe("tool", time.perf_counter() - started)
+
+        try:
+            await self._send_tool_result(prompt_name, tool_use_id, tool_result)
+        except Exception as e:
+            logger.error(f"Failed to send result of tool '{tool_name}': {e}")
 
-        # 2. Send tool result event
+    async def _send_tool_result(self, prompt_name, tool_use_id, tool_result):
+        # The response sequence must be: start, input, end. The lock keeps
+        # the sequences of concurrent tools from interleaving.
+        tool_content_name = f"tool-content-{uuid.uuid4()}"
         result_str = (
             json.dumps(tool_result)
             if isinstance(tool_result, dict)
             else str(tool_result)
         )
-        result_event = S2sEvent.text_input_tool(
-            prompt_name, tool_content_name, result_str
-        )
-        await self.send_raw_event(result_event)
+        async with self._tool_result_lock:
+            # 1. Send tool start event
+            start_event = S2sEvent.content_start_tool(
+                prompt_name, tool_content_name, tool_use_id
+            )
+            await self.send_raw_event(start_event)
+
+            # 2. Send tool result event
+            result_event = S2sEvent.text_input_tool_bytes(
+                prompt_name, tool_content_name, result_str
+            )
+            await self.send_raw_bytes(result_event)
+
+            # 3. Send tool content end event
+            end_event = S2sEvent.content_end(prompt_name, tool_content_name)
+            await self.send_raw_event(end_event)
 
-        # 3. Send tool content end event
-        end_event = S2sEvent.content_end(prompt_name, tool_content_name)
-        await self.send_raw_event(end_event)
+    def cancel_tool_tasks(self, reason: str):
+        """Cancels every running tool call (barge-in, session end)."""
+        if self.tool_tasks:
+            logger.info(
+                f"Cancelling {len(self.tool_tasks)} tool call(s): {reason}"
+            )
+        for task in list(self.tool_tasks.values()):
+            task.cancel()
+        self.pending_tool_uses.clear()
 
     async def processToolUse(self, toolName, toolUseContent):
         """Return the tool result"""
         logger.debug(f"Tool Use Content: {toolUseContent}")
-        toolName = toolName.lower()
-        content = None
-        result = None
-        try:
-            if toolUseContent.get("content"):
-                # The content is a JSON *string*, so we must parse it first.
-                # content_json = json.loads(toolUseContent.get("content"))
-                # Now `content_json` is a Python dict.
-                # We might need the original string or the dict depending on the tool.
-                content = toolUseContent.get("content")
-
-            # Simple toolUse to get system time in UTC
-            if toolName == "getdatetool":
-                from datetime import datetime, timezone
-
-                result = datetime.now(timezone.utc).strftime(
-                    "%A, %Y-%m-%d %H-%M-%S"
-                )
-
-            # Bedrock Knowledge Bases (RAG)
-            if toolName == "getkbtool":
-                result = kb.retrieve_kb(content)
-
-            # MCP integration - location search
-            if toolName == "getlocationtool":
-                if self.mcp_loc_client:
-                    result = await self.mcp_loc_client.call_tool(content)
-
-            # Strands Agent integration - weather questions
-            if toolName == "externalagent":
-                if self.strands_agent:
-                    result = self.strands_agent.query(content)
-
-            # Bedrock Agents integration - Bookings
-            if toolName == "getbookingdetails":
-                try:
-                    # Pass the tool use content (JSON string) directly to the agent
-                    result = await inline_agent.invoke_agent(content)
-                    # Try to parse and format if needed
-                    try:
-                        booking_json = json.loads(result)
-                        if "bookings" in booking_json:
-                            result = await inline_agent.invoke_agent(
-                                f"Format this booking information for the user: {result}"
-                            )
-                    except Exception:
-                        pass  # Not JSON, just return as is
-
-                except json.JSONDecodeError as e:
-                    print(f"JSON decode error: {str(e)}")
-                    return {
-                        "result": f"Invalid JSON format for booking details: {str(e)}"
-                    }
-                except Exception as e:
-                    print(f"Error processing booking details: {str(e)}")
-                    return {
-                        "result": f"Error processing booking details: {str(e)}"
-                    }
-
-            if not result:
-                result = "no result found"
-
-            return {"result": result}
-        except Exception as ex:
-            print(ex)
-            return {
-                "result": "An error occurred while attempting to retrieve information related to the toolUse event."
-            }
+        # The content is a JSON *string*, handlers parse it if they need to
+        return await TOOLS.call(toolName, self, toolUseContent.get("content"))
 
     async def close(self):
         """Close the stream properly. Assumes tasks are cancelled by the owner."""
@@ -404,6 +572,12 @@ class S2sSessionManager:
 
         logger.info("Closing S2sSessionManager stream...")
         self.is_active = False
+        self.cancel_tool_tasks("session end")
+        logger.info(f"S2S queue stats: {self.queue_stats()}")
+        for queue, stats in self.queue_stats().items():
+            _queue_high_water(queue).observe(stats["high_water"])
+        logger.info(f"S2S barge-in stats: {self.barge_in_stats()}")
+        logger.info(f"S2S latency: {self.latency.summary()}")
 
         # The consumer now handles cancelling the tasks.
         # This method's only job is to close the underlying AWS stream.
@@ -0,0 +1,185 @@
+import asyncio
+import time
+
+from collections import deque
+from dataclasses import dataclass
+from threading import Lock
+from typing import Any, Deque, Dict, Optional, Set, Tuple
+
+from aws_sdk_bedrock_runtime.client import (
+    InvokeModelWithBidirectionalStreamOperationInput,
+)
+
+from .clients import get_bedrock_runtime_client
+
+from core.settings.base import logger
+from core.settings.base import (
+    S2S_STREAM_POOL_SIZE,
+    S2S_STREAM_POOL_MAX_IDLE_SECONDS,
+    S2S_STREAM_POOL_REFILL_CONCURRENCY,
+)
+
+
+@dataclass
+class PooledStream:
+    stream: Any
+    opened_at: float
+    # Set by the pool when the stream's output fails, i.e. Bedrock rejected
+    # or closed it
+    failed: bool = False
+
+    @property
+    def age(self) -> float:
+        return time.monotonic() - self.opened_at
+
+
+class StreamPool:
+    """
+    Keeps a few Nova Sonic bidirectional streams open so a new session can
+    claim one immediately instead of waiting for the stream handshake.
+
+    Idle streams older than `max_idle_seconds` are closed and replaced, since
+    Bedrock ends streams that do not receive events for too long. When the
+    pool is empty, `claim` falls back to opening a stream on the spot.
+    """
+
+    def __init__(
+        self,
+        region: str,
+        model_id: str,
+        size: int,
+        max_idle_seconds: int,
+        refill_concurrency: int,
+    ):
+        self.region = region
+        self.model_id = model_id
+        self.size = size
+        self.max_idle_seconds = max_idle_seconds
+        self._idle: Deque[PooledStream] = deque()
+        self._opening = 0
+        self._refill_semaphore = asyncio.Semaphore(refill_concurrency)
+        self._tasks: Set[asyncio.Task] = set()
+        self._reaper_task: Optional[asyncio.Task] = None
+        self.claimed_warm = 0
+        self.claimed_cold = 0
+
+    def start(self):
+        """Fills the pool and starts evicting stale streams."""
+        if self._reaper_task is None:
+            self._reaper_task = asyncio.create_task(self._reap())
+        self._refill()
+
+    async def _open_stream(self):
+        client = get_bedrock_runtime_client(self.region)
+        return await client.invoke_model_with_bidirectional_stream(
+            InvokeModelWithBidirectionalStreamOperationInput(
+                model_id=self.model_id
+            )
+        )
+
+    def _is_healthy(self, pooled: PooledStream) -> bool:
+        return not pooled.failed and pooled.age < self.max_idle_seconds
+
+    async def claim(self):
+        """Returns a ready stream, opening a new one if none is available."""
+        while self._idle:
+            pooled = self._idle.popleft()
+            if self._is_healthy(pooled):
+                self.claimed_warm += 1
+                self._refill()
+                return pooled.stream
+            self._discard(pooled)
+
+        self.claimed_cold += 1
+        self._refill()
+        return await self._open_stream()
+
+    def _spawn(self, coro):
+        task = asyncio.create_task(coro)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    def _refill(self):
+        missing = self.size - len(self._idle) - self._opening
+        for _ in range(missing):
+            self._opening += 1
+            self._spawn(self._add_stream())
+
+    async def _add_stream(self):
+        try:
+            async with self._refill_semaphore:
+                stream = await self._open_stream()
+            pooled = PooledStream(stream, time.monotonic())
+            self._spawn(self._watch(pooled))
+            self._idle.append(pooled)
+        except Exception as e:
+            logger.warning(f"Failed to pre-open Bedrock stream: {e}")
+        finally:
+            self._opening -= 1
+
+    async def _watch(self, pooled: PooledStream):
+        """Marks the stream failed if its output cannot be awaited."""
+        try:
+            # The output is a future: the session awaits it again later
+            await pooled.stream.await_output()
+        except Exception as e:
+            pooled.failed = True
+            logger.info(f"Pooled Bedrock stream failed: {e}")
+
+    def _discard(self, pooled: PooledStream):
+        self._spawn(self._close_stream(pooled.stream))
+
+    async def _close_stream(self, stream):
+        try:
+            await stream.input_stream.close()
+        except Exception as e:
+            logger.debug(f"Ignoring error while closing pooled stream: {e}")
+
+    async def _reap(self):
+        while True:
+            await asyncio.sleep(max(self.max_idle_seconds / 4, 1))
+            healthy = deque()
+            while self._idle:
+                pooled = self._idle.popleft()
+                if self._is_healthy(pooled):
+                    healthy.append(pooled)
+                else:
+                    self._discard(pooled)
+            self._idle = healthy
+            self._refill()
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "idle": len(self._idle),
+            "opening": self._opening,
+            "claimed_warm": self.claimed_warm,
+            "claimed_cold": self.claimed_cold,
+        }
+
+
+# --- Process-wide pools ---
+_pools: Dict[Tuple[str, str], StreamPool] = {}
+_pools_lock = Lock()
+
+
+def get_stream_pool(region: str, model_id: str) -> Optional[StreamPool]:
+    """
+    Returns the started stream pool of this process for the region and
+    model, or None when pooling is disabled (S2S_STREAM_POOL_SIZE=0).
+    Must be called from the event loop.
+    """
+    if S2S_STREAM_POOL_SIZE <= 0:
+        return None
+
+    with _pools_lock:
+        pool = _pools.get((region, model_id))
+        if pool is None:
+            pool = _pools[(region, model_id)] = StreamPool(
+                region=region,
+                model_id=model_id,
+                size=S2S_STREAM_POOL_SIZE,
+                max_idle_seconds=S2S_STREAM_POOL_MAX_IDLE_SECONDS,
+                refill_concurrency=S2S_STREAM_POOL_REFILL_CONCURRENCY,
+            )
+            pool.start()
+        return pool
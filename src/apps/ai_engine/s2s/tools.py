@@ -0,0 +1,349 @@
+import asyncio
+import json
+import time
+
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from .integration import inline_agent, kb
+from .integration.booking_formatter import (
+    format_bookings,
+    parse_booking_result,
+)
+from .integration.retrieval_cache import RetrievalCache
+from .metrics import REGISTRY, Histogram
+
+from core.settings.base import logger
+from core.settings.base import S2S_TOOL_TIMEOUT_SECONDS, S2S_TOOL_TIMEOUTS
+from core.settings.base import (
+    INLINE_AGENT_POOL_SIZE,
+    KB_MAX_CONCURRENCY,
+    KB_TIMEOUT_SECONDS,
+)
+
+# Handlers get the session manager (for its prompt name and integration
+# clients) and the raw tool input, a JSON string or None
+ToolHandler = Callable[[Any, Optional[str]], Awaitable[Any]]
+
+NO_RESULT = "no result found"
+TOOL_ERROR = (
+    "An error occurred while attempting to retrieve information related "
+    "to the toolUse event."
+)
+
+
+def _canonical_input(content: Any) -> str:
+    """Tool input as canonical JSON, so equal arguments share a cache key."""
+    try:
+        return json.dumps(json.loads(content), sort_keys=True)
+    except (TypeError, ValueError):
+        return str(content)
+
+
+def _input_schema(properties: Dict[str, Any], required: List[str]) -> str:
+    return json.dumps(
+        {
+            "$schema": "http://json-schema.org/draft-07/schema#",
+            "type": "object",
+            "properties": properties,
+            "required": required,
+        }
+    )
+
+
+@dataclass
+class ToolSpec:
+    """
+    A tool the speech model can call: its toolSpec for promptStart, its
+    handler and its budget. `aliases` are other names the model may use
+    for it (older prompts, the BYOLLM tool set).
+    """
+
+    name: str
+    description: str
+    input_schema: str
+    handler: ToolHandler
+    timeout: float = S2S_TOOL_TIMEOUT_SECONDS
+    max_concurrency: Optional[int] = None
+    cache_ttl_seconds: int = 0
+    aliases: Tuple[str, ...] = ()
+    advertised: bool = True
+    latency: Histogram = field(init=False)
+    calls: int = 0
+    timeouts: int = 0
+    errors: int = 0
+
+    def __post_init__(self):
+        # S2S_TOOL_TIMEOUTS overrides the declared timeout per deployment
+        self.timeout = S2S_TOOL_TIMEOUTS.get(self.name.lower(), self.timeout)
+        self.latency = REGISTRY.histogram(
+            "s2s_tool_seconds", "Tool call latency.", tool=self.name
+        )
+        self._semaphore = (
+            asyncio.Semaphore(self.max_concurrency)
+            if self.max_concurrency
+            else None
+        )
+        self._cache = (
+            RetrievalCache(
+                namespace=f"tool:{self.name}",
+                ttl_seconds=self.cache_ttl_seconds,
+                # Arguments are JSON: signs and decimals are significant
+                normalize=_canonical_input,
+            )
+            if self.cache_ttl_seconds
+            else None
+        )
+
+    def tool_spec(self) -> Dict[str, Any]:
+        return {
+            "toolSpec": {
+                "name": self.name,
+                "description": self.description,
+                "inputSchema": {"json": self.input_schema},
+            }
+        }
+
+    async def _call(self, session, content: Optional[str]) -> Any:
+        if self._cache is not None:
+            cached = await self._cache.get(content or "")
+            if cached is not None:
+                return cached
+
+        if self._semaphore is not None:
+            async with self._semaphore:
+                result = await self.handler(session, content)
+        else:
+            result = await self.handler(session, content)
+
+        if self._cache is not None and result:
+            await self._cache.set(content or "", result)
+        return result
+
+    async def call(self, session, content: Optional[str]) -> Any:
+        """
+        Runs the handler within the timeout, waiting for a concurrency slot
+        included. Returns the tool result, or a message the model can read
+        out when the tool times out or fails.
+        """
+        self.calls += 1
+        started = time.perf_counter()
+        try:
+            return await asyncio.wait_for(
+                self._call(session, content), self.timeout
+            )
+        except asyncio.TimeoutError:
+            self.timeouts += 1
+            logger.warning(
+                f"Tool '{self.name}' timed out after {self.timeout}s"
+            )
+            return f"The {self.name} tool did not answer in time."
+        except Exception as e:
+            self.errors += 1
+            logger.error(f"Tool '{self.name}' failed: {e}")
+            return TOOL_ERROR
+        finally:
+            self.latency.observe(time.perf_counter() - started)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "calls": self.calls,
+            "timeouts": self.timeouts,
+            "errors": self.errors,
+            "latency_seconds": self.latency.snapshot(),
+            **({"cache": self._cache.stats()} if self._cache else {}),
+        }
+
+
+class ToolRegistry:
+    """The tools of the speech to speech sessions, by case-folded name."""
+
+    def __init__(self):
+        self._tools: Dict[str, ToolSpec] = {}
+        self._specs: List[ToolSpec] = []
+        self._tool_config: Optional[Dict[str, Any]] = None
+
+    def register(self, spec: ToolSpec) -> ToolSpec:
+        for name in (spec.name, *spec.aliases):
+            self._tools[name.lower()] = spec
+        self._specs.append(spec)
+        self._tool_config = None
+        return spec
+
+    def tool(self, name: str, description: str, input_schema: str, **options):
+        """Decorator registering an async handler as a tool."""
+
+        def decorator(handler: ToolHandler) -> ToolHandler:
+            self.register(
+                ToolSpec(name, description, input_schema, handler, **options)
+            )
+            return handler
+
+        return decorator
+
+    def get(self, name: str) -> Optional[ToolSpec]:
+        return self._tools.get(name.lower())
+
+    def tool_config(self) -> Dict[str, Any]:
+        """The toolConfiguration of promptStart, built once."""
+        if self._tool_config is None:
+            self._tool_config = {
+                "tools": [
+                    spec.tool_spec() for spec in self._specs if spec.advertised
+                ]
+            }
+        return self._tool_config
+
+    async def call(
+        self, name: str, session, content: Optional[str]
+    ) -> Dict[str, Any]:
+        """Runs a tool call and wraps its result for the toolResult event."""
+        spec = self.get(name)
+        if spec is None:
+            logger.warning(f"Unknown tool '{name}'")
+            return {"result": NO_RESULT}
+        result = await spec.call(session, content)
+        return {"result": result or NO_RESULT}
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        return {spec.name: spec.stats() for spec in self._specs}
+
+
+TOOLS = ToolRegistry()
+
+
+@TOOLS.tool(
+    "getDateTool",
+    "get information about the current day",
+    _input_schema({}, []),
+    timeout=1.0,
+)
+async def get_date(session, content):
+    return datetime.now(timezone.utc).strftime("%A, %Y-%m-%d %H-%M-%S")
+
+
+@TOOLS.tool(
+    "getKbTool",
+    "Runs query against a knowledge base to retrieve information.",
+    _input_schema(
+        {"query": {"type": "string", "description": "the query to search"}},
+        ["query"],
+    ),
+    timeout=KB_TIMEOUT_SECONDS,
+    max_concurrency=KB_MAX_CONCURRENCY,
+    aliases=("lookup",),
+)
+async def get_kb(session, content):
+    # retrieve_kb has its own two-tier cache
+    return await kb.retrieve_kb(content)
+
+
+@TOOLS.tool(
+    "locationMcpTool",
+    "Access location services like finding places, getting place details, "
+    "and geocoding. Use with tool names: search_places, get_place, "
+    "search_nearby, reverse_geocode",
+    _input_schema(
+        {
+            "argName1": {
+                "type": "string",
+                "description": "JSON string containing 'tool' (one of: "
+                "search_places, get_place, search_nearby, reverse_geocode) "
+                "and 'params' (the parameters for the tool)",
+            }
+        },
+        ["argName1"],
+    ),
+    timeout=5.0,
+    cache_ttl_seconds=300,
+    aliases=("getLocationTool",),
+)
+async def get_location(session, content):
+    if session.mcp_loc_client:
+        return await session.mcp_loc_client.call_tool(content)
+    return None
+
+
+@TOOLS.tool(
+    "externalAgent",
+    "Asks an external agent, e.g. about the weather.",
+    _input_schema(
+        {"query": {"type": "string", "description": "the question"}},
+        ["query"],
+    ),
+    advertised=False,
+)
+async def ask_external_agent(session, content):
+    if session.strands_agent:
+        return await asyncio.to_thread(session.strands_agent.query, content)
+    return None
+
+
+@TOOLS.tool(
+    "getBookingDetails",
+    "Get booking details by booking ID or manage bookings",
+    _input_schema(
+        {
+            "operation": {
+                "type": "string",
+                "description": "The operation to perform (get_booking, "
+                "create_booking, update_booking, delete_booking, "
+                "list_bookings)",
+                "enum": [
+                    "get_booking",
+                    "create_booking",
+                    "update_booking",
+                    "delete_booking",
+                    "list_bookings",
+                ],
+            },
+            "booking_id": {
+                "type": "string",
+                "description": "The ID of the booking to retrieve, update, "
+                "or delete",
+            },
+            "booking_details": {
+                "type": "object",
+                "description": "The booking details to create",
+            },
+            "update_data": {
+                "type": "object",
+                "description": "The data to update for a booking",
+            },
+            "limit": {
+                "type": "integer",
+                "description": "The maximum number of bookings to return "
+                "when listing",
+            },
+        },
+        ["operation"],
+    ),
+    timeout=15.0,
+    max_concurrency=INLINE_AGENT_POOL_SIZE,
+)
+async def get_booking_details(session, content):
+    try:
+        # Pass the tool use content (JSON string) directly to the agent,
+        # in the agent session of this interview
+        result = await inline_agent.invoke_agent(
+            content, session_id=session.prompt_name
+        )
+        # Structured results are formatted locally; the agent is only
+        # asked when their shape is not understood
+        booking_json = parse_booking_result(result)
+        if booking_json and (
+            "bookings" in booking_json or "booking" in booking_json
+        ):
+            formatted = format_bookings(booking_json)
+            if formatted is None:
+                formatted = await inline_agent.invoke_agent(
+                    "Format this booking information for the user: "
+                    f"{result}",
+                    session_id=session.prompt_name,
+                )
+            result = formatted
+        return result
+    except Exception as e:
+        logger.error(f"Error processing booking details: {e}")
+        return f"Error processing booking details: {e}"
@@ -0,0 +1,77 @@
+from datetime import timedelta
+from typing import Any, Dict, Optional
+
+from asgiref.sync import async_to_sync
+from channels.layers import get_channel_layer
+from django.conf import settings
+from django.db.models import Q
+from django.utils import timezone
+from pydantic import BaseModel
+
+from apps.agents.services.agent_factory import get_feedback_agent
+
+from .models import InterviewSession
+
+Status = InterviewSession.SessionStatus
+
+
+class AIFeedback(BaseModel):
+    strengths: list[str]
+    areas_of_improvement: list[str]
+    general_feedback: str
+    final_rating: int
+
+
+def feedback_group(session_id: int) -> str:
+    """Channel layer group of the sockets waiting for a session feedback."""
+    return f"session-feedback-{session_id}"
+
+
+def claim_feedback(session_id: int) -> Optional[InterviewSession]:
+    """
+    Moves a session from FEEDBACK_PENDING to GENERATING_FEEDBACK and returns
+    it, or None if another run holds it. A claim older than the task time
+    limit belongs to a dead worker and can be taken over.
+    """
+    stale = timezone.now() - timedelta(seconds=settings.CELERY_TASK_TIME_LIMIT)
+    claimed = InterviewSession.objects.filter(
+        Q(status=Status.FEEDBACK_PENDING)
+        | Q(status=Status.GENERATING_FEEDBACK, updated_at__lt=stale),
+        id=session_id,
+    ).update(status=Status.GENERATING_FEEDBACK, updated_at=timezone.now())
+    if not claimed:
+        return None
+    return InterviewSession.objects.get(id=session_id)
+
+
+def generate_feedback(session: InterviewSession) -> Dict[str, Any]:
+    agent = get_feedback_agent()
+    ai_feedback: AIFeedback = agent.structured_output(
+        output_model=AIFeedback,
+        prompt=(
+            f"Start a rating for the profile_id={session.job_profile_id} and "
+            f"the transcription is: {session.full_transcript}"
+        ),
+    )
+    return ai_feedback.model_dump()
+
+
+def set_status(session: InterviewSession, status: str):
+    session.status = status
+    session.save(update_fields=["status", "updated_at"])
+
+
+def notify_feedback(session: InterviewSession):
+    """Pushes the feedback outcome to the sockets waiting for it."""
+    channel_layer = get_channel_layer()
+    if channel_layer is None:
+        return
+    async_to_sync(channel_layer.group_send)(
+        feedback_group(session.id),
+        {
+            "type": "session.feedback",
+            "session_id": session.id,
+            "status": session.status,
+            "feedback": session.session_feedback,
+        },
+    )
@@ -0,0 +1,22 @@
+# Generated by Django 5.1 on 2026-10-17 15:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("coaching", "0002_alter_interviewsession_full_transcript_and_more"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="interviewsession",
+            name="latency_summary",
+            field=models.JSONField(
+                blank=True,
+                default=dict,
+                help_text="Per-turn voice latencies of the session (counts and percentiles in ms).",
+            ),
+        ),
+    ]
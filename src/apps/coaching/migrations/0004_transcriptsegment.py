@@ -0,0 +1,65 @@
+# Generated by Django 5.1 on 2026-10-17 16:02
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("coaching", "0003_interviewsession_latency_summary"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="TranscriptSegment",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "seq",
+                    models.PositiveIntegerField(
+                        help_text="Order of the segment inside its session."
+                    ),
+                ),
+                (
+                    "role",
+                    models.CharField(
+                        help_text="Who spoke: 'user' or 'coach'.",
+                        max_length=20,
+                    ),
+                ),
+                ("content", models.TextField(help_text="What was said.")),
+                (
+                    "timestamp",
+                    models.FloatField(
+                        help_text="Seconds since the start of the session."
+                    ),
+                ),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                (
+                    "session",
+                    models.ForeignKey(
+                        help_text="The interview session this segment belongs to.",
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="transcript_segments",
+                        to="coaching.interviewsession",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Transcript Segment",
+                "verbose_name_plural": "Transcript Segments",
+                "db_table": "interview_transcript_segment",
+                "ordering": ["seq"],
+                "unique_together": {("session", "seq")},
+            },
+        ),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 5.1 on 2026-10-17 16:45
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("coaching", "0004_transcriptsegment"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="interviewsession",
+            name="status",
+            field=models.CharField(
+                choices=[
+                    ("CREATED", "Created"),
+                    ("IN_PROGRESS", "In Progress"),
+                    ("FEEDBACK_PENDING", "Feedback Pending"),
+                    ("GENERATING_FEEDBACK", "Generating Feedback"),
+                    ("FEEDBACK_FAILED", "Feedback Failed"),
+                    ("COMPLETED", "Completed"),
+                    ("INCOMPLETE", "Incomplete"),
+                    ("CANCELLED", "Cancelled"),
+                    ("ERROR", "Error"),
+                ],
+                default="CREATED",
+                max_length=20,
+            ),
+        ),
+    ]
@@ -169,6 +169,10 @@ class InterviewSession(BaseModel):
     class SessionStatus(models.TextChoices):
         CREATED = "CREATED", "Created"
         IN_PROGRESS = "IN_PROGRESS", "In Progress"
+        # The interview ended, its feedback is queued or being generated
+        FEEDBACK_PENDING = "FEEDBACK_PENDING", "Feedback Pending"
+        GENERATING_FEEDBACK = "GENERATING_FEEDBACK", "Generating Feedback"
+        FEEDBACK_FAILED = "FEEDBACK_FAILED", "Feedback Failed"
         COMPLETED = "COMPLETED", "Completed"
         INCOMPLETE = "INCOMPLETE", "Incomplete"
         CANCELLED = "CANCELLED", "Cancelled"
@@ -230,6 +234,12 @@ class InterviewSession(BaseModel):
         help_text="The cost incurred for this session based on model usage.",
     )
 
+    latency_summary = models.JSONField(
+        default=dict,
+        blank=True,
+        help_text="Per-turn voice latencies of the session (counts and percentiles in ms).",
+    )
+
     class Meta(BaseModel.Meta):
         db_table = "interview_session"
         verbose_name = "Interview Session"
@@ -237,3 +247,39 @@ class InterviewSession(BaseModel):
 
     def __str__(self):
         return f"Session for {self.job_profile.target_role} on {self.created_at.strftime('%Y-%m-%d')}"
+
+
+class TranscriptSegment(models.Model):
+    """
+    One utterance of an interview session, written while the session runs
+    so a crash loses at most the last unflushed batch. Segments are only
+    ever appended; the full transcript is assembled from them by `seq`.
+    """
+
+    session = models.ForeignKey(
+        InterviewSession,
+        on_delete=models.CASCADE,
+        related_name="transcript_segments",
+        help_text="The interview session this segment belongs to.",
+    )
+    seq = models.PositiveIntegerField(
+        help_text="Order of the segment inside its session."
+    )
+    role = models.CharField(
+        max_length=20, help_text="Who spoke: 'user' or 'coach'."
+    )
+    content = models.TextField(help_text="What was said.")
+    timestamp = models.FloatField(
+        help_text="Seconds since the start of the session."
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        db_table = "interview_transcript_segment"
+        verbose_name = "Transcript Segment"
+        verbose_name_plural = "Transcript Segments"
+        ordering = ["seq"]
+        unique_together = ("session", "seq")
+
+    def __str__(self):
+        return f"{self.session_id} #{self.seq} ({self.role})"
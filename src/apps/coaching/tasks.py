@@ -0,0 +1,58 @@
+from celery import shared_task
+
+from core.settings.base import logger
+from core.settings.base import S2S_FAKE_BEDROCK
+
+from .feedback import (
+    Status,
+    claim_feedback,
+    generate_feedback,
+    notify_feedback,
+    set_status,
+)
+
+FEEDBACK_MAX_RETRIES = 3
+
+
+@shared_task(bind=True, acks_late=True, max_retries=FEEDBACK_MAX_RETRIES)
+def generate_session_feedback(self, session_id: int):
+    """
+    Generates the AI feedback of a finished interview. The session status
+    is the idempotency guard: only the run that claims FEEDBACK_PENDING
+    does the work, so duplicate deliveries are no-ops.
+    """
+    session = claim_feedback(session_id)
+    if session is None:
+        logger.info(f"Feedback of session {session_id} already handled")
+        return
+
+    try:
+        session.session_feedback = generate_feedback(session)
+    except Exception as e:
+        if self.request.retries >= FEEDBACK_MAX_RETRIES:
+            logger.error(f"Feedback of session {session_id} failed: {e}")
+            set_status(session, Status.FEEDBACK_FAILED)
+            notify_feedback(session)
+            raise
+        logger.warning(f"Feedback of session {session_id} failed, retrying")
+        set_status(session, Status.FEEDBACK_PENDING)
+        raise self.retry(exc=e, countdown=10 * 2**self.request.retries)
+
+    session.status = Status.COMPLETED
+    session.save(update_fields=["session_feedback", "status", "updated_at"])
+    notify_feedback(session)
+
+
+def enqueue_session_feedback(session_id: int):
+    """
+    Queues the feedback job. Queueing twice is harmless: the task's
+    claim_feedback lets only one run generate the feedback. The task id
+    just makes the job easy to find.
+    """
+    if S2S_FAKE_BEDROCK:
+        # A scripted conversation (load tests) has nothing to give feedback on
+        logger.info(f"Simulated session {session_id}, feedback skipped")
+        return
+    generate_session_feedback.apply_async(
+        (session_id,), task_id=f"session-feedback-{session_id}"
+    )
@@ -0,0 +1,142 @@
+import asyncio
+
+from typing import Any, Dict, List, Optional
+
+from django.db import InterfaceError, OperationalError
+from django.db.models import Max
+
+from core.settings.base import logger
+from core.settings.base import (
+    TRANSCRIPT_FLUSH_SEGMENTS,
+    TRANSCRIPT_FLUSH_SECONDS,
+)
+
+from .models import InterviewSession, TranscriptSegment
+
+
+class TranscriptCheckpointer:
+    """
+    Persists the transcript of a live session as it is spoken. Segments
+    are buffered and written in one insert every `flush_segments` segments
+    or `flush_seconds` seconds, by a background task so the response loop
+    never waits on the database.
+
+    Segments are identified by (session, seq), so writing one again, e.g.
+    by a resumed connection while the previous one flushes it, is a no-op.
+    A write that fails on the connection is kept and retried with the next
+    batch; any other failure drops the batch.
+    """
+
+    def __init__(
+        self,
+        session: InterviewSession,
+        flush_segments: int = TRANSCRIPT_FLUSH_SEGMENTS,
+        flush_seconds: float = TRANSCRIPT_FLUSH_SECONDS,
+    ):
+        self.session = session
+        self.flush_segments = flush_segments
+        self.flush_seconds = flush_seconds
+        self.next_seq = 0
+        self._pending: List[TranscriptSegment] = []
+        self._flush_now = asyncio.Event()
+        self._lock = asyncio.Lock()
+        self._task: Optional[asyncio.Task] = None
+
+    async def start(self):
+        # Continue after the segments of an earlier connection
+        last = await TranscriptSegment.objects.filter(
+            session=self.session
+        ).aaggregate(seq=Max("seq"))
+        self.next_seq = 0 if last["seq"] is None else last["seq"] + 1
+        self._task = asyncio.create_task(self._flush_periodically())
+
+    def append(self, role: str, content: str, timestamp: float) -> int:
+        """Buffers a segment and returns its sequence number."""
+        seq = self.next_seq
+        self._pending.append(
+            TranscriptSegment(
+                session=self.session,
+                seq=seq,
+                role=role,
+                content=content,
+                timestamp=timestamp,
+            )
+        )
+        self.next_seq += 1
+        if len(self._pending) >= self.flush_segments:
+            self._flush_now.set()
+        return seq
+
+    async def flush(self):
+        async with self._lock:
+            if not self._pending:
+                return
+            batch, self._pending = self._pending, []
+            try:
+                await TranscriptSegment.objects.abulk_create(
+                    batch, ignore_conflicts=True
+                )
+            except (InterfaceError, OperationalError) as e:
+                logger.error(f"Failed to write transcript segments: {e}")
+                self._pending[:0] = batch
+            except Exception as e:
+                logger.error(
+                    f"Dropped {len(batch)} transcript segments of session "
+                    f"{self.session.id}: {e}"
+                )
+
+    async def _flush_periodically(self):
+        while True:
+            try:
+                await asyncio.wait_for(
+                    self._flush_now.wait(), self.flush_seconds
+                )
+            except asyncio.TimeoutError:
+                pass
+            self._flush_now.clear()
+            await self.flush()
+
+    async def close(self):
+        """Stops the background flushes and writes what is left."""
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        await self.flush()
+
+
+async def assemble_transcript(
+    session: InterviewSession,
+) -> List[Dict[str, Any]]:
+    """The full transcript of a session, in the full_transcript format."""
+    return [
+        {
+            "role": segment.role,
+            "content": segment.content,
+            "timestamp": segment.timestamp,
+        }
+        async for segment in TranscriptSegment.objects.filter(
+            session=session
+        ).order_by("seq")
+    ]
+
+
+async def complete_session(session: InterviewSession) -> bool:
+    """
+    Stores the assembled transcript on an interview that has ended and
+    moves it to FEEDBACK_PENDING, or to INCOMPLETE when nothing was said.
+    Returns whether its feedback should be generated.
+    """
+    transcription = await assemble_transcript(session)
+    if not transcription:
+        session.status = InterviewSession.SessionStatus.INCOMPLETE
+        await session.asave()
+        return False
+
+    logger.debug(f"TRANSCRIPTION: {transcription}")
+    session.full_transcript = transcription
+    session.status = InterviewSession.SessionStatus.FEEDBACK_PENDING
+    await session.asave()
+    return True
@@ -0,0 +1,360 @@
+import asyncio
+import bisect
+import itertools
+import time
+import uuid
+
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from apps.ai_engine.s2s.metrics import REGISTRY
+
+from core.settings.base import logger
+from core.settings.base import REDIS_URL
+from core.settings.base import (
+    S2S_ADMISSION_DEFAULT_PRIORITY,
+    S2S_ADMISSION_LEASE_SECONDS,
+    S2S_ADMISSION_MAX_WAIT_SECONDS,
+    S2S_ADMISSION_MAX_WAITING,
+    S2S_ADMISSION_PRIORITIES,
+    S2S_ADMISSION_SESSION_SECONDS,
+    S2S_ADMISSION_UPDATE_SECONDS,
+    S2S_MAX_SESSIONS_CLUSTER,
+    S2S_MAX_SESSIONS_PER_PROCESS,
+)
+
+# Called while waiting with the queue position (0 is next) and the
+# estimated wait in seconds
+OnUpdate = Callable[[int, float], Awaitable[None]]
+
+_LEASES_KEY = "s2s:admission:leases"
+_QUEUE_KEY = "s2s:admission:queue"
+_WAITING_KEY = "s2s:admission:waiting"
+
+# Takes a cluster slot for a ticket if its rank in the waiting queue fits
+# in the free slots, after dropping expired leases and abandoned tickets.
+# Returns -1 when admitted, else the rank.
+_ACQUIRE_SCRIPT = """
+local now = tonumber(ARGV[3])
+redis.call('ZREMRANGEBYSCORE', KEYS[1], '-inf', now)
+local stale = redis.call('ZRANGEBYSCORE', KEYS[3], '-inf', now)
+if #stale > 0 then
+    redis.call('ZREM', KEYS[2], unpack(stale))
+    redis.call('ZREM', KEYS[3], unpack(stale))
+end
+redis.call('ZADD', KEYS[2], 'NX', ARGV[2], ARGV[1])
+redis.call('ZADD', KEYS[3], ARGV[5], ARGV[1])
+local rank = redis.call('ZRANK', KEYS[2], ARGV[1])
+local free = tonumber(ARGV[6]) - redis.call('ZCARD', KEYS[1])
+if rank < free then
+    redis.call('ZREM', KEYS[2], ARGV[1])
+    redis.call('ZREM', KEYS[3], ARGV[1])
+    redis.call('ZADD', KEYS[1], ARGV[4], ARGV[1])
+    return -1
+end
+return rank
+"""
+
+
+class AdmissionRejected(Exception):
+    """The session was not admitted; the client may retry after a while."""
+
+    def __init__(self, reason: str, retry_after: float):
+        super().__init__(reason)
+        self.reason = reason
+        self.retry_after = max(1, round(retry_after))
+
+
+@dataclass(order=True)
+class _Waiter:
+    priority: int
+    seq: int
+    admitted: asyncio.Future = field(compare=False)
+
+
+@dataclass
+class Lease:
+    """A live session slot, held until `release`."""
+
+    controller: "AdmissionController"
+    ticket: str
+    priority_class: str
+    admitted_at: float
+    waited_seconds: float
+    cluster: bool = False
+    released: bool = False
+
+    async def release(self):
+        if not self.released:
+            self.released = True
+            await self.controller.release(self)
+
+
+class AdmissionController:
+    """
+    Limits the live sessions, and so the Bedrock streams, of this process
+    and of the whole cluster.
+
+    A connection past the process limit waits in a waiting room ordered by
+    priority class, then arrival; freed slots are handed to its head, so
+    newcomers cannot overtake. It then takes a cluster slot from Redis the
+    same way: a sorted set of waiting tickets, admitted atomically while
+    their rank fits in the free slots. Cluster slots are leases renewed
+    by this process, so the slots of a dead node expire.
+
+    Waiters get their position and estimated wait every `update_seconds`.
+    A full waiting room or a wait past `max_wait_seconds` rejects with a
+    retry-after. Redis errors admit on the process limit alone.
+    """
+
+    def __init__(
+        self,
+        max_sessions: int = S2S_MAX_SESSIONS_PER_PROCESS,
+        cluster_max_sessions: int = S2S_MAX_SESSIONS_CLUSTER,
+        max_waiting: int = S2S_ADMISSION_MAX_WAITING,
+        max_wait_seconds: float = S2S_ADMISSION_MAX_WAIT_SECONDS,
+        priorities: Optional[Dict[str, int]] = None,
+        default_priority: str = S2S_ADMISSION_DEFAULT_PRIORITY,
+        session_seconds: float = S2S_ADMISSION_SESSION_SECONDS,
+        lease_seconds: float = S2S_ADMISSION_LEASE_SECONDS,
+        update_seconds: float = S2S_ADMISSION_UPDATE_SECONDS,
+        redis_url: Optional[str] = REDIS_URL,
+    ):
+        self.max_sessions = max_sessions
+        self.cluster_max_sessions = cluster_max_sessions
+        self.max_waiting = max_waiting
+        self.max_wait_seconds = max_wait_seconds
+        self.priorities = (
+            S2S_ADMISSION_PRIORITIES if priorities is None else priorities
+        )
+        self.default_priority = default_priority
+        self.lease_seconds = lease_seconds
+        self.update_seconds = update_seconds
+        # Moving average of the session length, for the wait estimates
+        self.mean_session_seconds = float(session_seconds)
+
+        self.active = 0
+        self._waiting: List[_Waiter] = []
+        self._seq = itertools.count()
+        self._cluster_leases: Dict[str, Lease] = {}
+        self._renew_task: Optional[asyncio.Task] = None
+        self.admitted = 0
+        self.rejected = 0
+
+        self._redis = None
+        self._acquire = None
+        if redis_url and cluster_max_sessions:
+            import redis.asyncio as redis
+
+            self._redis = redis.from_url(redis_url)
+            self._acquire = self._redis.register_script(_ACQUIRE_SCRIPT)
+
+    def priority_class(self, requested: Optional[str]) -> str:
+        if requested in self.priorities:
+            return requested
+        return self.default_priority
+
+    def estimate_wait(self, position: int, slots: int) -> float:
+        """Seconds until `position` is admitted, if sessions end evenly."""
+        return (position + 1) * self.mean_session_seconds / max(slots, 1)
+
+    async def admit(
+        self, requested_class: Optional[str], on_update: OnUpdate
+    ) -> Lease:
+        """
+        Waits for a process and a cluster slot. Raises AdmissionRejected,
+        or CancelledError if the client leaves first.
+        """
+        priority_class = self.priority_class(requested_class)
+        priority = self.priorities.get(priority_class, 0)
+        started = time.monotonic()
+        deadline = started + self.max_wait_seconds
+
+        await self._admit_local(priority, deadline, on_update)
+        lease = Lease(self, uuid.uuid4().hex, priority_class, 0.0, 0.0)
+        try:
+            if self._acquire is not None:
+                lease.cluster = await self._admit_cluster(
+                    lease.ticket, priority, deadline, on_update
+                )
+        except BaseException:
+            # Rejected or cancelled while waiting for the cluster
+            self._release_local()
+            raise
+
+        lease.admitted_at = time.monotonic()
+        lease.waited_seconds = lease.admitted_at - started
+        if lease.cluster:
+            self._cluster_leases[lease.ticket] = lease
+            self._start_renewing()
+        self.admitted += 1
+        REGISTRY.histogram(
+            "s2s_admission_wait_seconds",
+            "Wait for a live session slot.",
+            priority=priority_class,
+        ).observe(lease.waited_seconds)
+        return lease
+
+    def _reject(self, reason: str, retry_after: float):
+        self.rejected += 1
+        logger.warning(f"Live session rejected: {reason}")
+        raise AdmissionRejected(reason, retry_after)
+
+    async def _admit_local(
+        self, priority: int, deadline: float, on_update: OnUpdate
+    ):
+        if not self.max_sessions or (
+            self.active < self.max_sessions and not self._waiting
+        ):
+            self.active += 1
+            return
+
+        if len(self._waiting) >= self.max_waiting:
+            self._reject(
+                "waiting room full",
+                self.estimate_wait(len(self._waiting), self.max_sessions),
+            )
+
+        waiter = _Waiter(
+            priority,
+            next(self._seq),
+            asyncio.get_running_loop().create_future(),
+        )
+        bisect.insort(self._waiting, waiter)
+        try:
+            while not waiter.admitted.done():
+                position = self._waiting.index(waiter)
+                await on_update(
+                    position, self.estimate_wait(position, self.max_sessions)
+                )
+                if waiter.admitted.done():
+                    # A slot was handed over while the update was sent
+                    break
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self._waiting.remove(waiter)
+                    self._reject(
+                        "wait timeout",
+                        self.estimate_wait(position, self.max_sessions),
+                    )
+                try:
+                    # shield: a timeout must not cancel the handed-over slot
+                    await asyncio.wait_for(
+                        asyncio.shield(waiter.admitted),
+                        min(self.update_seconds, remaining),
+                    )
+                except asyncio.TimeoutError:
+                    pass
+        except asyncio.CancelledError:
+            if waiter.admitted.done():
+                # The slot was handed over as the client left
+                self._release_local()
+            else:
+                self._waiting.remove(waiter)
+            raise
+
+    async def _admit_cluster(
+        self, ticket: str, priority: int, deadline: float, on_update: OnUpdate
+    ) -> bool:
+        """Returns whether a cluster lease was taken."""
+        # Priority first, then arrival
+        score = priority * 10**13 + int(time.time() * 1000)
+        try:
+            while True:
+                now = time.time()
+                rank = await self._acquire(
+                    keys=[_LEASES_KEY, _QUEUE_KEY, _WAITING_KEY],
+                    args=[
+                        ticket,
+                        score,
+                        now,
+                        now + self.lease_seconds,
+                        now + self.lease_seconds,
+                        self.cluster_max_sessions,
+                    ],
+                )
+                if rank < 0:
+                    return True
+                estimate = self.estimate_wait(rank, self.cluster_max_sessions)
+                await on_update(rank, estimate)
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    await self._leave_cluster_queue(ticket)
+                    self._reject("wait timeout", estimate)
+                await asyncio.sleep(min(self.update_seconds, remaining))
+        except AdmissionRejected:
+            raise
+        except asyncio.CancelledError:
+            await asyncio.shield(self._leave_cluster_queue(ticket))
+            raise
+        except Exception as e:
+            logger.warning(f"Cluster admission failed, admitting: {e}")
+            return False
+
+    async def _leave_cluster_queue(self, ticket: str):
+        try:
+            pipe = self._redis.pipeline()
+            pipe.zrem(_QUEUE_KEY, ticket)
+            pipe.zrem(_WAITING_KEY, ticket)
+            await pipe.execute()
+        except Exception as e:
+            # Abandoned tickets are dropped once their heartbeat expires
+            logger.warning(f"Failed to leave the admission queue: {e}")
+
+    def _release_local(self):
+        if self._waiting:
+            # Hand the slot over to the head of the waiting room
+            self._waiting.pop(0).admitted.set_result(True)
+        elif self.active:
+            self.active -= 1
+
+    async def release(self, lease: Lease):
+        duration = time.monotonic() - lease.admitted_at
+        self.mean_session_seconds = (
+            0.9 * self.mean_session_seconds + 0.1 * duration
+        )
+        self._release_local()
+        if self._cluster_leases.pop(lease.ticket, None) is not None:
+            try:
+                await self._redis.zrem(_LEASES_KEY, lease.ticket)
+            except Exception as e:
+                logger.warning(f"Failed to release the session lease: {e}")
+
+    def _start_renewing(self):
+        if self._renew_task is None or self._renew_task.done():
+            self._renew_task = asyncio.create_task(self._renew_leases())
+
+    async def _renew_leases(self):
+        """Extends the cluster leases of this process until none is left."""
+        while self._cluster_leases:
+            await asyncio.sleep(self.lease_seconds / 3)
+            if not self._cluster_leases:
+                # Released while sleeping; ZADD rejects an empty mapping
+                break
+            expiry = time.time() + self.lease_seconds
+            try:
+                # XX: only leases still held are renewed
+                await self._redis.zadd(
+                    _LEASES_KEY,
+                    {ticket: expiry for ticket in self._cluster_leases},
+                    xx=True,
+                )
+            except Exception as e:
+                logger.warning(f"Failed to renew session leases: {e}")
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "active": self.active,
+            "waiting": len(self._waiting),
+            "cluster_leases": len(self._cluster_leases),
+            "admitted": self.admitted,
+            "rejected": self.rejected,
+            "mean_session_seconds": round(self.mean_session_seconds, 1),
+        }
+
+
+@lru_cache(maxsize=1)
+def get_admission_controller() -> AdmissionController:
+    """The admission controller of this process."""
+    return AdmissionController()
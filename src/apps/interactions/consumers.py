@@ -1,24 +1,62 @@
 import asyncio
+import hmac
 import json
 import time
 
+from urllib.parse import parse_qs
+
 from channels.generic.websocket import AsyncWebsocketConsumer
-from typing import Dict, Any
+from asgiref.sync import sync_to_async
+from typing import Dict, Any, Optional
+from apps.ai_engine.s2s.events import S2sEvent
 from apps.ai_engine.s2s.session_manger import S2sSessionManager
+from apps.ai_engine.s2s.routing import BARGE_IN_MARKER
+from apps.ai_engine.s2s.stream_pool import get_stream_pool
 from core.settings.base import logger
 from core.settings.base import DEFAULT_REGION, SPEECH_TO_SPEECH_MODEL_ID
+from core.settings.base import (
+    S2S_LOAD_TEST_TOKEN,
+    S2S_RESUME_GRACE_SECONDS,
+    S2S_RESUME_HISTORY_SEGMENTS,
+)
 from apps.coaching.models import InterviewSession
-from apps.agents.services.agent_factory import get_feedback_agent
+from apps.coaching.feedback import feedback_group
+from apps.coaching.tasks import enqueue_session_feedback
+from apps.coaching.transcripts import (
+    TranscriptCheckpointer,
+    complete_session,
+)
+from .admission import AdmissionRejected, get_admission_controller
+from .protocol import decode_audio_frame, FrameDecodeError
+from .session_registry import get_session_registry
+from .tasks import schedule_session_finalization
+
+Status = InterviewSession.SessionStatus
 
+# Client messages kept while the connection waits for admission
+MAX_BACKLOG = 500
+# "Try Again Later"
+CLOSE_CODE_TRY_AGAIN = 1013
 
-from pydantic import BaseModel
+# Speech roles of the transcript segments
+HISTORY_ROLES = {"user": "USER", "coach": "ASSISTANT"}
 
 
-class AIFeedback(BaseModel):
-    strengths: list[str]
-    areas_of_improvement: list[str]
-    general_feedback: str
-    final_rating: int
+def history_turns(segments, limit):
+    """
+    The last `limit` transcript segments as (role, text) turns, with
+    consecutive segments of one speaker merged.
+    """
+    turns = []
+    for segment in segments[-limit:] if limit else []:
+        role = HISTORY_ROLES.get(segment["role"])
+        if role is None:
+            continue
+        if turns and turns[-1][0] == role:
+            turns[-1] = (role, f"{turns[-1][1]} {segment['content']}")
+        else:
+            turns.append((role, segment["content"]))
+    return turns
 
 
 class SpeechToSpeechConsumer(AsyncWebsocketConsumer):
@@ -26,7 +64,12 @@ class SpeechToSpeechConsumer(AsyncWebsocketConsumer):
         try:
             if not isinstance(payload, str):
                 payload = json.dumps(payload)
+            started = time.perf_counter()
             await self.send(text_data=payload)
+            if self.stream_manager is not None:
+                self.stream_manager.latency.observe(
+                    "websocket_send", time.perf_counter() - started
+                )
         except Exception as e:
             logger.error(f"Failed to send message to frontend: {e}")
 
@@ -34,48 +77,307 @@ class SpeechToSpeechConsumer(AsyncWebsocketConsumer):
         self.stream_manager = None
         self.forward_task = None
         self.session = None
-        self.transcription = []
+        # Persists the transcript once the session is known
+        self.transcript = None
         self.start_time = None
         self.write_transcript = False
         self.role = "Unknown"
         self.input_queue = asyncio.Queue()
+        self.finalized = False
+        self.feedback_group = None
+        self.connected_at = time.perf_counter()
+        self.registry = get_session_registry()
+        self.prompt_name = None
+        # State of a resumed session, until its history is replayed
+        self.resume = None
+        self.awaiting_resume_audio = False
+        # Live session slot; until it is granted, client messages wait in
+        # the backlog
+        self.lease = None
+        self.admission_task = None
+        self.backlog = []
+        # Starts pre-opening Bedrock streams if pooling is enabled
+        get_stream_pool(DEFAULT_REGION, SPEECH_TO_SPEECH_MODEL_ID)
         await self.accept()
         await self.safe_send({"event": {"message": "Connected!"}})
+        # In a task: the consumer must keep handling the disconnect
+        self.admission_task = asyncio.create_task(self.wait_for_admission())
+
+    async def wait_for_admission(self):
+        """
+        Takes a live session slot, reporting the queue position and wait
+        estimate while the connection waits, then handles what the client
+        sent meanwhile. A rejected connection is told when to retry and
+        closed.
+        """
+        try:
+            self.lease = await get_admission_controller().admit(
+                await self.admission_class(), self.report_queue_position
+            )
+        except AdmissionRejected as e:
+            await self.safe_send(
+                {
+                    "event": {
+                        "admissionRejected": {
+                            "reason": e.reason,
+                            "retryAfter": e.retry_after,
+                        }
+                    }
+                }
+            )
+            await self.close(code=CLOSE_CODE_TRY_AGAIN)
+            return
+
+        if self.lease.waited_seconds >= 1:
+            await self.safe_send(
+                {
+                    "event": {
+                        "admitted": {
+                            "waitedMs": round(self.lease.waited_seconds * 1000)
+                        }
+                    }
+                }
+            )
+        while self.backlog:
+            await self.handle_message(*self.backlog.pop(0))
+        self.backlog = None
+
+    async def admission_class(self) -> Optional[str]:
+        """
+        The priority class of the connection, decided here rather than
+        taken from the client: resume when it names a detached session,
+        load_test with the load test token, the default class otherwise.
+        """
+        query = parse_qs(self.scope.get("query_string", b"").decode())
+        token = query.get("load_test_token", [""])[0]
+        if S2S_LOAD_TEST_TOKEN and hmac.compare_digest(
+            token.encode(), S2S_LOAD_TEST_TOKEN.encode()
+        ):
+            return "load_test"
+        resume = query.get("resume", [None])[0]
+        if resume and await self.registry.is_resumable(resume):
+            return "resume"
+        return None
+
+    async def report_queue_position(self, position: int, eta: float):
+        await self.safe_send(
+            {
+                "event": {
+                    "admissionQueued": {
+                        "position": position,
+                        "etaSeconds": round(eta),
+                    }
+                }
+            }
+        )
+
+    async def release_admission(self):
+        task = self.admission_task
+        # sessionEnd may be handled from the backlog, in the task itself
+        if task and not task.done() and task is not asyncio.current_task():
+            task.cancel()
+        if self.lease:
+            await self.lease.release()
 
     async def disconnect(self, code: int):
         try:
+            if self.resumable():
+                await self.suspend_session()
+            else:
+                await self.finalize_session()
+            if self.feedback_group:
+                await self.channel_layer.group_discard(
+                    self.feedback_group, self.channel_name
+                )
+        except Exception as e:
+            logger.error(f"Error on disconnect: {e}")
+        finally:
+            await self.release_admission()
+
+    async def finalize_session(self, wait_for_feedback: bool = False):
+        """
+        Closes the Bedrock stream, persists the transcript and queues the
+        feedback job, once. The feedback is generated by a Celery worker;
+        with `wait_for_feedback` this socket joins the group notified when
+        it is ready, otherwise clients poll the session.
+        """
+        if self.finalized:
+            return
+        self.finalized = True
+
+        if self.forward_task:
+            self.forward_task.cancel()
+
+        if self.stream_manager:
+            await self.stream_manager.close()
+            if self.session:
+                self.session.latency_summary = (
+                    self.stream_manager.latency.summary()
+                )
+
+        if self.session is None:
+            return
 
-            if self.forward_task:
-                self.forward_task.cancel()
+        if self.transcript:
+            await self.transcript.close()
+        await self.registry.discard(self.prompt_name)
+        if not await complete_session(self.session):
+            return
 
-            if self.stream_manager:
-                await self.stream_manager.close()
+        if wait_for_feedback:
+            # Joined and announced before queueing: without a broker the
+            # task runs inline, and its notification must not overtake
+            # feedbackPending
+            self.feedback_group = feedback_group(self.session.id)
+            await self.channel_layer.group_add(
+                self.feedback_group, self.channel_name
+            )
+            await self.safe_send(
+                {"event": {"feedbackPending": {"sessionId": self.session.id}}}
+            )
+        try:
+            await sync_to_async(enqueue_session_feedback)(self.session.id)
+        except Exception as e:
+            logger.error(f"Failed to queue feedback: {e}")
 
-            if self.transcription:
-                logger.debug(f"TRANSCRIPTION: {self.transcription}")
-                self.session.full_transcript = self.transcription
+    def resumable(self) -> bool:
+        return (
+            S2S_RESUME_GRACE_SECONDS > 0
+            and not self.finalized
+            and self.session is not None
+            and self.session.status == Status.IN_PROGRESS
+        )
 
-                agent = get_feedback_agent()
-                logger.debug("Before agent invoke")
+    async def suspend_session(self):
+        """
+        The socket dropped mid-interview: closes this connection's stream
+        and leaves the session in the registry, where a reconnect to any
+        node picks it up. A Celery task finalizes it if nobody does within
+        S2S_RESUME_GRACE_SECONDS.
+        """
+        self.finalized = True
+
+        if self.forward_task:
+            self.forward_task.cancel()
+
+        if self.stream_manager:
+            await self.stream_manager.close()
+            self.session.latency_summary = (
+                self.stream_manager.latency.summary()
+            )
+            await self.session.asave(
+                update_fields=["latency_summary", "updated_at"]
+            )
 
-                profile_id = self.session.job_profile_id
-                ai_feedback: AIFeedback = await agent.structured_output_async(
-                    output_model=AIFeedback,
-                    prompt=f"Start a rating for the profile_id={profile_id} and the transcription is: {self.transcription}",
+        if self.transcript:
+            await self.transcript.close()
+
+        try:
+            token = await self.registry.release(
+                self.prompt_name, self.channel_name
+            )
+        except Exception as e:
+            logger.warning(f"Session {self.session.id} not resumable: {e}")
+            self.finalized = False
+            await self.finalize_session()
+            return
+        if token is None:
+            # Already claimed by a new connection
+            return
+        logger.info(f"Session {self.session.id} suspended")
+        await sync_to_async(schedule_session_finalization)(
+            self.session.id, self.prompt_name, token
+        )
+
+    async def claim_session(self):
+        """
+        Registers this connection as the session's. On a reconnect, the
+        segments the previous connection did not get to write are written,
+        and its history is kept for replay before the audio starts.
+        """
+        state = await self.registry.claim(self.prompt_name, self.channel_name)
+        if not state.resumed:
+            return
+
+        for segment in state.segments:
+            if segment["seq"] == self.transcript.next_seq:
+                self.transcript.append(
+                    segment["role"], segment["content"], segment["timestamp"]
                 )
+        # Segment timestamps carry on from the earlier connections
+        self.start_time -= state.last_timestamp
+        self.resume = state
+        logger.info(
+            f"Resuming session {self.session.id} with "
+            f"{len(state.segments)} transcript segments"
+        )
 
-                logger.debug("After agent invoke")
-                self.session.session_feedback = ai_feedback.model_dump()
-                self.session.status = "COMPLETED"
-                await self.session.asave()
+    async def replay_history(self):
+        """Sends the resumed conversation to the new Bedrock stream."""
+        state, self.resume = self.resume, None
+        turns = history_turns(state.segments, S2S_RESUME_HISTORY_SEGMENTS)
+        for event in S2sEvent.conversation_history(
+            self.stream_manager.prompt_name, turns
+        ):
+            await self.stream_manager.send_raw_event(event)
+
+        ready = time.perf_counter() - self.connected_at
+        self.stream_manager.latency.observe("resume_ready", ready)
+        self.awaiting_resume_audio = True
+        await self.safe_send(
+            {
+                "event": {
+                    "sessionResumed": {
+                        "promptName": self.stream_manager.prompt_name,
+                        "segments": len(state.segments),
+                        "readyMs": round(ready * 1000),
+                    }
+                }
+            }
+        )
+
+    async def session_feedback(self, event: Dict[str, Any]):
+        """Channel layer handler: the feedback of the session is ready."""
+        await self.safe_send(
+            {
+                "event": {
+                    "sessionFeedback": {
+                        "sessionId": event["session_id"],
+                        "status": event["status"],
+                        "feedback": event["feedback"],
+                    }
+                }
+            }
+        )
+
+    async def _ensure_stream_manager(self):
+        if self.stream_manager is None:
+            self.stream_manager = S2sSessionManager(
+                model_id=SPEECH_TO_SPEECH_MODEL_ID,
+                region=DEFAULT_REGION,
+                mcp_client=None,
+                strands_agent=None,
+            )
+            await self.stream_manager.initialize_stream()
+            self.forward_task = asyncio.create_task(self.forward_responses())
+
+    async def receive(self, text_data: str = None, bytes_data: bytes = None):
+        if self.backlog is not None:
+            # Not admitted yet, or the backlog is still being handled
+            if len(self.backlog) < MAX_BACKLOG:
+                self.backlog.append((text_data, bytes_data))
             else:
-                self.session.status = "INCOMPLETE"
-                await self.session.asave()
+                logger.warning("Admission backlog full, message dropped")
+            return
+        await self.handle_message(text_data, bytes_data)
 
-        except Exception as e:
-            logger.error(f"Error on disconnect: {e}")
+    async def handle_message(
+        self, text_data: str = None, bytes_data: bytes = None
+    ):
+        if bytes_data is not None:
+            await self.receive_audio_frame(bytes_data)
+            return
 
-    async def receive(self, text_data: str = None):
         try:
             data = json.loads(text_data)
             if "body" in data:
@@ -85,46 +387,73 @@ class SpeechToSpeechConsumer(AsyncWebsocketConsumer):
 
             event_type = list(data["event"].keys())[0]
 
-            if self.stream_manager is None:
-                self.stream_manager = S2sSessionManager(
-                    model_id=SPEECH_TO_SPEECH_MODEL_ID,
-                    region=DEFAULT_REGION,
-                    mcp_client=None,
-                    strands_agent=None,
-                )
-                await self.stream_manager.initialize_stream()
-                self.forward_task = asyncio.create_task(
-                    self.forward_responses()
+            await self._ensure_stream_manager()
+            # Session setup events are sent from the pre-encoded payloads
+            # when those carry everything the client sent; otherwise the
+            # client event is forwarded unchanged
+            encoded = None
+
+            if event_type == "sessionStart":
+                encoded = S2sEvent.cached_session_start(
+                    data["event"]["sessionStart"]
                 )
 
-            if event_type == "promptStart":
-                prompt_name = data["event"]["promptStart"]["promptName"]
+            elif event_type == "promptStart":
+                prompt_start = data["event"]["promptStart"]
+                prompt_name = prompt_start["promptName"]
+                # Tools run on the server, so their configuration is the
+                # registry's rather than the client's
+                encoded = S2sEvent.cached_prompt_start(prompt_start)
                 self.stream_manager.prompt_name = prompt_name
                 self.start_time = time.perf_counter()
                 logger.debug(f"PROMPT NAME: {prompt_name}")
                 self.session = await InterviewSession.objects.aget(
                     prompt_name=prompt_name
                 )
+                self.session.status = Status.IN_PROGRESS
+                await self.session.asave(
+                    update_fields=["status", "updated_at"]
+                )
+                self.prompt_name = str(self.session.prompt_name)
+                self.transcript = TranscriptCheckpointer(self.session)
+                await self.transcript.start()
+                await self.claim_session()
 
             elif event_type == "contentStart":
                 content_name = data["event"]["contentStart"]["contentName"]
                 if data["event"]["contentStart"].get("type") == "AUDIO":
                     self.stream_manager.audio_content_name = content_name
+                    if self.resume is not None:
+                        # After the system prompt, before the audio
+                        await self.replay_history()
+
+            elif event_type == "contentEnd":
+                content_name = data["event"]["contentEnd"]["contentName"]
+                if content_name == self.stream_manager.audio_content_name:
+                    # Buffered audio must reach Bedrock before its contentEnd
+                    await self.stream_manager.flush_audio_input()
 
             if event_type == "audioInput":
                 prompt_name = data["event"]["audioInput"]["promptName"]
                 content_name = data["event"]["audioInput"]["contentName"]
                 audio_base64 = data["event"]["audioInput"]["content"]
-                self.stream_manager.add_audio_chunk(
+                await self.stream_manager.add_audio_chunk(
                     prompt_name, content_name, audio_base64
                 )
+            elif encoded is not None:
+                await self.stream_manager.send_raw_bytes(encoded)
             else:
                 # Forward to Bedrock
                 await self.stream_manager.send_raw_event(data)
+
+            if event_type == "sessionEnd":
+                # The socket stays open for the client to wait for feedback
+                await self.finalize_session(wait_for_feedback=True)
+                await self.release_admission()
         except Exception as e:
             if self.session:
-                self.session.status = "ERROR"
-                await self.session.asave
+                self.session.status = Status.ERROR
+                await self.session.asave()
 
             logger.error(f"Receive error: {e}")
             await self.send(
@@ -133,6 +462,25 @@ class SpeechToSpeechConsumer(AsyncWebsocketConsumer):
                 )
             )
 
+    async def receive_audio_frame(self, frame: bytes):
+        """Handles a binary audio frame (see apps.interactions.protocol)."""
+        if self.stream_manager is None:
+            logger.warning("Audio frame received before the stream started")
+            return
+
+        try:
+            audio_frame = decode_audio_frame(frame)
+        except FrameDecodeError as e:
+            logger.warning(f"Invalid audio frame: {e}")
+            await self.safe_send({"error": f"Invalid audio frame: {str(e)}"})
+            return
+
+        await self.stream_manager.add_audio_chunk(
+            audio_frame.prompt_name,
+            audio_frame.content_name,
+            audio_frame.payload,
+        )
+
     async def create_transcription(self, response: Dict[str, Any]):
         if "contentStart" in response["event"]:
             content_start = response["event"]["contentStart"]
@@ -158,41 +506,45 @@ class SpeechToSpeechConsumer(AsyncWebsocketConsumer):
         if "textOutput" in response["event"]:
             text_content = response["event"]["textOutput"]["content"]
             # Check if there is a barge-in
-            if '{ "interrupted" : true }' in text_content:
+            if BARGE_IN_MARKER in text_content:
+                # The session manager already purged the queued audio and
+                # sent audioFlush to the client
                 logger.trace(
-                    "Barge-in detected. Front shoud cancel audio output."
+                    "Barge-in detected."
                 )  # TODO: Add logic to handle barge-in in transcripts
             if self.role == "ASSISTANT" and self.write_transcript:
-                transcript = {
-                    "role": "coach",
-                    "content": text_content,
-                    "timestamp": round(
-                        time.perf_counter() - self.start_time, 2
-                    ),
-                }
-                self.transcription.append(transcript)
+                await self.add_transcript_segment("coach", text_content)
             elif self.role == "USER":
-                transcript = {
-                    "role": "user",
-                    "content": text_content,
-                    "timestamp": round(
-                        time.perf_counter() - self.start_time, 2
-                    ),
-                }
-                self.transcription.append(transcript)
+                await self.add_transcript_segment("user", text_content)
+
+    async def add_transcript_segment(self, role: str, content: str):
+        if self.transcript is None:
+            return
+        timestamp = round(time.perf_counter() - self.start_time, 2)
+        seq = self.transcript.append(role, content, timestamp)
+        await self.registry.append(
+            self.prompt_name, seq, role, content, timestamp
+        )
 
     async def forward_responses(self):
         try:
             while True:
-                response = await self.stream_manager.output_queue.get()
+                event = await self.stream_manager.output_queue.get()
 
-                if not isinstance(response, dict):
-                    logger.warning(f"Non-dict response received: {response}")
-                    continue
-
-                await self.create_transcription(response)
+                # Only parsed events matter for transcripts; audio frames
+                # are forwarded as the text Bedrock sent.
+                if event.data is not None:
+                    await self.create_transcription(event.data)
+                elif (
+                    self.awaiting_resume_audio and event.name == "audioOutput"
+                ):
+                    self.awaiting_resume_audio = False
+                    self.stream_manager.latency.observe(
+                        "resume_first_audio",
+                        time.perf_counter() - self.connected_at,
+                    )
 
-                await self.safe_send(response)
+                await self.safe_send(event.raw)
 
         except asyncio.CancelledError:
             pass
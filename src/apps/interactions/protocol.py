@@ -0,0 +1,81 @@
+"""
+Binary frame protocol for the live interaction WebSocket.
+
+Control events (sessionStart, promptStart, contentStart, ...) keep travelling
+as JSON text frames. Microphone audio travels as binary frames so we skip the
+JSON parsing and the base64 overhead on every 20-100 ms chunk.
+
+Binary frame layout (all header fields are unsigned bytes):
+
+    +---------+------+------------+-------------+-------------+--------------+-----------+
+    | version | type | prompt len | content len | prompt name | content name | payload   |
+    | 1 byte  | 1 b  | 1 byte     | 1 byte      | N bytes     | M bytes      | raw bytes |
+    +---------+------+------------+-------------+-------------+--------------+-----------+
+
+- prompt name and content name are UTF-8 encoded.
+- For AUDIO_INPUT frames the payload is raw 16-bit little-endian mono PCM
+  matching the audioInputConfiguration sent in contentStart.
+"""
+
+import struct
+from dataclasses import dataclass
+
+PROTOCOL_VERSION = 1
+
+FRAME_TYPE_AUDIO_INPUT = 0x01
+
+_HEADER = struct.Struct("!BBBB")
+
+
+class FrameDecodeError(ValueError):
+    """Raised when a binary frame does not follow the protocol."""
+
+
+@dataclass(slots=True)
+class AudioFrame:
+    prompt_name: str
+    content_name: str
+    payload: bytes
+
+
+def encode_audio_frame(
+    prompt_name: str, content_name: str, payload: bytes
+) -> bytes:
+    """Builds a binary AUDIO_INPUT frame. Mostly useful for clients and tests."""
+    prompt = prompt_name.encode("utf-8")
+    content = content_name.encode("utf-8")
+    if len(prompt) > 255 or len(content) > 255:
+        raise ValueError("Prompt and content names must fit in 255 bytes")
+    header = _HEADER.pack(
+        PROTOCOL_VERSION, FRAME_TYPE_AUDIO_INPUT, len(prompt), len(content)
+    )
+    return b"".join((header, prompt, content, payload))
+
+
+def decode_audio_frame(frame: bytes) -> AudioFrame:
+    """Parses a binary AUDIO_INPUT frame sent by the client."""
+    if len(frame) < _HEADER.size:
+        raise FrameDecodeError("Frame is shorter than the header")
+
+    version, frame_type, prompt_len, content_len = _HEADER.unpack_from(frame)
+    if version != PROTOCOL_VERSION:
+        raise FrameDecodeError(f"Unsupported protocol version: {version}")
+    if frame_type != FRAME_TYPE_AUDIO_INPUT:
+        raise FrameDecodeError(f"Unsupported frame type: {frame_type}")
+
+    prompt_end = _HEADER.size + prompt_len
+    content_end = prompt_end + content_len
+    if len(frame) < content_end:
+        raise FrameDecodeError("Frame is shorter than its declared header")
+
+    view = memoryview(frame)
+    try:
+        prompt_name = str(view[_HEADER.size : prompt_end], "utf-8")
+        content_name = str(view[prompt_end:content_end], "utf-8")
+    except UnicodeDecodeError as e:
+        raise FrameDecodeError(f"Names are not valid UTF-8: {e}") from e
+    return AudioFrame(
+        prompt_name=prompt_name,
+        content_name=content_name,
+        payload=bytes(view[content_end:]),
+    )
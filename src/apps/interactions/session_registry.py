@@ -0,0 +1,217 @@
+import json
+import time
+import uuid
+
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Any, Dict, List, Optional
+
+from core.settings.base import logger
+from core.settings.base import REDIS_URL, S2S_SESSION_TTL_SECONDS
+
+# Registry calls sit on the connect and transcript paths; a slow Redis is
+# treated as unavailable rather than waited on.
+_REDIS_TIMEOUT_SECONDS = 0.25
+
+# Entries of the in-process registry, shared by every instance so the
+# eager Celery tasks of this process see them.
+_LOCAL_SESSIONS: Dict[str, Dict[str, Any]] = {}
+
+# Detaches the session from its owner (ARGV[1]) with the token ARGV[2],
+# unless another connection has claimed it. Returns 1 when detached.
+_RELEASE_SCRIPT = """
+if redis.call('HGET', KEYS[1], 'owner') ~= ARGV[1] then
+    return 0
+end
+redis.call('HDEL', KEYS[1], 'owner')
+redis.call('HSET', KEYS[1], 'detached', ARGV[2])
+return 1
+"""
+
+
+@dataclass
+class SessionState:
+    """What the registry knew about a session when it was claimed."""
+
+    resumed: bool = False
+    # Transcript segments in order: seq, role, content, timestamp
+    segments: List[Dict[str, Any]] = field(default_factory=list)
+
+    @property
+    def last_timestamp(self) -> float:
+        return self.segments[-1]["timestamp"] if self.segments else 0.0
+
+
+class SessionRegistry:
+    """
+    Live speech to speech sessions by prompt name, with the transcript so
+    far and its sequence numbers, so a reconnect to any node can rebuild
+    the Bedrock stream and replay the conversation.
+
+    Each session is a Redis hash (owner, created, detached) and a list of
+    JSON segments, both expiring `ttl_seconds` after the last write.
+    Without Redis the entries live in this process. Redis errors are
+    logged and the session carries on without being resumable, except in
+    `release` and `is_detached`, which decide whether a session gets
+    finalized and raise them instead.
+    """
+
+    def __init__(
+        self,
+        redis_url: Optional[str] = REDIS_URL,
+        ttl_seconds: int = S2S_SESSION_TTL_SECONDS,
+    ):
+        self.ttl_seconds = ttl_seconds
+        self._redis = None
+        self._release = None
+        if redis_url:
+            import redis.asyncio as redis
+
+            self._redis = redis.from_url(
+                redis_url,
+                socket_timeout=_REDIS_TIMEOUT_SECONDS,
+                socket_connect_timeout=_REDIS_TIMEOUT_SECONDS,
+            )
+            self._release = self._redis.register_script(_RELEASE_SCRIPT)
+
+    @staticmethod
+    def _keys(prompt_name: str):
+        key = f"s2s:session:{prompt_name}"
+        return key, f"{key}:transcript"
+
+    def _local(self, prompt_name: str) -> Optional[Dict[str, Any]]:
+        entry = _LOCAL_SESSIONS.get(prompt_name)
+        if entry and entry["expires_at"] <= time.monotonic():
+            del _LOCAL_SESSIONS[prompt_name]
+            return None
+        return entry
+
+    def _touch(self, entry: Dict[str, Any]):
+        entry["expires_at"] = time.monotonic() + self.ttl_seconds
+
+    async def claim(self, prompt_name: str, owner: str) -> SessionState:
+        """
+        Makes `owner` (a channel name) the connection of the session and
+        returns its transcript. `resumed` is set when the session was
+        already registered, i.e. this is a reconnect.
+        """
+        if self._redis is None:
+            entry = self._local(prompt_name)
+            resumed = entry is not None
+            if entry is None:
+                entry = _LOCAL_SESSIONS[prompt_name] = {"segments": []}
+            entry.update(owner=owner, detached=None)
+            self._touch(entry)
+            return SessionState(resumed, list(entry["segments"]))
+
+        key, transcript_key = self._keys(prompt_name)
+        try:
+            pipe = self._redis.pipeline()
+            pipe.hsetnx(key, "created", int(time.time()))
+            pipe.hset(key, "owner", owner)
+            pipe.hdel(key, "detached")
+            pipe.lrange(transcript_key, 0, -1)
+            pipe.expire(key, self.ttl_seconds)
+            pipe.expire(transcript_key, self.ttl_seconds)
+            created, _, _, segments, _, _ = await pipe.execute()
+        except Exception as e:
+            logger.warning(f"Session registry claim failed: {e}")
+            return SessionState()
+        return SessionState(
+            resumed=not created,
+            segments=[json.loads(segment) for segment in segments],
+        )
+
+    async def append(
+        self,
+        prompt_name: str,
+        seq: int,
+        role: str,
+        content: str,
+        timestamp: float,
+    ):
+        segment = {
+            "seq": seq,
+            "role": role,
+            "content": content,
+            "timestamp": timestamp,
+        }
+        if self._redis is None:
+            entry = self._local(prompt_name)
+            if entry is not None:
+                entry["segments"].append(segment)
+                self._touch(entry)
+            return
+
+        key, transcript_key = self._keys(prompt_name)
+        try:
+            pipe = self._redis.pipeline()
+            pipe.rpush(transcript_key, json.dumps(segment))
+            pipe.expire(key, self.ttl_seconds)
+            pipe.expire(transcript_key, self.ttl_seconds)
+            await pipe.execute()
+        except Exception as e:
+            logger.warning(f"Session registry append failed: {e}")
+
+    async def release(self, prompt_name: str, owner: str) -> Optional[str]:
+        """
+        Detaches the session from `owner` and returns a token identifying
+        this detachment, or None when another connection has claimed the
+        session since. The check and the detachment are atomic, so a claim
+        from another node cannot land in between.
+        """
+        token = uuid.uuid4().hex
+        if self._redis is None:
+            entry = self._local(prompt_name)
+            if entry is None or entry["owner"] != owner:
+                return None
+            entry.update(owner=None, detached=token)
+            return token
+
+        key, _ = self._keys(prompt_name)
+        if not await self._release(keys=[key], args=[owner, token]):
+            return None
+        return token
+
+    async def is_resumable(self, prompt_name: str) -> bool:
+        """Whether the session is registered and no connection holds it."""
+        if self._redis is None:
+            entry = self._local(prompt_name)
+            return entry is not None and entry["detached"] is not None
+
+        key, _ = self._keys(prompt_name)
+        try:
+            return bool(await self._redis.hexists(key, "detached"))
+        except Exception as e:
+            logger.warning(f"Session registry lookup failed: {e}")
+            return False
+
+    async def is_detached(self, prompt_name: str, token: str) -> bool:
+        """Whether the session is still detached as of `token`."""
+        if self._redis is None:
+            entry = self._local(prompt_name)
+            return entry is not None and entry["detached"] == token
+
+        key, _ = self._keys(prompt_name)
+        detached = await self._redis.hget(key, "detached")
+        return detached is not None and detached.decode("utf-8") == token
+
+    async def discard(self, prompt_name: str):
+        """Forgets a finished session."""
+        if self._redis is None:
+            _LOCAL_SESSIONS.pop(prompt_name, None)
+            return
+        try:
+            await self._redis.delete(*self._keys(prompt_name))
+        except Exception as e:
+            logger.warning(f"Session registry delete failed: {e}")
+
+    async def close(self):
+        if self._redis is not None:
+            await self._redis.aclose()
+
+
+@lru_cache(maxsize=1)
+def get_session_registry() -> SessionRegistry:
+    """The registry of this process' consumers."""
+    return SessionRegistry()
@@ -0,0 +1,52 @@
+from asgiref.sync import async_to_sync, sync_to_async
+from celery import shared_task
+
+from core.settings.base import logger
+from core.settings.base import S2S_RESUME_GRACE_SECONDS
+
+from apps.coaching.models import InterviewSession
+from apps.coaching.tasks import enqueue_session_feedback
+from apps.coaching.transcripts import complete_session
+
+from .session_registry import SessionRegistry
+
+Status = InterviewSession.SessionStatus
+
+
+@shared_task(autoretry_for=(Exception,), retry_backoff=True, max_retries=3)
+def finalize_dropped_session(session_id: int, prompt_name: str, token: str):
+    """
+    Finalizes an interview whose socket dropped and that was not resumed
+    within the grace period. `token` identifies the detachment; a session
+    claimed again since is left alone.
+    """
+    async_to_sync(_finalize_dropped_session)(session_id, prompt_name, token)
+
+
+async def _finalize_dropped_session(
+    session_id: int, prompt_name: str, token: str
+):
+    # Its own client: the Redis connections are bound to this event loop
+    registry = SessionRegistry()
+    try:
+        if not await registry.is_detached(prompt_name, token):
+            logger.info(f"Session {session_id} was resumed")
+            return
+
+        session = await InterviewSession.objects.aget(id=session_id)
+        if session.status == Status.IN_PROGRESS:
+            logger.info(f"Finalizing dropped session {session_id}")
+            if await complete_session(session):
+                await sync_to_async(enqueue_session_feedback)(session.id)
+        await registry.discard(prompt_name)
+    finally:
+        await registry.close()
+
+
+def schedule_session_finalization(
+    session_id: int, prompt_name: str, token: str
+):
+    """Finalizes the dropped session unless it is resumed in time."""
+    finalize_dropped_session.apply_async(
+        (session_id, prompt_name, token), countdown=S2S_RESUME_GRACE_SECONDS
+    )
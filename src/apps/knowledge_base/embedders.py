@@ -0,0 +1,106 @@
+import hashlib
+import json
+import math
+import re
+
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import List, Optional, Protocol
+
+import boto3
+from django.conf import settings
+from django.utils.module_loading import import_string
+
+
+class Embedder(Protocol):
+    """Anything that turns a batch of texts into vectors."""
+
+    model_id: str
+    dimensions: int
+
+    def embed(self, texts: List[str]) -> List[List[float]]: ...
+
+
+class BedrockTitanEmbedder:
+    """
+    Embeds text with an Amazon Titan text embeddings model. Titan takes one
+    text per request, so a batch is spread over a small thread pool.
+    """
+
+    def __init__(
+        self,
+        model_id: str = settings.KB_EMBEDDING_MODEL_ID,
+        dimensions: int = settings.KB_EMBEDDING_DIMENSIONS,
+        region: str = settings.DEFAULT_REGION,
+        concurrency: int = settings.KB_EMBEDDING_CONCURRENCY,
+    ):
+        self.model_id = model_id
+        self.dimensions = dimensions
+        self.client = boto3.client("bedrock-runtime", region_name=region)
+        self._executor = ThreadPoolExecutor(
+            max_workers=concurrency, thread_name_prefix="kb-embed"
+        )
+
+    def embed(self, texts: List[str]) -> List[List[float]]:
+        return list(self._executor.map(self._embed_one, texts))
+
+    def _embed_one(self, text: str) -> List[float]:
+        response = self.client.invoke_model(
+            modelId=self.model_id,
+            body=json.dumps(
+                {
+                    "inputText": text,
+                    "dimensions": self.dimensions,
+                    "normalize": True,
+                }
+            ),
+        )
+        return json.loads(response["body"].read())["embedding"]
+
+
+class HashingEmbedder:
+    """
+    Deterministic local embedder for tests and offline runs. Word tokens
+    are feature-hashed into a normalized vector: there is no semantic
+    meaning, but identical texts get identical vectors and texts sharing
+    words end up close.
+    """
+
+    model_id = "local-hashing-v1"
+
+    def __init__(self, dimensions: int = settings.KB_EMBEDDING_DIMENSIONS):
+        self.dimensions = dimensions
+
+    def embed(self, texts: List[str]) -> List[List[float]]:
+        return [self._embed_one(text) for text in texts]
+
+    def _embed_one(self, text: str) -> List[float]:
+        vector = [0.0] * self.dimensions
+        for token in re.findall(r"\w+", text.lower()):
+            digest = hashlib.blake2b(token.encode("utf-8"), digest_size=8)
+            value = int.from_bytes(digest.digest(), "big")
+            sign = 1.0 if value & 1 else -1.0
+            vector[(value >> 1) % self.dimensions] += sign
+
+        norm = math.sqrt(sum(v * v for v in vector))
+        if not norm:
+            # Cosine distance is undefined for the zero vector
+            vector[0] = norm = 1.0
+        return [v / norm for v in vector]
+
+
+EMBEDDERS = {
+    "bedrock": BedrockTitanEmbedder,
+    "hashing": HashingEmbedder,
+}
+
+
+@lru_cache(maxsize=None)
+def get_embedder(name: Optional[str] = None) -> Embedder:
+    """
+    Returns the embedder shared by this process. `name` (KB_EMBEDDER by
+    default) is a key of EMBEDDERS or the dotted path of an Embedder class.
+    """
+    name = name or settings.KB_EMBEDDER
+    embedder_class = EMBEDDERS.get(name) or import_string(name)
+    return embedder_class()
@@ -0,0 +1,94 @@
+import hashlib
+
+from typing import Dict, Iterable, List, Optional
+
+from core.settings.base import logger
+
+from .embedders import Embedder, get_embedder
+from .models import EmbeddingCacheEntry
+from .services import VECTOR_STORE_DB
+
+
+def content_hash(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def get_many(model_id: str, hashes: Iterable[str]) -> Dict[str, List[float]]:
+    """Returns the cached embeddings of `hashes` for a model, by hash."""
+    rows = (
+        EmbeddingCacheEntry.objects.using(VECTOR_STORE_DB)
+        .filter(model_id=model_id, content_hash__in=set(hashes))
+        .values_list("content_hash", "embedding")
+    )
+    return {digest: list(embedding) for digest, embedding in rows}
+
+
+def put_many(model_id: str, embeddings: Dict[str, List[float]]):
+    """Stores embeddings by content hash; existing keys are left alone."""
+    EmbeddingCacheEntry.objects.using(VECTOR_STORE_DB).bulk_create(
+        [
+            EmbeddingCacheEntry(
+                model_id=model_id, content_hash=digest, embedding=embedding
+            )
+            for digest, embedding in embeddings.items()
+        ],
+        ignore_conflicts=True,
+    )
+
+
+class CachedEmbedder:
+    """
+    Wraps an Embedder with the persistent embedding cache: each batch is
+    looked up in one query, only the misses are embedded, then stored in
+    one insert. Counts hits and misses for reuse-rate reporting.
+    """
+
+    def __init__(self, embedder: Embedder):
+        self.embedder = embedder
+        self.model_id = embedder.model_id
+        self.dimensions = embedder.dimensions
+        self.hits = 0
+        self.misses = 0
+
+    def embed(self, texts: List[str]) -> List[List[float]]:
+        hashes = [content_hash(text) for text in texts]
+        cached = get_many(self.model_id, hashes)
+
+        missing = {}
+        for digest, text in zip(hashes, texts):
+            if digest not in cached:
+                missing.setdefault(digest, text)
+        self.hits += len(texts) - len(missing)
+        self.misses += len(missing)
+
+        if missing:
+            fresh = dict(
+                zip(missing, self.embedder.embed(list(missing.values())))
+            )
+            put_many(self.model_id, fresh)
+            cached.update(fresh)
+        return [cached[digest] for digest in hashes]
+
+    def stats(self) -> Dict[str, float]:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "reuse_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+
+def get_cached_embedder(name: Optional[str] = None) -> CachedEmbedder:
+    """
+    A CachedEmbedder over the configured embedder. Each caller gets its own
+    so the statistics describe one run (an ingestion, a re-index, ...).
+    """
+    return CachedEmbedder(get_embedder(name))
+
+
+def log_reuse(embedder: CachedEmbedder, label: str):
+    stats = embedder.stats()
+    logger.info(
+        f"Embedding cache for {label}: {stats['hits']} reused, "
+        f"{stats['misses']} embedded ({stats['reuse_rate']:.0%} reuse)"
+    )
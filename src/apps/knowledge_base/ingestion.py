@@ -0,0 +1,258 @@
+import csv
+import hashlib
+import io
+import os
+
+from itertools import islice
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional
+
+from django.conf import settings
+from django.db import connections, transaction
+from django.utils import timezone
+
+from core.settings.base import logger
+
+from .embedders import Embedder, get_embedder
+from .embedding_cache import CachedEmbedder, get_cached_embedder, log_reuse
+from .models import Document, DocumentChunk
+from .services import VECTOR_STORE_DB
+
+ProgressCallback = Callable[[Dict[str, Any]], None]
+
+_COPY_CHUNKS_SQL = (
+    "COPY kb_chunk (document_id, position, content, embedding, created_at) "
+    "FROM STDIN WITH (FORMAT csv)"
+)
+
+
+def iter_paragraphs(lines: Iterable[str]) -> Iterator[str]:
+    """Groups lines into paragraphs separated by blank lines."""
+    paragraph: List[str] = []
+    for line in lines:
+        line = line.strip()
+        if line:
+            paragraph.append(line)
+        elif paragraph:
+            yield " ".join(paragraph)
+            paragraph = []
+    if paragraph:
+        yield " ".join(paragraph)
+
+
+def _split_long(text: str, max_chars: int) -> Iterator[str]:
+    """Splits text longer than max_chars at whitespace where possible."""
+    while len(text) > max_chars:
+        cut = text.rfind(" ", 0, max_chars)
+        if cut <= 0:
+            cut = max_chars
+        yield text[:cut]
+        text = text[cut:].lstrip()
+    if text:
+        yield text
+
+
+def iter_chunks(
+    lines: Iterable[str],
+    max_chars: int = settings.KB_CHUNK_MAX_CHARS,
+    overlap_chars: int = settings.KB_CHUNK_OVERLAP_CHARS,
+) -> Iterator[str]:
+    """
+    Packs paragraphs into chunks of about `max_chars`, each starting with
+    the last `overlap_chars` of the previous one. Works on any iterable of
+    lines (an open file included) and never holds more than one chunk.
+    """
+    piece_chars = max(1, max_chars - overlap_chars)
+    buffer: List[str] = []
+    size = 0
+    for paragraph in iter_paragraphs(lines):
+        for piece in _split_long(paragraph, piece_chars):
+            if buffer and size + len(piece) > max_chars:
+                chunk = "\n\n".join(buffer)
+                yield chunk
+                tail = chunk[-overlap_chars:] if overlap_chars else ""
+                # Start the overlap on a word boundary
+                tail = tail[tail.find(" ") + 1 :].lstrip()
+                buffer = [tail] if tail else []
+                size = len(tail)
+            buffer.append(piece)
+            size += len(piece) + 2
+    if buffer:
+        yield "\n\n".join(buffer)
+
+
+def _batched(iterable: Iterable, size: int) -> Iterator[list]:
+    iterator = iter(iterable)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
+
+def _vector_literal(embedding: Iterable[float]) -> str:
+    return "[" + ",".join(repr(float(value)) for value in embedding) + "]"
+
+
+def copy_chunks(
+    document_id: int,
+    chunks: List[tuple],
+    embeddings: List[List[float]],
+) -> int:
+    """
+    Bulk loads (position, content) chunks and their embeddings into the
+    vector store with COPY, which is far cheaper than per-row INSERTs and
+    keeps the HNSW index maintenance in one statement.
+    """
+    created_at = timezone.now().isoformat()
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for (position, content), embedding in zip(chunks, embeddings):
+        writer.writerow(
+            [
+                document_id,
+                position,
+                content.replace("\x00", ""),
+                _vector_literal(embedding),
+                created_at,
+            ]
+        )
+    buffer.seek(0)
+    with connections[VECTOR_STORE_DB].cursor() as cursor:
+        cursor.copy_expert(_COPY_CHUNKS_SQL, buffer)
+    return len(chunks)
+
+
+def file_hash(path: str, block_size: int = 1 << 20) -> str:
+    """SHA-256 of a file, read in blocks."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        while block := f.read(block_size):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def ingest_lines(
+    document: Document,
+    lines: Iterable[str],
+    embedder: Optional[Embedder] = None,
+    batch_size: int = settings.KB_INGEST_BATCH_SIZE,
+    on_progress: Optional[ProgressCallback] = None,
+) -> int:
+    """
+    Chunks, embeds and loads the text of `document`, one batch at a time.
+    Returns the number of chunks written.
+    """
+    embedder = embedder or get_embedder()
+    written = 0
+    chunks = enumerate(iter_chunks(lines))
+    for batch in _batched(chunks, batch_size):
+        embeddings = embedder.embed([content for _, content in batch])
+        written += copy_chunks(document.id, batch, embeddings)
+        if on_progress is not None:
+            on_progress({"document_id": document.id, "chunks": written})
+    return written
+
+
+def ingest_file(
+    path: str,
+    title: Optional[str] = None,
+    source: Optional[str] = None,
+    metadata: Optional[Dict[str, Any]] = None,
+    embedder: Optional[Embedder] = None,
+    batch_size: int = settings.KB_INGEST_BATCH_SIZE,
+    on_progress: Optional[ProgressCallback] = None,
+) -> Dict[str, Any]:
+    """
+    Ingests a UTF-8 text file without loading it into memory. A document
+    with the same source is replaced, unless its content is unchanged.
+
+    Chunks are embedded and committed batch by batch into a staging
+    document, soft-deleted so retrieval skips it, and swapped into place
+    in one short transaction at the end: no transaction or row lock is
+    held while the embedding model is called, and the old chunks keep
+    answering until then. A failed run deletes its staging document.
+
+    Embeddings go through the embedding cache unless an embedder is given,
+    so chunks that survive an edit are not embedded again.
+    """
+    source = source or path
+    content_hash = file_hash(path)
+    total_bytes = os.path.getsize(path)
+    documents = Document.objects.using(VECTOR_STORE_DB)
+
+    existing = documents.filter(source=source).first()
+    if existing is not None and existing.content_hash == content_hash:
+        logger.info(f"Skipping unchanged knowledge base document {source}")
+        return {"document_id": existing.id, "chunks": 0, "skipped": True}
+
+    embedder = embedder or get_cached_embedder()
+    read_bytes = 0
+
+    def report(progress: Dict[str, Any]):
+        if on_progress is not None:
+            on_progress(
+                {**progress, "bytes": read_bytes, "total_bytes": total_bytes}
+            )
+
+    staging = documents.create(
+        title=title or os.path.basename(path),
+        source=source,
+        content_hash=content_hash,
+        metadata=metadata or {},
+        deleted_at=timezone.now(),
+    )
+    try:
+        with open(path, "rb") as f:
+
+            def lines() -> Iterator[str]:
+                nonlocal read_bytes
+                for line in f:
+                    read_bytes += len(line)
+                    yield line.decode("utf-8", errors="replace")
+
+            chunks = ingest_lines(
+                staging,
+                lines(),
+                embedder=embedder,
+                batch_size=batch_size,
+                on_progress=report,
+            )
+        document = _swap_in(staging, existing, title, metadata)
+    except BaseException:
+        # Chunks cascade; the old document was left untouched
+        try:
+            staging.hard_delete()
+        except Exception as e:
+            logger.warning(f"Failed to delete staging document: {e}")
+        raise
+
+    logger.info(f"Ingested {chunks} chunks from {source}")
+    result = {"document_id": document.id, "chunks": chunks, "skipped": False}
+    if isinstance(embedder, CachedEmbedder):
+        log_reuse(embedder, source)
+        result["embedding_cache"] = embedder.stats()
+    return result
+
+
+def _swap_in(
+    staging: Document,
+    existing: Optional[Document],
+    title: Optional[str],
+    metadata: Optional[Dict[str, Any]],
+) -> Document:
+    """
+    Publishes the chunks of a staging document: they replace those of
+    `existing`, which keeps its id, or the staging document is restored.
+    """
+    with transaction.atomic(using=VECTOR_STORE_DB):
+        if existing is None:
+            staging.deleted_at = None
+            staging.save(using=VECTOR_STORE_DB, update_fields=["deleted_at"])
+            return staging
+
+        chunks = DocumentChunk.objects.using(VECTOR_STORE_DB)
+        chunks.filter(document=existing).delete()
+        chunks.filter(document=staging).update(document=existing)
+        existing.title = title or existing.title
+        existing.content_hash = staging.content_hash
+        existing.metadata = metadata or existing.metadata
+        existing.save(using=VECTOR_STORE_DB)
+        staging.hard_delete(using=VECTOR_STORE_DB)
+        return existing
@@ -0,0 +1,66 @@
+import statistics
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections, transaction
+from pgvector.django import CosineDistance
+
+from apps.knowledge_base.models import DocumentChunk
+from apps.knowledge_base.services import VECTOR_STORE_DB, search_chunks
+
+
+class Command(BaseCommand):
+    help = (
+        "Offline benchmark of the local vector search. Uses stored chunk "
+        "embeddings as queries, so no embedding calls are made, and reports "
+        "HNSW latency and recall@k against an exact scan."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--queries", type=int, default=100)
+        parser.add_argument("--top-k", type=int, default=5)
+        parser.add_argument("--ef-search", type=int, default=40)
+
+    def _exact_ids(self, embedding, top_k):
+        with transaction.atomic(using=VECTOR_STORE_DB):
+            with connections[VECTOR_STORE_DB].cursor() as cursor:
+                cursor.execute("SET LOCAL enable_indexscan = off")
+            return set(
+                DocumentChunk.objects.using(VECTOR_STORE_DB)
+                .annotate(distance=CosineDistance("embedding", embedding))
+                .order_by("distance")
+                .values_list("id", flat=True)[:top_k]
+            )
+
+    def handle(self, *args, **options):
+        top_k = options["top_k"]
+        samples = list(
+            DocumentChunk.objects.using(VECTOR_STORE_DB)
+            .order_by("?")
+            .values_list("embedding", flat=True)[: options["queries"]]
+        )
+        if not samples:
+            raise CommandError("The knowledge base has no chunks to query.")
+
+        latencies = []
+        recalls = []
+        for embedding in samples:
+            started = time.perf_counter()
+            chunks = search_chunks(
+                embedding, top_k=top_k, ef_search=options["ef_search"]
+            )
+            latencies.append((time.perf_counter() - started) * 1000)
+
+            exact = self._exact_ids(embedding, top_k)
+            found = {chunk.id for chunk in chunks}
+            recalls.append(len(found & exact) / len(exact) if exact else 1.0)
+
+        latencies.sort()
+        p95 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))]
+        self.stdout.write(
+            f"queries={len(samples)} top_k={top_k} "
+            f"ef_search={options['ef_search']}\n"
+            f"latency p50={statistics.median(latencies):.2f} ms "
+            f"p95={p95:.2f} ms\n"
+            f"recall@{top_k}={statistics.mean(recalls):.3f}"
+        )
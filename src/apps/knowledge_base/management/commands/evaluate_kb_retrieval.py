@@ -0,0 +1,90 @@
+import json
+import statistics
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.knowledge_base.services import (
+    hybrid_search,
+    search_lexical,
+    search_text,
+)
+
+
+def _relevant_found(chunks, expected):
+    """Expected items are chunk ids or snippets the chunk text contains."""
+    found = 0
+    for item in expected:
+        if isinstance(item, int):
+            found += any(chunk.id == item for chunk in chunks)
+        else:
+            needle = item.casefold()
+            found += any(
+                needle in chunk.content.casefold() for chunk in chunks
+            )
+    return found
+
+
+class Command(BaseCommand):
+    help = (
+        "Offline evaluation of the knowledge base retrievers. Reads a JSONL "
+        'dataset of {"query": ..., "relevant": [chunk ids or snippets]} and '
+        "reports recall@k and latency of the vector, lexical and hybrid "
+        "retrievers."
+    )
+
+    retrievers = {
+        "vector": lambda query, k: search_text(query, top_k=k),
+        "lexical": lambda query, k: search_lexical(query, limit=k),
+        "hybrid": lambda query, k: hybrid_search(query, top_k=k),
+    }
+
+    def add_arguments(self, parser):
+        parser.add_argument("dataset")
+        parser.add_argument("--top-k", type=int, default=3)
+        parser.add_argument(
+            "--retriever",
+            choices=sorted(self.retrievers),
+            action="append",
+            help="Retriever to evaluate, repeatable (default: all).",
+        )
+
+    def _load(self, path):
+        try:
+            with open(path) as f:
+                cases = [json.loads(line) for line in f if line.strip()]
+        except (OSError, ValueError) as e:
+            raise CommandError(f"Cannot read {path}: {e}") from e
+        if not cases:
+            raise CommandError(f"{path} has no queries.")
+        return cases
+
+    def handle(self, *args, **options):
+        cases = self._load(options["dataset"])
+        top_k = options["top_k"]
+
+        for name in options["retriever"] or sorted(self.retrievers):
+            retrieve = self.retrievers[name]
+            latencies = []
+            recalls = []
+            for case in cases:
+                started = time.perf_counter()
+                chunks = retrieve(case["query"], top_k)
+                latencies.append((time.perf_counter() - started) * 1000)
+
+                expected = case.get("relevant", [])
+                if expected:
+                    found = _relevant_found(chunks, expected)
+                    recalls.append(found / len(expected))
+
+            latencies.sort()
+            p95 = latencies[
+                min(len(latencies) - 1, int(len(latencies) * 0.95))
+            ]
+            recall = statistics.mean(recalls) if recalls else float("nan")
+            self.stdout.write(
+                f"{name:<8} queries={len(cases)} "
+                f"recall@{top_k}={recall:.3f} "
+                f"latency p50={statistics.median(latencies):.2f} ms "
+                f"p95={p95:.2f} ms"
+            )
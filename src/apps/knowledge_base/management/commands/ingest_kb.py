@@ -0,0 +1,33 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.knowledge_base.ingestion import ingest_file
+from apps.knowledge_base.tasks import ingest_document
+
+
+class Command(BaseCommand):
+    help = (
+        "Ingests text files into the knowledge base. By default each file "
+        "is queued as a Celery task; --sync ingests them in this process."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("paths", nargs="+")
+        parser.add_argument("--sync", action="store_true")
+
+    def handle(self, *args, **options):
+        for path in options["paths"]:
+            if options["sync"]:
+                try:
+                    result = ingest_file(
+                        path,
+                        on_progress=lambda p: self.stdout.write(
+                            f"{path}: {p['chunks']} chunks, "
+                            f"{p['bytes']}/{p['total_bytes']} bytes"
+                        ),
+                    )
+                except OSError as e:
+                    raise CommandError(str(e)) from e
+                self.stdout.write(f"{path}: {result}")
+            else:
+                task = ingest_document.delay(path)
+                self.stdout.write(f"{path}: queued as {task.id}")
@@ -0,0 +1,140 @@
+# Generated by Django 5.1 on 2026-10-17 09:12
+
+import django.db.models.deletion
+import pgvector.django
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = []
+
+    operations = [
+        pgvector.django.VectorExtension(),
+        migrations.CreateModel(
+            name="Document",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("deleted_at", models.DateTimeField(blank=True, null=True)),
+                ("restored_at", models.DateTimeField(blank=True, null=True)),
+                ("transaction_id", models.UUIDField(blank=True, null=True)),
+                (
+                    "created_at",
+                    models.DateTimeField(
+                        auto_now_add=True,
+                        help_text="The date and time when this object was created.",
+                    ),
+                ),
+                (
+                    "updated_at",
+                    models.DateTimeField(
+                        auto_now=True,
+                        help_text="The date and time when this object was last updated.",
+                    ),
+                ),
+                (
+                    "title",
+                    models.CharField(
+                        help_text="A human readable title for the document.",
+                        max_length=255,
+                    ),
+                ),
+                (
+                    "source",
+                    models.CharField(
+                        blank=True,
+                        help_text="Where the document comes from, e.g. a file path or URL.",
+                        max_length=500,
+                    ),
+                ),
+                (
+                    "content_hash",
+                    models.CharField(
+                        db_index=True,
+                        help_text="SHA-256 of the document text, used to skip unchanged re-ingestions.",
+                        max_length=64,
+                    ),
+                ),
+                (
+                    "metadata",
+                    models.JSONField(
+                        blank=True,
+                        default=dict,
+                        help_text="Free-form metadata, e.g. company or interview type.",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Knowledge Base Document",
+                "verbose_name_plural": "Knowledge Base Documents",
+                "db_table": "kb_document",
+                "ordering": ["-created_at"],
+                "abstract": False,
+            },
+        ),
+        migrations.CreateModel(
+            name="DocumentChunk",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "position",
+                    models.PositiveIntegerField(
+                        help_text="Order of the chunk inside its document."
+                    ),
+                ),
+                ("content", models.TextField(help_text="The chunk text.")),
+                (
+                    "embedding",
+                    pgvector.django.VectorField(
+                        # As in the model: the column follows the setting
+                        dimensions=settings.KB_EMBEDDING_DIMENSIONS,
+                        help_text="Embedding of the chunk text.",
+                    ),
+                ),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                (
+                    "document",
+                    models.ForeignKey(
+                        help_text="The document this chunk belongs to.",
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="chunks",
+                        to="knowledge_base.document",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Knowledge Base Chunk",
+                "verbose_name_plural": "Knowledge Base Chunks",
+                "db_table": "kb_chunk",
+                "indexes": [
+                    pgvector.django.HnswIndex(
+                        ef_construction=64,
+                        fields=["embedding"],
+                        m=16,
+                        name="kb_chunk_embedding_hnsw",
+                        opclasses=["vector_cosine_ops"],
+                    )
+                ],
+                "unique_together": {("document", "position")},
+            },
+        ),
+    ]
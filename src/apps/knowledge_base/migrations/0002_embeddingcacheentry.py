@@ -0,0 +1,60 @@
+# Generated by Django 5.1 on 2026-10-17 11:40
+
+import pgvector.django
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("knowledge_base", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="EmbeddingCacheEntry",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "model_id",
+                    models.CharField(
+                        help_text="The embedding model that produced it.",
+                        max_length=128,
+                    ),
+                ),
+                (
+                    "content_hash",
+                    models.CharField(
+                        help_text="SHA-256 of the embedded text.",
+                        max_length=64,
+                    ),
+                ),
+                (
+                    "embedding",
+                    pgvector.django.VectorField(
+                        help_text="The cached embedding."
+                    ),
+                ),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                "verbose_name": "Embedding Cache Entry",
+                "verbose_name_plural": "Embedding Cache Entries",
+                "db_table": "kb_embedding_cache",
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("model_id", "content_hash"),
+                        name="kb_embedding_cache_key",
+                    )
+                ],
+            },
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 5.1 on 2026-10-17 13:05
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("knowledge_base", "0002_embeddingcacheentry"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="documentchunk",
+            name="search_vector",
+            field=models.GeneratedField(
+                db_persist=True,
+                expression=django.contrib.postgres.search.SearchVector(
+                    "content", config="english"
+                ),
+                help_text="Full-text search vector of the chunk text.",
+                output_field=django.contrib.postgres.search.SearchVectorField(),
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="documentchunk",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["search_vector"], name="kb_chunk_search_vector_gin"
+            ),
+        ),
+    ]
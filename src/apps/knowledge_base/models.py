@@ -0,0 +1,130 @@
+from django.conf import settings
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVector, SearchVectorField
+from django.db import models
+from pgvector.django import HnswIndex, VectorField
+
+from apps.common_models.models import BaseModel
+
+# Text search configuration of the chunk search vector. Queries must use
+# the same one for the GIN index to apply.
+SEARCH_CONFIG = "english"
+
+
+class Document(BaseModel):
+    """
+    A source document of the knowledge base (company background, interview
+    guide, ...). Its text is stored as chunks with their embeddings.
+    """
+
+    title = models.CharField(
+        max_length=255, help_text="A human readable title for the document."
+    )
+    source = models.CharField(
+        max_length=500,
+        blank=True,
+        help_text="Where the document comes from, e.g. a file path or URL.",
+    )
+    content_hash = models.CharField(
+        max_length=64,
+        db_index=True,
+        help_text="SHA-256 of the document text, used to skip unchanged re-ingestions.",
+    )
+    metadata = models.JSONField(
+        default=dict,
+        blank=True,
+        help_text="Free-form metadata, e.g. company or interview type.",
+    )
+
+    class Meta(BaseModel.Meta):
+        db_table = "kb_document"
+        verbose_name = "Knowledge Base Document"
+        verbose_name_plural = "Knowledge Base Documents"
+
+    def __str__(self):
+        return self.title
+
+
+class DocumentChunk(models.Model):
+    """
+    A piece of a Document with its embedding. This is the unit returned by
+    retrieval.
+
+    Chunks are replaced wholesale when their document is re-ingested, so
+    they are plain rows without soft deletion: the extra deleted_at filter
+    would sit on every vector search.
+    """
+
+    document = models.ForeignKey(
+        Document,
+        on_delete=models.CASCADE,
+        related_name="chunks",
+        help_text="The document this chunk belongs to.",
+    )
+    position = models.PositiveIntegerField(
+        help_text="Order of the chunk inside its document."
+    )
+    content = models.TextField(help_text="The chunk text.")
+    embedding = VectorField(
+        dimensions=settings.KB_EMBEDDING_DIMENSIONS,
+        help_text="Embedding of the chunk text.",
+    )
+    search_vector = models.GeneratedField(
+        expression=SearchVector("content", config=SEARCH_CONFIG),
+        output_field=SearchVectorField(),
+        db_persist=True,
+        help_text="Full-text search vector of the chunk text.",
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        db_table = "kb_chunk"
+        verbose_name = "Knowledge Base Chunk"
+        verbose_name_plural = "Knowledge Base Chunks"
+        unique_together = ("document", "position")
+        indexes = [
+            HnswIndex(
+                name="kb_chunk_embedding_hnsw",
+                fields=["embedding"],
+                m=16,
+                ef_construction=64,
+                opclasses=["vector_cosine_ops"],
+            ),
+            GinIndex(
+                name="kb_chunk_search_vector_gin", fields=["search_vector"]
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.document.title} #{self.position}"
+
+
+class EmbeddingCacheEntry(models.Model):
+    """
+    An embedding remembered by (model, SHA-256 of the text) so unchanged
+    text is never sent to the embedding model twice. The vector has no
+    fixed dimension: each model_id keeps its own.
+    """
+
+    model_id = models.CharField(
+        max_length=128, help_text="The embedding model that produced it."
+    )
+    content_hash = models.CharField(
+        max_length=64, help_text="SHA-256 of the embedded text."
+    )
+    embedding = VectorField(help_text="The cached embedding.")
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        db_table = "kb_embedding_cache"
+        verbose_name = "Embedding Cache Entry"
+        verbose_name_plural = "Embedding Cache Entries"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["model_id", "content_hash"],
+                name="kb_embedding_cache_key",
+            )
+        ]
+
+    def __str__(self):
+        return f"{self.model_id}:{self.content_hash[:12]}"
@@ -0,0 +1,70 @@
+"""
+Rank fusion and reranking for the hybrid retriever. Plain Python on
+already-fetched candidates, so it is also usable on remote results.
+"""
+
+import re
+
+from collections import defaultdict
+from typing import Dict, Hashable, Iterable, List, Sequence, Tuple, TypeVar
+
+T = TypeVar("T")
+
+# The usual RRF constant: damps the weight of the very first ranks so one
+# list cannot dominate the fusion.
+RRF_K = 60
+
+# Keeps terms like "c++", "c#" or "node.js" whole
+_TOKEN = re.compile(r"\w[\w+#.\-]*")
+
+_STOPWORDS = frozenset(
+    "a an and are as at be by can do does for from how i in is it me my "
+    "of on or our the their this to was what when where which who why "
+    "with you your".split()
+)
+
+
+def tokenize(text: str) -> List[str]:
+    return [token.rstrip(".-") for token in _TOKEN.findall(text.casefold())]
+
+
+def query_terms(query: str) -> List[str]:
+    """The distinct non-stopword terms of a query, in order."""
+    terms = [t for t in tokenize(query) if t not in _STOPWORDS]
+    return list(dict.fromkeys(terms))
+
+
+def reciprocal_rank_fusion(
+    rankings: Iterable[Sequence[Hashable]], k: int = RRF_K
+) -> Dict[Hashable, float]:
+    """Scores each key by the sum of 1 / (k + rank) over the rankings."""
+    scores: Dict[Hashable, float] = defaultdict(float)
+    for ranking in rankings:
+        for rank, key in enumerate(ranking, start=1):
+            scores[key] += 1.0 / (k + rank)
+    return dict(scores)
+
+
+def rerank(
+    query: str, candidates: Iterable[Tuple[T, str, float]]
+) -> List[Tuple[T, float]]:
+    """
+    Reorders (item, text, score) candidates by boosting the score with the
+    share of query terms found in the text, and again when the whole query
+    appears verbatim. Cheap enough to run on every tool call, and it favors
+    the exact technology and company names embeddings tend to blur.
+    """
+    terms = query_terms(query)
+    phrase = " ".join(tokenize(query))
+    reranked = []
+    for item, text, score in candidates:
+        tokens = tokenize(text)
+        boost = 1.0
+        if terms:
+            present = set(tokens)
+            boost += sum(term in present for term in terms) / len(terms)
+        if phrase and phrase in " ".join(tokens):
+            boost += 0.5
+        reranked.append((item, score * boost))
+    reranked.sort(key=lambda pair: pair[1], reverse=True)
+    return reranked
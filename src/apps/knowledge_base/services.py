@@ -0,0 +1,162 @@
+import operator
+import time
+
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from functools import reduce
+from typing import List, Sequence
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.postgres.search import SearchQuery, SearchRank
+from django.db import connections, transaction
+from django.db.models import F
+from pgvector.django import CosineDistance
+
+from core.settings.base import logger
+
+from .embedders import get_embedder
+from .models import SEARCH_CONFIG, DocumentChunk
+from .retrieval import query_terms, reciprocal_rank_fusion, rerank
+
+VECTOR_STORE_DB = "vector_store"
+
+# Query embeddings run here so the lexical search can proceed meanwhile
+_query_executor = ThreadPoolExecutor(
+    max_workers=4, thread_name_prefix="kb-query"
+)
+
+
+def _live_chunks():
+    """
+    Chunks of documents that are not deleted. Deleting a Document only
+    soft-deletes it; whatever happens to its chunks, they must not be
+    returned.
+    """
+    return (
+        DocumentChunk.objects.using(VECTOR_STORE_DB)
+        .select_related("document")
+        .filter(document__deleted_at__isnull=True)
+    )
+
+
+def search_chunks(
+    query_embedding: Sequence[float],
+    top_k: int = settings.KB_TOP_K,
+    ef_search: int = settings.KB_HNSW_EF_SEARCH,
+) -> List[DocumentChunk]:
+    """
+    Returns the `top_k` chunks closest to the embedding (cosine distance),
+    with a `distance` attribute. Served by the HNSW index.
+    """
+    with transaction.atomic(using=VECTOR_STORE_DB):
+        with connections[VECTOR_STORE_DB].cursor() as cursor:
+            # SET LOCAL only lasts until the end of this transaction
+            cursor.execute("SET LOCAL hnsw.ef_search = %s", [ef_search])
+        return list(
+            _live_chunks()
+            .annotate(distance=CosineDistance("embedding", query_embedding))
+            .order_by("distance")[:top_k]
+        )
+
+
+def search_lexical(
+    query: str, limit: int = settings.KB_HYBRID_CANDIDATES
+) -> List[DocumentChunk]:
+    """
+    Returns up to `limit` chunks matching any term of the query, best
+    ts_rank first, with a `rank` attribute. Served by the GIN index.
+    """
+    terms = query_terms(query)
+    if not terms:
+        return []
+    search_query = reduce(
+        operator.or_,
+        (SearchQuery(term, config=SEARCH_CONFIG) for term in terms),
+    )
+    return list(
+        _live_chunks()
+        .filter(search_vector=search_query)
+        .annotate(rank=SearchRank(F("search_vector"), search_query))
+        .order_by("-rank")[:limit]
+    )
+
+
+def hybrid_search(
+    query: str,
+    top_k: int = settings.KB_TOP_K,
+    candidates: int = settings.KB_HYBRID_CANDIDATES,
+    budget_ms: int = settings.KB_RETRIEVAL_BUDGET_MS,
+) -> List[DocumentChunk]:
+    """
+    Merges full-text and vector candidates with reciprocal rank fusion,
+    reranks them locally and returns the best `top_k` with a `score`.
+
+    The query is embedded while the lexical search runs. If the embedding
+    is not back within `budget_ms` (0 waits forever), the lexical results
+    are returned alone rather than blowing the latency budget.
+    """
+    deadline = time.monotonic() + budget_ms / 1000
+    embedding = _query_executor.submit(get_embedder().embed, [query])
+
+    lexical = search_lexical(query, limit=candidates)
+    rankings = [[chunk.id for chunk in lexical]]
+    chunks = {chunk.id: chunk for chunk in lexical}
+
+    try:
+        timeout = max(0.0, deadline - time.monotonic()) if budget_ms else None
+        query_embedding = embedding.result(timeout=timeout)[0]
+    except FutureTimeoutError:
+        logger.warning(
+            f"Query embedding exceeded the {budget_ms} ms retrieval "
+            "budget, using lexical results only"
+        )
+    else:
+        vector = search_chunks(
+            query_embedding,
+            top_k=candidates,
+            ef_search=max(settings.KB_HNSW_EF_SEARCH, candidates),
+        )
+        rankings.append([chunk.id for chunk in vector])
+        for chunk in vector:
+            chunks.setdefault(chunk.id, chunk)
+
+    fused = reciprocal_rank_fusion(rankings)
+    ranked = rerank(
+        query,
+        (
+            (chunks[id], chunks[id].content, score)
+            for id, score in fused.items()
+        ),
+    )
+    results = []
+    for chunk, score in ranked[:top_k]:
+        chunk.score = score
+        results.append(chunk)
+    return results
+
+
+async def ahybrid_search(
+    query: str, top_k: int = settings.KB_TOP_K
+) -> List[DocumentChunk]:
+    """hybrid_search for async callers such as the S2S tool handlers."""
+    return await sync_to_async(hybrid_search, thread_sensitive=False)(
+        query, top_k=top_k
+    )
+
+
+def search_text(
+    query: str, top_k: int = settings.KB_TOP_K
+) -> List[DocumentChunk]:
+    """Embeds the query and returns the closest chunks."""
+    query_embedding = get_embedder().embed([query])[0]
+    return search_chunks(query_embedding, top_k=top_k)
+
+
+async def asearch_text(
+    query: str, top_k: int = settings.KB_TOP_K
+) -> List[DocumentChunk]:
+    """search_text for async callers such as the S2S tool handlers."""
+    return await sync_to_async(search_text, thread_sensitive=False)(
+        query, top_k=top_k
+    )
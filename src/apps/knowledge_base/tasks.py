@@ -0,0 +1,42 @@
+from typing import Any, Dict, List, Optional
+
+from celery import group, shared_task
+from django.conf import settings
+
+from .ingestion import ingest_file
+
+
+@shared_task(
+    bind=True,
+    time_limit=settings.KB_INGEST_TIME_LIMIT_SECONDS,
+    # Leaves the run time to delete its staging document
+    soft_time_limit=settings.KB_INGEST_TIME_LIMIT_SECONDS - 60,
+)
+def ingest_document(
+    self,
+    path: str,
+    title: Optional[str] = None,
+    source: Optional[str] = None,
+    metadata: Optional[Dict[str, Any]] = None,
+) -> Dict[str, Any]:
+    """
+    Ingests one file into the knowledge base. Progress (chunks written and
+    bytes read) is published as the PROGRESS state of the task.
+    """
+
+    def report(progress: Dict[str, Any]):
+        # Eager runs have no result backend to publish to
+        if not self.request.is_eager:
+            self.update_state(state="PROGRESS", meta=progress)
+
+    return ingest_file(
+        path, title=title, source=source, metadata=metadata, on_progress=report
+    )
+
+
+@shared_task
+def ingest_documents(paths: List[str]) -> str:
+    """Fans the ingestion of several files out to the workers."""
+    result = group(ingest_document.s(path) for path in paths).apply_async()
+    result.save()
+    return result.id
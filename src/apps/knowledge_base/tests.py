@@ -0,0 +1,31 @@
+from django.conf import settings
+from django.test import TestCase
+
+from .models import Document, DocumentChunk
+from .services import search_chunks, search_lexical
+
+
+class DeletedDocumentSearchTests(TestCase):
+    databases = {"default", "vector_store"}
+
+    def setUp(self):
+        self.embedding = [1.0] + [0.0] * (settings.KB_EMBEDDING_DIMENSIONS - 1)
+        self.document = Document.objects.create(
+            title="Company background", content_hash="0" * 64
+        )
+        self.chunk = DocumentChunk.objects.create(
+            document=self.document,
+            position=0,
+            content="The platform team runs Kubernetes on AWS.",
+            embedding=self.embedding,
+        )
+
+    def test_chunks_of_live_documents_are_returned(self):
+        self.assertEqual(search_lexical("kubernetes"), [self.chunk])
+        self.assertEqual(search_chunks(self.embedding), [self.chunk])
+
+    def test_chunks_of_deleted_documents_are_not_returned(self):
+        self.document.delete()
+
+        self.assertEqual(search_lexical("kubernetes"), [])
+        self.assertEqual(search_chunks(self.embedding), [])
@@ -1,3 +1,7 @@
+import hmac
+
+from django.http import HttpResponse
+from ninja.security import HttpBearer
 from ninja_extra import NinjaExtraAPI
 from ninja_jwt.authentication import JWTAuth
 from ninja.errors import ValidationError
@@ -18,6 +22,8 @@ from apps.coaching.api import (
     session_setup_router,
 )
 from apps.agents.api.router import router as agents_router
+from apps.ai_engine.s2s.metrics import REGISTRY
+from core.settings.base import METRICS_TOKEN
 
 api = NinjaExtraAPI()
 api.register_controllers(CustomTokenObtainPairController)
@@ -45,3 +51,26 @@ api.add_router("/agents/", agents_router, auth=JWTAuth())
 def health_check(request):
     """A simple secured endpoint tha api health."""
     return {"status": "healthy"}
+
+
+class MetricsTokenAuth(HttpBearer):
+    """The scraper's METRICS_TOKEN; nobody gets in while it is empty."""
+
+    def authenticate(self, request, token):
+        if METRICS_TOKEN and hmac.compare_digest(
+            token.encode(), METRICS_TOKEN.encode()
+        ):
+            return token
+
+
+@api.get(
+    "/metrics/",
+    summary="Prometheus Metrics",
+    auth=MetricsTokenAuth(),
+    include_in_schema=False,
+)
+def metrics(request):
+    """Voice latency histograms of this process, Prometheus text format."""
+    return HttpResponse(
+        REGISTRY.render(), content_type="text/plain; version=0.0.4"
+    )
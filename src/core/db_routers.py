@@ -0,0 +1,32 @@
+class VectorStoreRouter:
+    """
+    Routes the knowledge base models to the `vector_store` connection, which
+    points at the vector_store schema created by init_scripts/init_db.sh.
+    Every other app stays on `default`. That connection keeps its own
+    django_migrations table, so `migrate --database=vector_store` creates
+    the tables even after `migrate` recorded them as applied on `default`.
+    """
+
+    vector_store_apps = {"knowledge_base"}
+    vector_store_db = "vector_store"
+
+    def db_for_read(self, model, **hints):
+        if model._meta.app_label in self.vector_store_apps:
+            return self.vector_store_db
+        return None
+
+    def db_for_write(self, model, **hints):
+        return self.db_for_read(model, **hints)
+
+    def allow_relation(self, obj1, obj2, **hints):
+        in_store = {
+            obj._meta.app_label in self.vector_store_apps
+            for obj in (obj1, obj2)
+        }
+        # Only relations within the same connection
+        return len(in_store) == 1
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        if app_label in self.vector_store_apps:
+            return db == self.vector_store_db
+        return db == "default"